@@ -0,0 +1,49 @@
+"""add leaderboard materialized view
+
+Merges the open heads and adds a descending xp_points index on users plus a
+`leaderboard_top20` materialized view (PostgreSQL only) that the API
+refreshes concurrently every few seconds.
+
+Revision ID: 9b1e4c7a2d30
+Revises: 5f6d9d12c001, a1b2c3d4e5f6, a3b4c5d6e7f8
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "9b1e4c7a2d30"
+down_revision: Union[str, Sequence[str], None] = ("5f6d9d12c001", "a1b2c3d4e5f6", "a3b4c5d6e7f8")
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The model declares this index too, so databases bootstrapped with
+    # init_db() already have it.
+    op.create_index(
+        "ix_users_xp_desc", "users", [sa.text("xp_points DESC")], unique=False, if_not_exists=True
+    )
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS leaderboard_top20 AS
+        SELECT id, name, xp_points, current_streak
+        FROM users
+        ORDER BY xp_points DESC
+        LIMIT 20
+        """
+    )
+    # REFRESH ... CONCURRENTLY requires a unique index on the view.
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_leaderboard_top20_id ON leaderboard_top20 (id)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP MATERIALIZED VIEW IF EXISTS leaderboard_top20")
+    op.drop_index("ix_users_xp_desc", table_name="users", if_exists=True)
@@ -0,0 +1,40 @@
+"""store saved_recipes.id as native uuid
+
+PostgreSQL only: converts the varchar(36) primary key to uuid and lets the
+server generate it. Nothing references saved_recipes.id, so no foreign keys
+need to follow.
+
+Revision ID: a1c3e5f7b9d0
+Revises: f0a2b4c6d8e9
+Create Date: 2026-10-15 20:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "a1c3e5f7b9d0"
+down_revision = "f0a2b4c6d8e9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        "ALTER TABLE saved_recipes "
+        "ALTER COLUMN id TYPE uuid USING id::uuid, "
+        "ALTER COLUMN id SET DEFAULT gen_random_uuid()"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        "ALTER TABLE saved_recipes "
+        "ALTER COLUMN id DROP DEFAULT, "
+        "ALTER COLUMN id TYPE varchar(36) USING id::text"
+    )
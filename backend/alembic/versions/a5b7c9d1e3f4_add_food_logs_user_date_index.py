@@ -0,0 +1,24 @@
+"""add food_logs (user_id, date) index
+
+Revision ID: a5b7c9d1e3f4
+Revises: f4a6b8c0d2e3
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "a5b7c9d1e3f4"
+down_revision = "f4a6b8c0d2e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_food_logs_user_date", "food_logs", ["user_id", "date"], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_food_logs_user_date", table_name="food_logs", if_exists=True)
@@ -0,0 +1,48 @@
+"""add recipes browse indexes
+
+PostgreSQL only. /recipes/browse matches JSON list filters with
+`lower(column::text)::jsonb ?| array[...]`, so each filtered list column
+gets a GIN index on that expression. Cuisine is compared on lower(cuisine),
+and the title/description ILIKE search is served by a pg_trgm GIN index.
+
+Revision ID: b6c8d0e2f4a5
+Revises: a5b7c9d1e3f4
+Create Date: 2026-10-15 17:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "b6c8d0e2f4a5"
+down_revision = "a5b7c9d1e3f4"
+branch_labels = None
+depends_on = None
+
+JSON_LIST_COLUMNS = ("tags", "flavor_profile", "dietary_tags", "health_benefits", "protein_type", "carb_type")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for column in JSON_LIST_COLUMNS:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_recipes_{column}_lower_gin "
+            f"ON recipes USING gin ((lower({column}::text)::jsonb))"
+        )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_recipes_cuisine_lower ON recipes (lower(cuisine))")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_recipes_title_description_trgm "
+        "ON recipes USING gin (title gin_trgm_ops, description gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS ix_recipes_title_description_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_recipes_cuisine_lower")
+    for column in reversed(JSON_LIST_COLUMNS):
+        op.execute(f"DROP INDEX IF EXISTS ix_recipes_{column}_lower_gin")
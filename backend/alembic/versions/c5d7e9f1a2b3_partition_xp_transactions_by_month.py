@@ -0,0 +1,103 @@
+"""partition xp_transactions by month
+
+Rebuilds xp_transactions as a range-partitioned table on created_at
+(PostgreSQL only) so recent-window scans such as the weekly stats only touch
+the current partitions. Monthly children are created here for existing data
+and kept ahead of time by the worker (see app.services.xp_partitions); a
+DEFAULT partition catches anything outside the prepared range.
+
+Revision ID: c5d7e9f1a2b3
+Revises: 9b1e4c7a2d30
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c5d7e9f1a2b3"
+down_revision: Union[str, Sequence[str], None] = "9b1e4c7a2d30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        op.create_index(
+            "ix_xp_transactions_user_created", "xp_transactions", ["user_id", "created_at"],
+            unique=False, if_not_exists=True,
+        )
+        return
+
+    op.execute("UPDATE xp_transactions SET created_at = now() AT TIME ZONE 'utc' WHERE created_at IS NULL")
+    op.execute("ALTER TABLE xp_transactions RENAME TO xp_transactions_unpartitioned")
+    # The partition key must be part of the primary key.
+    op.execute(
+        """
+        CREATE TABLE xp_transactions (
+            id VARCHAR(36) NOT NULL,
+            user_id VARCHAR(36) NOT NULL REFERENCES users (id),
+            amount INTEGER NOT NULL,
+            reason VARCHAR NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE TABLE xp_transactions_default PARTITION OF xp_transactions DEFAULT")
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month_start date := COALESCE(
+                (SELECT date_trunc('month', min(created_at))::date FROM xp_transactions_unpartitioned),
+                date_trunc('month', now())::date
+            );
+            last_month date := (date_trunc('month', now()) + interval '2 months')::date;
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF xp_transactions FOR VALUES FROM (%L) TO (%L)',
+                    'xp_transactions_' || to_char(month_start, 'YYYY_MM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END $$
+        """
+    )
+    op.execute(
+        "INSERT INTO xp_transactions (id, user_id, amount, reason, created_at) "
+        "SELECT id, user_id, amount, reason, created_at FROM xp_transactions_unpartitioned"
+    )
+    op.execute("DROP TABLE xp_transactions_unpartitioned")
+    op.execute("CREATE INDEX ix_xp_transactions_user_created ON xp_transactions (user_id, created_at)")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        op.drop_index("ix_xp_transactions_user_created", table_name="xp_transactions", if_exists=True)
+        return
+
+    op.execute("ALTER TABLE xp_transactions RENAME TO xp_transactions_partitioned")
+    op.create_table(
+        "xp_transactions",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        "INSERT INTO xp_transactions (id, user_id, amount, reason, created_at) "
+        "SELECT id, user_id, amount, reason, created_at FROM xp_transactions_partitioned"
+    )
+    # Dropping the parent drops every child partition with it.
+    op.execute("DROP TABLE xp_transactions_partitioned")
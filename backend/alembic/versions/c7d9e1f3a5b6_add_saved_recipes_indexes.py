@@ -0,0 +1,28 @@
+"""add saved_recipes (user_id, saved_at) and recipe_id indexes
+
+Revision ID: c7d9e1f3a5b6
+Revises: b6c8d0e2f4a5
+Create Date: 2026-10-15 18:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "c7d9e1f3a5b6"
+down_revision = "b6c8d0e2f4a5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_saved_recipes_user_saved_at", "saved_recipes", ["user_id", "saved_at"], unique=False, if_not_exists=True
+    )
+    op.create_index("ix_saved_recipes_recipe_id", "saved_recipes", ["recipe_id"], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_saved_recipes_recipe_id", table_name="saved_recipes", if_exists=True)
+    op.drop_index("ix_saved_recipes_user_saved_at", table_name="saved_recipes", if_exists=True)
@@ -0,0 +1,29 @@
+"""add normalized_ingredients to meal_plan_items
+
+Revision ID: d2e4f6a8b0c1
+Revises: c5d7e9f1a2b3
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d2e4f6a8b0c1"
+down_revision = "c5d7e9f1a2b3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Left NULL for existing rows; grocery generation normalizes those on read.
+    op.add_column(
+        "meal_plan_items",
+        sa.Column("normalized_ingredients", sa.JSON(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("meal_plan_items", "normalized_ingredients")
@@ -0,0 +1,34 @@
+"""add unique (user_id, recipe_id) on saved_recipes
+
+Drops duplicate saves first, keeping one row per pair, so the constraint
+can be created on existing data. save_recipe relies on it for
+INSERT ... ON CONFLICT DO NOTHING.
+
+Revision ID: d8e0f2a4b6c7
+Revises: c7d9e1f3a5b6
+Create Date: 2026-10-15 18:30:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "d8e0f2a4b6c7"
+down_revision = "c7d9e1f3a5b6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "DELETE FROM saved_recipes WHERE id NOT IN "
+        "(SELECT MIN(id) FROM saved_recipes GROUP BY user_id, recipe_id)"
+    )
+    with op.batch_alter_table("saved_recipes") as batch_op:
+        batch_op.create_unique_constraint("uq_saved_recipes_user_recipe", ["user_id", "recipe_id"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("saved_recipes") as batch_op:
+        batch_op.drop_constraint("uq_saved_recipes_user_recipe", type_="unique")
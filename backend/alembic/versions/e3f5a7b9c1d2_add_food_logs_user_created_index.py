@@ -0,0 +1,26 @@
+"""add food_logs (user_id, created_at) index
+
+Revision ID: e3f5a7b9c1d2
+Revises: d2e4f6a8b0c1
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "e3f5a7b9c1d2"
+down_revision = "d2e4f6a8b0c1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_food_logs_user_created", "food_logs", ["user_id", "created_at"], unique=False, if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_food_logs_user_created", table_name="food_logs", if_exists=True)
@@ -0,0 +1,68 @@
+"""add recipe_facet_counts materialized view
+
+PostgreSQL only. One (facet, value, count) row per /recipes/filters facet
+value plus a `total_recipes` row, matching
+app.services.recipe_facets.facet_counts_stmt. The API refreshes it
+concurrently after a recipe is saved.
+
+Revision ID: e9f1a3b5c7d8
+Revises: d8e0f2a4b6c7
+Create Date: 2026-10-15 19:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "e9f1a3b5c7d8"
+down_revision = "d8e0f2a4b6c7"
+branch_labels = None
+depends_on = None
+
+MEAL_TYPES = ("breakfast", "lunch", "dinner", "snack", "condiment", "dessert")
+LIST_FACETS = (
+    ("flavors", "flavor_profile"),
+    ("dietary", "dietary_tags"),
+    ("health_benefits", "health_benefits"),
+    ("protein_types", "protein_type"),
+    ("carb_types", "carb_type"),
+)
+
+
+def _elements(column: str) -> str:
+    return f"json_array_elements_text(CASE WHEN json_typeof({column}) = 'array' THEN {column} END) AS e(value)"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    meal_types = ", ".join(f"'{m}'" for m in MEAL_TYPES)
+    parts = [
+        f"SELECT 'meal_types' AS facet, e.value AS value, count(*) AS count "
+        f"FROM recipes JOIN {_elements('tags')} ON true "
+        f"WHERE lower(e.value) IN ({meal_types}) GROUP BY e.value"
+    ]
+    parts += [
+        f"SELECT '{facet}', e.value, count(*) FROM recipes JOIN {_elements(column)} ON true "
+        f"WHERE e.value IS NOT NULL AND e.value != '' GROUP BY e.value"
+        for facet, column in LIST_FACETS
+    ]
+    parts.append(
+        "SELECT 'difficulties', lower(coalesce(difficulty, 'easy')), count(*) "
+        "FROM recipes GROUP BY lower(coalesce(difficulty, 'easy'))"
+    )
+    parts.append("SELECT 'total_recipes', '', count(*) FROM recipes")
+    op.execute(
+        "CREATE MATERIALIZED VIEW IF NOT EXISTS recipe_facet_counts AS\n" + "\nUNION ALL\n".join(parts)
+    )
+    # REFRESH ... CONCURRENTLY requires a unique index on the view.
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_recipe_facet_counts_facet_value "
+        "ON recipe_facet_counts (facet, value)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP MATERIALIZED VIEW IF EXISTS recipe_facet_counts")
@@ -0,0 +1,28 @@
+"""drop redundant saved_recipes user_id index
+
+ix_saved_recipes_user_saved_at and uq_saved_recipes_user_recipe both lead
+with user_id, so either serves user_id lookups and counts; the single
+column index only adds write cost.
+
+Revision ID: f0a2b4c6d8e9
+Revises: e9f1a3b5c7d8
+Create Date: 2026-10-15 19:30:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f0a2b4c6d8e9"
+down_revision = "e9f1a3b5c7d8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_saved_recipes_user_id", table_name="saved_recipes", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_saved_recipes_user_id", "saved_recipes", ["user_id"], unique=False, if_not_exists=True)
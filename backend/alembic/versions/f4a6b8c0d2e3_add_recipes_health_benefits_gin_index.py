@@ -0,0 +1,34 @@
+"""add GIN index on recipes.health_benefits
+
+PostgreSQL only: /nutrition/gaps filters recipes with
+`health_benefits::jsonb ?| array[...]`, which this expression index serves.
+The column is plain JSON, so the index is built on the jsonb cast.
+
+Revision ID: f4a6b8c0d2e3
+Revises: e3f5a7b9c1d2
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f4a6b8c0d2e3"
+down_revision = "e3f5a7b9c1d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_recipes_health_benefits_gin "
+        "ON recipes USING gin ((health_benefits::jsonb))"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_recipes_health_benefits_gin")
@@ -4,9 +4,11 @@ Runs after user actions to check if new achievements should be awarded.
 """
 import uuid
 import logging
+import time
 from datetime import datetime, timedelta, date
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import case, func, or_, update
 from app.models.gamification import Achievement, UserAchievement, XPTransaction, NutritionStreak
 from app.models.nutrition import DailyNutritionSummary, FoodLog
 from app.models.metabolic import MetabolicBudget, MetabolicScore, MetabolicStreak
@@ -418,16 +420,80 @@ def seed_achievements(db: Session):
         added += 1
     if added:
         db.commit()
+        invalidate_total_achievements()
+        invalidate_achievement_definitions()
         logger.info("Seeded %d achievements.", added)
 
 
+# ─── Achievement count cache ───
+# Definitions only change when seed_achievements runs, so /stats can reuse the
+# count for a minute instead of counting the table on every call.
+TOTAL_ACHIEVEMENTS_TTL_SECONDS = 60
+_total_achievements_cache: tuple[float, int] | None = None
+
+
+def total_achievements(db: Session) -> int:
+    global _total_achievements_cache
+    now = time.monotonic()
+    if _total_achievements_cache is not None and now - _total_achievements_cache[0] < TOTAL_ACHIEVEMENTS_TTL_SECONDS:
+        return _total_achievements_cache[1]
+    count = db.query(func.count(Achievement.id)).scalar() or 0
+    _total_achievements_cache = (now, count)
+    return count
+
+
+def invalidate_total_achievements() -> None:
+    global _total_achievements_cache
+    _total_achievements_cache = None
+
+
+# Achievement rows as plain tuples, shared across sessions for the same
+# reason; check_achievements walks them after every logged action.
+_achievement_defs_cache: tuple[float, list[tuple]] | None = None
+
+
+def achievement_definitions(db: Session) -> list[tuple]:
+    """(id, name, description, icon, xp_reward, category, criteria) per achievement."""
+    global _achievement_defs_cache
+    now = time.monotonic()
+    if _achievement_defs_cache is not None and now - _achievement_defs_cache[0] < TOTAL_ACHIEVEMENTS_TTL_SECONDS:
+        return _achievement_defs_cache[1]
+    rows = [
+        tuple(row)
+        for row in db.query(
+            Achievement.id, Achievement.name, Achievement.description, Achievement.icon,
+            Achievement.xp_reward, Achievement.category, Achievement.criteria,
+        ).all()
+    ]
+    _achievement_defs_cache = (now, rows)
+    return rows
+
+
+def invalidate_achievement_definitions() -> None:
+    global _achievement_defs_cache
+    _achievement_defs_cache = None
+
+
 # ─── Helper: award XP and log transaction ───
-def award_xp(db: Session, user: User, amount: int, reason: str) -> dict:
-    """Central XP awarding — creates transaction and updates user total."""
+def award_xp(db: Session, user: User, amount: int, reason: str, commit: bool = True) -> dict:
+    """Central XP awarding — creates transaction and updates user total.
+
+    Request handlers pass `commit=False` so the award lands in the single
+    commit issued at the end of the request (see `app.db.get_db`).
+    """
     xp_per_level = 1000
-    old_level = ((user.xp_points or 0) // xp_per_level) + 1
-    user.xp_points = (user.xp_points or 0) + amount
-    new_level = (user.xp_points // xp_per_level) + 1
+    # Increment in the database so concurrent awards can't overwrite each
+    # other, then mirror the total onto the instance without dirtying it.
+    total_xp = db.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(xp_points=func.coalesce(User.xp_points, 0) + amount)
+        .returning(User.xp_points)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+    set_committed_value(user, "xp_points", total_xp)
+    old_level = ((total_xp - amount) // xp_per_level) + 1
+    new_level = (total_xp // xp_per_level) + 1
 
     db.add(XPTransaction(
         id=str(uuid.uuid4()),
@@ -435,16 +501,58 @@ def award_xp(db: Session, user: User, amount: int, reason: str) -> dict:
         amount=amount,
         reason=reason,
     ))
-    db.commit()
+    if commit:
+        db.commit()
 
     return {
         "xp_gained": amount,
-        "total_xp": user.xp_points,
+        "total_xp": total_xp,
         "new_level": new_level if new_level > old_level else None,
         "level_title": level_title(new_level) if new_level > old_level else None,
     }
 
 
+# ─── Login streak ───
+def advance_login_streak(db: Session, user: User, now: datetime | None = None) -> int | None:
+    """Roll the user's daily login streak forward in one conditional UPDATE.
+
+    Returns the new streak, or None when the user was already active today.
+    The WHERE clause makes this succeed at most once per user per UTC day, so
+    concurrent requests cannot double count and callers can attach once-a-day
+    rewards to a non-None result without a separate check.
+    """
+    now = now or datetime.utcnow()
+    today = now.date()
+    last_day = func.date(User.last_active_date)
+    new_streak = case(
+        (last_day == today - timedelta(days=1), func.coalesce(User.current_streak, 0) + 1),
+        else_=1,
+    )
+    row = db.execute(
+        update(User)
+        .where(
+            User.id == user.id,
+            or_(User.last_active_date.is_(None), last_day < today),
+        )
+        .values(
+            current_streak=new_streak,
+            longest_streak=case(
+                (new_streak > func.coalesce(User.longest_streak, 0), new_streak),
+                else_=User.longest_streak,
+            ),
+            last_active_date=now,
+        )
+        .returning(User.current_streak, User.longest_streak)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is None:
+        return None
+    set_committed_value(user, "current_streak", row.current_streak)
+    set_committed_value(user, "longest_streak", row.longest_streak)
+    set_committed_value(user, "last_active_date", now)
+    return row.current_streak
+
+
 # ─── Nutrition streak updater ───
 def update_nutrition_streak(db: Session, user: User, daily_score: float, day: date | None = None) -> dict:
     """Call after daily score is computed. Updates the nutrition streak."""
@@ -452,10 +560,9 @@ def update_nutrition_streak(db: Session, user: User, daily_score: float, day: da
 
     ns = db.query(NutritionStreak).filter(NutritionStreak.user_id == user.id).first()
     if not ns:
-        ns = NutritionStreak(user_id=user.id, threshold=60.0)
+        ns = NutritionStreak(user_id=user.id, threshold=60.0, current_streak=0, longest_streak=0)
         db.add(ns)
-        db.commit()
-        db.refresh(ns)
+        db.flush()
 
     threshold = ns.threshold or 60.0
     qualifies = daily_score >= threshold
@@ -476,8 +583,6 @@ def update_nutrition_streak(db: Session, user: User, daily_score: float, day: da
             if (today - ns.last_qualifying_date).days > 1:
                 ns.current_streak = 0
 
-    db.commit()
-
     # Tier XP for the day (only once per day, tracked via XP transactions)
     tier_xp = 0
     tier_label = None
@@ -497,7 +602,7 @@ def update_nutrition_streak(db: Session, user: User, daily_score: float, day: da
             else:
                 tier_xp = 50
                 tier_label = "Bronze"
-            award_xp(db, user, tier_xp, f"nutrition_tier:{tier_label}")
+            award_xp(db, user, tier_xp, f"nutrition_tier:{tier_label}", commit=False)
 
     return {
         "current_streak": ns.current_streak,
@@ -697,45 +802,45 @@ def check_achievements(db: Session, user: User, context: dict | None = None) ->
     from app.models.recipe import Recipe
 
     unlocked_ids = {
-        str(ua.achievement_id)
-        for ua in db.query(UserAchievement).filter(UserAchievement.user_id == user.id).all()
+        str(achievement_id)
+        for (achievement_id,) in db.query(UserAchievement.achievement_id).filter(UserAchievement.user_id == user.id)
     }
+    pending = [row for row in achievement_definitions(db) if str(row[0]) not in unlocked_ids]
+    if not pending:
+        return []
 
-    all_achievements = db.query(Achievement).all()
     newly_unlocked = []
-
-    ctx = context or {}
     xp_per_level = 1000
 
-    # Pre-compute counts that were previously missing
-    if "saved_recipe_count" not in ctx:
-        ctx["saved_recipe_count"] = db.query(SavedRecipe).filter(
-            SavedRecipe.user_id == user.id
-        ).count()
-    if "cuisines_explored" not in ctx:
-        saved_recipe_ids = [
-            sr.recipe_id for sr in
-            db.query(SavedRecipe.recipe_id).filter(SavedRecipe.user_id == user.id).all()
-            if sr.recipe_id
-        ]
-        if saved_recipe_ids:
-            ctx["cuisines_explored"] = db.query(func.count(func.distinct(Recipe.cuisine))).filter(
-                Recipe.id.in_(saved_recipe_ids)
-            ).scalar() or 0
-        else:
-            ctx["cuisines_explored"] = 0
-    if "food_log_count" not in ctx:
-        ctx["food_log_count"] = db.query(FoodLog).filter(FoodLog.user_id == user.id).count()
+    # Every count is computed at most once per call and only if a still-locked
+    # achievement needs it; `context` seeds values the caller already has.
+    values = dict(context or {})
+
+    def value(key, compute):
+        if values.get(key) is None:
+            values[key] = compute()
+        return values[key]
+
+    def saved_recipe_count() -> int:
+        return db.query(func.count()).select_from(SavedRecipe).filter(SavedRecipe.user_id == user.id).scalar() or 0
+
+    def cuisines_explored() -> int:
+        return (
+            db.query(func.count(func.distinct(Recipe.cuisine)))
+            .join(SavedRecipe, SavedRecipe.recipe_id == Recipe.id)
+            .filter(SavedRecipe.user_id == user.id)
+            .scalar()
+            or 0
+        )
 
-    # Nutrition streak
-    ns = db.query(NutritionStreak).filter(NutritionStreak.user_id == user.id).first()
-    nutrition_streak_val = ns.current_streak if ns else 0
+    def nutrition_streak() -> int:
+        return db.query(NutritionStreak.current_streak).filter(NutritionStreak.user_id == user.id).scalar() or 0
 
-    for ach in all_achievements:
-        if str(ach.id) in unlocked_ids:
-            continue
+    def metabolic_streak() -> int:
+        return db.query(MetabolicStreak.current_streak).filter(MetabolicStreak.user_id == user.id).scalar() or 0
 
-        criteria = ach.criteria or {}
+    for ach_id, name, description, icon, xp_reward, category, criteria in pending:
+        criteria = criteria or {}
         ctype = criteria.get("type")
         target = criteria.get("target", 0)
         met = False
@@ -746,35 +851,32 @@ def check_achievements(db: Session, user: User, context: dict | None = None) ->
             level = ((user.xp_points or 0) // xp_per_level) + 1
             met = level >= target
         elif ctype == "healthify_count":
-            count = ctx.get("healthify_count")
-            if count is None:
-                count = _count_xp_transactions(db, user.id, "healthify")
-            met = count >= target
+            met = value("healthify_count", lambda: _count_xp_transactions(db, user.id, "healthify")) >= target
         elif ctype == "meal_plan_count":
-            count = ctx.get("meal_plan_count")
-            if count is None:
-                count = db.query(MealPlan).filter(MealPlan.user_id == user.id).count()
-            met = count >= target
+            met = value(
+                "meal_plan_count", lambda: db.query(MealPlan).filter(MealPlan.user_id == user.id).count()
+            ) >= target
         elif ctype == "grocery_count":
-            count = ctx.get("grocery_count")
-            if count is None:
-                count = db.query(GroceryList).filter(GroceryList.user_id == user.id).count()
-            met = count >= target
+            met = value(
+                "grocery_count", lambda: db.query(GroceryList).filter(GroceryList.user_id == user.id).count()
+            ) >= target
         elif ctype == "saved_recipe_count":
-            met = ctx.get("saved_recipe_count", 0) >= target
+            met = value("saved_recipe_count", saved_recipe_count) >= target
         elif ctype == "cuisines_explored":
-            met = ctx.get("cuisines_explored", 0) >= target
+            met = value("cuisines_explored", cuisines_explored) >= target
         # ── NEW nutrition types ──
         elif ctype == "nutrition_streak":
-            met = nutrition_streak_val >= target
+            met = value("nutrition_streak", nutrition_streak) >= target
         elif ctype == "bronze_days":
-            met = _count_nutrition_days(db, user.id, 60) >= target
+            met = value(("nutrition_days", 60), lambda: _count_nutrition_days(db, user.id, 60)) >= target
         elif ctype == "silver_days":
-            met = _count_nutrition_days(db, user.id, 75) >= target
+            met = value(("nutrition_days", 75), lambda: _count_nutrition_days(db, user.id, 75)) >= target
         elif ctype == "gold_days":
-            met = _count_nutrition_days(db, user.id, 90) >= target
+            met = value(("nutrition_days", 90), lambda: _count_nutrition_days(db, user.id, 90)) >= target
         elif ctype == "food_log_count":
-            met = ctx.get("food_log_count", 0) >= target
+            met = value(
+                "food_log_count", lambda: db.query(FoodLog).filter(FoodLog.user_id == user.id).count()
+            ) >= target
         elif ctype == "weekly_nutrient_hit":
             nutrient = criteria.get("nutrient", "")
             days_req = criteria.get("days_required", 5)
@@ -788,53 +890,42 @@ def check_achievements(db: Session, user: User, context: dict | None = None) ->
 
         # ── Metabolic (MES) types ──
         elif ctype == "metabolic_streak":
-            ms = db.query(MetabolicStreak).filter(MetabolicStreak.user_id == user.id).first()
-            met = (ms.current_streak if ms else 0) >= target
+            met = value("metabolic_streak", metabolic_streak) >= target
         elif ctype == "metabolic_days_stable":
-            met = _count_metabolic_days(db, user.id, 60) >= target
+            met = value(("metabolic_days", 60), lambda: _count_metabolic_days(db, user.id, 60)) >= target
         elif ctype == "metabolic_days_optimal":
-            met = _count_metabolic_days(db, user.id, 80) >= target
+            met = value(("metabolic_days", 80), lambda: _count_metabolic_days(db, user.id, 80)) >= target
         elif ctype == "guardrail_streak":
             guardrail = criteria.get("guardrail", "")
             met = _check_guardrail_streak(db, user.id, guardrail, target)
         elif ctype == "all_guardrails_day":
-            met = _check_all_guardrails_day(db, user.id)
+            met = value("all_guardrails_day", lambda: _check_all_guardrails_day(db, user.id))
         elif ctype == "all_guardrails_week":
             met = _check_all_guardrails_week(db, user.id, target)
         elif ctype == "crash_to_stable_recovery":
-            met = _check_crash_recovery(db, user.id)
+            met = value("crash_to_stable_recovery", lambda: _check_crash_recovery(db, user.id))
         elif ctype == "triple_90_meal":
-            met = _check_triple_90_meal(db, user.id)
+            met = value("triple_90_meal", lambda: _check_triple_90_meal(db, user.id))
 
         if met:
-            ua = UserAchievement(
+            db.add(UserAchievement(
                 id=str(uuid.uuid4()),
                 user_id=user.id,
-                achievement_id=ach.id,
+                achievement_id=ach_id,
                 unlocked_at=datetime.utcnow(),
-            )
-            db.add(ua)
-
-            user.xp_points = (user.xp_points or 0) + ach.xp_reward
-            db.add(XPTransaction(
-                id=str(uuid.uuid4()),
-                user_id=user.id,
-                amount=ach.xp_reward,
-                reason=f"achievement:{ach.name}",
             ))
 
+            award_xp(db, user, xp_reward, f"achievement:{name}", commit=False)
+
             newly_unlocked.append({
-                "id": str(ach.id),
-                "name": ach.name,
-                "description": ach.description,
-                "icon": ach.icon,
-                "xp_reward": ach.xp_reward,
-                "category": ach.category,
+                "id": str(ach_id),
+                "name": name,
+                "description": description,
+                "icon": icon,
+                "xp_reward": xp_reward,
+                "category": category,
             })
 
-    if newly_unlocked:
-        db.commit()
-
     return newly_unlocked
 
 
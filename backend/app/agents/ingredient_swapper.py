@@ -1,9 +1,11 @@
 import json
-from copy import deepcopy
+import logging
 from typing import Any, Dict, List
 
 from app.agents.llm_provider import get_llm
 
+logger = logging.getLogger(__name__)
+
 
 SYSTEM_PROMPT = """You are a professional chef and nutritionist helping users substitute ingredients.
 
@@ -42,9 +44,6 @@ async def generate_ai_substitutions(
     disliked_proteins: List[str],
     custom_excludes: List[str] | None = None,
 ) -> Dict[str, Any]:
-    import logging
-    logger = logging.getLogger(__name__)
-    
     llm = get_llm()
 
     payload = {
@@ -78,7 +77,7 @@ async def generate_ai_substitutions(
         data = json.loads(cleaned)
 
     return {
-        "modified_recipe": data.get("modified_recipe") or deepcopy(recipe),
+        "modified_recipe": data.get("modified_recipe") or {**recipe},
         "swaps": data.get("swaps") or [],
         "warnings": data.get("warnings") or [],
         "used_ai": True,
@@ -24,6 +24,7 @@ VARIETY_LIMITS = {
     "balanced": {"breakfast": 3, "lunch": 3, "dinner": 3},
     "variety_heavy": {"breakfast": 4, "lunch": 4, "dinner": 4},
 }
+SWEET_TAGS = frozenset({"sweet"})
 PAIRING_ROLE_PRIORITY = ["veg_side", "carb_base", "sauce", "dessert", "protein_base", "full_meal"]
 
 
@@ -84,11 +85,19 @@ def _meal_display_mes(recipe: Recipe, budget: Any, recipe_index: dict[str, Recip
     }
 
 
-def _matches_dietary(recipe: Recipe, dietary: list[str]) -> bool:
-    required = {item.lower() for item in dietary if item and item.lower() != "none"}
+def _lowered_tags(values: list[str] | None) -> frozenset[str]:
+    """Lowercased preference tags, built once per request; "none" is not a tag."""
+    return frozenset(item.lower() for item in (values or []) if item and item.lower() != "none")
+
+
+def _has_any_tag(recipe_tags: list | None, wanted: frozenset[str]) -> bool:
+    return any(str(tag).lower() in wanted for tag in (recipe_tags or ()))
+
+
+def _matches_dietary(recipe: Recipe, required: frozenset[str]) -> bool:
     if not required:
         return True
-    recipe_tags = {item.lower() for item in (recipe.dietary_tags or [])}
+    recipe_tags = {str(item).lower() for item in (recipe.dietary_tags or [])}
     return required.issubset(recipe_tags)
 
 
@@ -119,34 +128,28 @@ def _is_breakfast_safe(recipe: Recipe, context: dict | None = None) -> bool:
     if nutrition["carbs"] > max_carbs or nutrition["calories"] > max_cals:
         return False
 
-    flavor_tags = {tag.lower() for tag in (recipe.flavor_profile or [])}
-    if "sweet" in flavor_tags:
-        return False
-    return True
+    return not _has_any_tag(recipe.flavor_profile, SWEET_TAGS)
 
 
 def _preference_alignment_score(
     recipe: Recipe,
-    dietary: list[str],
-    flavor_preferences: list[str],
-    liked_ingredients: list[str],
-    liked_proteins: list[str],
+    ingredient_names: str,
+    dietary_wanted: frozenset[str],
+    flavor_wanted: frozenset[str],
+    liked_ingredients_lower: list[str],
+    liked_proteins_lower: list[str],
     preferred_recipe_ids: set[str],
 ) -> int:
     score = 0
-    ingredient_names = " ".join(ing.get("name", "") for ing in (recipe.ingredients or [])).lower()
-    dietary_tags = {tag.lower() for tag in (recipe.dietary_tags or [])}
-    flavor_tags = {tag.lower() for tag in (recipe.flavor_profile or [])}
-
     if str(recipe.id) in preferred_recipe_ids:
         score += 6
-    if dietary and dietary_tags.intersection({tag.lower() for tag in dietary if tag.lower() != "none"}):
+    if dietary_wanted and _has_any_tag(recipe.dietary_tags, dietary_wanted):
         score += 2
-    if flavor_preferences and flavor_tags.intersection({tag.lower() for tag in flavor_preferences}):
+    if flavor_wanted and _has_any_tag(recipe.flavor_profile, flavor_wanted):
         score += 2
-    if liked_ingredients and any(item.lower() in ingredient_names for item in liked_ingredients):
+    if any(item in ingredient_names for item in liked_ingredients_lower):
         score += 2
-    if liked_proteins and any(item.lower() in ingredient_names for item in liked_proteins):
+    if any(item in ingredient_names for item in liked_proteins_lower):
         score += 3
 
     return score
@@ -170,6 +173,10 @@ def _candidate_pool(
     allergy_lower = {a.lower() for a in allergies}
     disliked_ingredients_lower = {d.lower() for d in disliked_ingredients}
     disliked_proteins_lower = {p.lower() for p in disliked_proteins}
+    dietary_wanted = _lowered_tags(dietary)
+    flavor_wanted = frozenset(f.lower() for f in flavor_preferences)
+    liked_ingredients_lower = [i.lower() for i in liked_ingredients]
+    liked_proteins_lower = [p.lower() for p in liked_proteins]
 
     ranked: list[dict[str, Any]] = []
     for recipe in all_recipes:
@@ -179,7 +186,7 @@ def _candidate_pool(
             continue
         if recipe.is_mes_scoreable is False:
             continue
-        if not _matches_dietary(recipe, dietary):
+        if not _matches_dietary(recipe, dietary_wanted):
             continue
         if str(recipe.id) in avoided_recipe_ids:
             continue
@@ -197,10 +204,11 @@ def _candidate_pool(
         mes = _meal_display_mes(recipe, budget, recipe_index)
         preference_score = _preference_alignment_score(
             recipe=recipe,
-            dietary=dietary,
-            flavor_preferences=flavor_preferences,
-            liked_ingredients=liked_ingredients,
-            liked_proteins=liked_proteins,
+            ingredient_names=ingredient_names,
+            dietary_wanted=dietary_wanted,
+            flavor_wanted=flavor_wanted,
+            liked_ingredients_lower=liked_ingredients_lower,
+            liked_proteins_lower=liked_proteins_lower,
             preferred_recipe_ids=preferred_recipe_ids,
         )
         display_score = float(mes.get("display_score", 0) or 0)
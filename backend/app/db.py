@@ -1,13 +1,31 @@
 import uuid
 
-from sqlalchemy import String, TypeDecorator, create_engine
+from sqlalchemy import String, Text, TypeDecorator, and_, case, cast, create_engine, exists, func, select
+from sqlalchemy.dialects.postgresql import JSONB, array as pg_array, insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url)
+
+def _engine_options(database_url: str) -> dict:
+    options = {"query_cache_size": settings.db_query_cache_size}
+    # SQLite (tests, local scripts) manages its own connections.
+    if database_url.startswith("sqlite"):
+        return options
+    return {
+        **options,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": True,
+    }
+
+
+engine = create_engine(settings.database_url, **_engine_options(settings.database_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -32,10 +50,44 @@ class Base(DeclarativeBase):
     pass
 
 
+def dialect_insert(db, model):
+    """INSERT construct with ON CONFLICT support for the session's backend."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql_insert(model)
+    return sqlite_insert(model)
+
+
+def json_array_elements(column, dialect_name: str):
+    """Table-valued FROM item yielding each element of the JSON array in
+    `column` as text in `.c.value`; non-array values yield no rows."""
+    if dialect_name == "postgresql":
+        type_of, elements_of = func.json_typeof, func.json_array_elements_text
+    else:
+        type_of, elements_of = func.json_type, func.json_each
+    return elements_of(case((type_of(column) == "array", column))).table_valued("value").alias()
+
+
+def json_array_has_any(column, values, dialect_name: str):
+    """SQL predicate: the JSON array in `column` holds any of `values`, compared
+    case-insensitively. Rows whose value is not an array never match."""
+    wanted = [str(v).lower() for v in values]
+    if dialect_name == "postgresql":
+        # Matches the GIN indexes on (lower(column::text)::jsonb).
+        lowered = cast(func.lower(cast(column, Text)), JSONB)
+        return and_(func.jsonb_typeof(lowered) == "array", lowered.op("?|")(pg_array(wanted)))
+    elements = json_array_elements(column, dialect_name)
+    return exists(select(1).select_from(elements).where(func.lower(elements.c.value).in_(wanted)))
+
+
 def get_db():
+    """Request-scoped session: commits once on success, rolls back on error."""
     db = SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
@@ -11,7 +11,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.config import get_settings
+from app.responses import FastJSONResponse
 from app.routers import auth, billing, chat, meal_plan, grocery, recipes, food_db, gamification, nutrition, metabolic, whole_food_scan, scan, telemetry, notifications
+from app.services.leaderboard import leaderboard_refresh_loop
 from app.services.notifications import notification_scheduler_loop
 
 # Import all models so they register with Base.metadata
@@ -42,13 +44,18 @@ async def lifespan(app: FastAPI):
     if settings.run_notification_scheduler:
         scheduler_task = asyncio.create_task(notification_scheduler_loop())
         app_logger.info(json.dumps({"event": "scheduler.started"}))
+    leaderboard_task = None
+    if settings.run_leaderboard_refresh:
+        leaderboard_task = asyncio.create_task(leaderboard_refresh_loop(settings.leaderboard_refresh_seconds))
     try:
         yield
     finally:
-        if scheduler_task is not None:
-            scheduler_task.cancel()
+        for task in (scheduler_task, leaderboard_task):
+            if task is None:
+                continue
+            task.cancel()
             try:
-                await scheduler_task
+                await task
             except asyncio.CancelledError:
                 pass
 
@@ -124,6 +131,7 @@ app = FastAPI(
     description="Backend API for WholeFoodLabs - eat real, whole foods",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 cors_origins = _parse_cors_origins(settings.cors_allowed_origins)
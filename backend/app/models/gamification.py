@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, date
-from sqlalchemy import Column, String, Integer, DateTime, Date, Float, ForeignKey, JSON, Boolean, UniqueConstraint
+from sqlalchemy import Column, String, Integer, DateTime, Date, Float, ForeignKey, JSON, Boolean, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.db import Base, GUID
 
@@ -33,13 +33,15 @@ class UserAchievement(Base):
 
 
 class XPTransaction(Base):
+    """Range-partitioned by month on created_at in PostgreSQL (see migration c5d7e9f1a2b3)."""
     __tablename__ = "xp_transactions"
+    __table_args__ = (Index("ix_xp_transactions_user_created", "user_id", "created_at"),)
 
     id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(GUID, ForeignKey("users.id"), nullable=False)
     amount = Column(Integer, nullable=False)
     reason = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
 
 class NutritionStreak(Base):
@@ -31,6 +31,8 @@ class MealPlanItem(Base):
     is_bulk_cook = Column(Boolean, default=False)
     servings = Column(Integer, default=1)
     recipe_data = Column(JSON, default=dict)
+    # recipe_data["ingredients"] run through app.services.grocery_items at write time.
+    normalized_ingredients = Column(JSON, nullable=True)
 
     meal_plan = relationship("MealPlan", back_populates="items")
     recipe = relationship("Recipe")
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, date
-from sqlalchemy import Column, String, DateTime, Date, ForeignKey, JSON, Float, UniqueConstraint
+from sqlalchemy import Column, String, DateTime, Date, ForeignKey, JSON, Float, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.db import Base, GUID
 
@@ -27,6 +27,10 @@ class NutritionTarget(Base):
 
 class FoodLog(Base):
     __tablename__ = "food_logs"
+    __table_args__ = (
+        Index("ix_food_logs_user_created", "user_id", "created_at"),
+        Index("ix_food_logs_user_date", "user_id", "date"),
+    )
 
     id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(GUID, ForeignKey("users.id"), nullable=False, index=True)
@@ -1,13 +1,22 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, UniqueConstraint, Uuid
+from sqlalchemy.orm import relationship
 from app.db import Base, GUID
 
 
 class SavedRecipe(Base):
     __tablename__ = "saved_recipes"
+    __table_args__ = (
+        Index("ix_saved_recipes_user_saved_at", "user_id", "saved_at"),
+        UniqueConstraint("user_id", "recipe_id", name="uq_saved_recipes_user_recipe"),
+    )
 
-    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(GUID, ForeignKey("users.id"), nullable=False, index=True)
-    recipe_id = Column(GUID, ForeignKey("recipes.id"), nullable=False)
+    # Native uuid on PostgreSQL (16 bytes, server default gen_random_uuid());
+    # values still round-trip as strings.
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(GUID, ForeignKey("users.id"), nullable=False)
+    recipe_id = Column(GUID, ForeignKey("recipes.id"), nullable=False, index=True)
     saved_at = Column(DateTime, default=datetime.utcnow)
+
+    recipe = relationship("Recipe", lazy="raise")
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Boolean, Column, String, Integer, DateTime, JSON
+from sqlalchemy import Boolean, Column, String, Integer, DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 from app.db import Base, GUID
 
@@ -49,3 +49,7 @@ class User(Base):
     chat_sessions = relationship("ChatSession", back_populates="user")
     achievements = relationship("UserAchievement", back_populates="user")
     push_tokens = relationship("UserPushToken")
+
+    __table_args__ = (
+        Index("ix_users_xp_desc", xp_points.desc()),
+    )
@@ -2,6 +2,7 @@
 Deterministic ingredient-to-health-benefit mapping.
 No LLM calls — pure dictionary lookup at seed time.
 """
+from functools import lru_cache
 from typing import List, Set
 
 INGREDIENT_HEALTH_MAP: dict[str, list[str]] = {
@@ -257,16 +258,22 @@ HEALTH_BENEFIT_LABELS: dict[str, str] = {
 }
 
 
+@lru_cache(maxsize=2048)
+def _benefits_for_name(name: str) -> tuple[str, ...]:
+    # Exact match first, else the first keyword that contains or is
+    # contained by the name. The fallback walks the whole map, and the same
+    # names ("garlic", "olive oil") recur in nearly every meal, hence the cache.
+    if name in INGREDIENT_HEALTH_MAP:
+        return tuple(INGREDIENT_HEALTH_MAP[name])
+    for keyword, tags in INGREDIENT_HEALTH_MAP.items():
+        if keyword in name or name in keyword:
+            return tuple(tags)
+    return ()
+
+
 def compute_health_benefits(ingredients: list[dict]) -> list[str]:
     """Scan a meal's ingredient list and return deduplicated health benefit tags."""
     benefits: Set[str] = set()
     for ing in ingredients:
-        name = ing.get("name", "").lower().strip()
-        if name in INGREDIENT_HEALTH_MAP:
-            benefits.update(INGREDIENT_HEALTH_MAP[name])
-        else:
-            for keyword, tags in INGREDIENT_HEALTH_MAP.items():
-                if keyword in name or name in keyword:
-                    benefits.update(tags)
-                    break
+        benefits.update(_benefits_for_name(ing.get("name", "").lower().strip()))
     return sorted(benefits)
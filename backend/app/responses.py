@@ -0,0 +1,15 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic-core's Rust serializer instead of stdlib json.
+
+    Output matches Starlette's compact UTF-8 encoding; NaN/Infinity become
+    null rather than raising.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content, inf_nan_mode="null")
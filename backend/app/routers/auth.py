@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 from app.config import get_settings
 from app.db import get_db
 from app.auth import get_password_hash, verify_password, create_token_pair, verify_refresh_token, get_current_user
+from app.achievements_engine import advance_login_streak
 from app.models.user import User
 from app.schemas.billing import EntitlementInfo
 from app.schemas.auth import UserRegister, UserLogin, Token, UserProfile, UserPreferencesUpdate, SocialAuthRequest
@@ -132,18 +133,8 @@ def _serialize_profile(current_user: User) -> UserProfile:
 
 def _auto_update_streak(user: User, db: Session):
     """Silently update streak when user fetches profile."""
-    today = datetime.utcnow().date()
-    last_active = user.last_active_date.date() if user.last_active_date else None
-    if last_active == today:
-        return
-    if last_active and (today - last_active).days == 1:
-        user.current_streak = (user.current_streak or 0) + 1
-    elif not last_active or (today - last_active).days > 1:
-        user.current_streak = 1
-    if (user.current_streak or 0) > (user.longest_streak or 0):
-        user.longest_streak = user.current_streak
-    user.last_active_date = datetime.utcnow()
-    db.commit()
+    if advance_login_streak(db, user) is not None:
+        db.commit()
 
 
 @router.post("/register", response_model=Token)
@@ -11,15 +11,14 @@ from app.services.food_catalog import serialize_food_detail, serialize_food_sear
 router = APIRouter()
 
 
-def _matches_query(food: LocalFood, query: str) -> bool:
-    q = (query or "").strip().lower()
-    haystacks = [
-        food.name or "",
-        food.brand or "",
-        food.category or "",
-        " ".join(food.aliases or []),
-    ]
-    return any(q in value.lower() for value in haystacks)
+def _matches_query(food: LocalFood, lowered_query: str) -> bool:
+    if lowered_query in (food.name or "").lower():
+        return True
+    if lowered_query in (food.brand or "").lower():
+        return True
+    if lowered_query in (food.category or "").lower():
+        return True
+    return lowered_query in " ".join(food.aliases or []).lower()
 
 
 @router.get("/search")
@@ -41,7 +40,8 @@ async def search_foods(
         .order_by(LocalFood.name.asc())
         .all()
     )
-    matches = [food for food in foods if _matches_query(food, query)]
+    lowered_query = query.lower()
+    matches = [food for food in foods if _matches_query(food, lowered_query)]
     start = (page - 1) * page_size
     end = start + page_size
     return {
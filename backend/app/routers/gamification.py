@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import case, func, insert, or_, select, update
 from sqlalchemy.orm import Session
 from app.db import get_db
 from app.auth import get_current_user
@@ -11,18 +12,35 @@ from app.schemas.gamification import (
     AchievementResponse, UserStatsResponse, LeaderboardEntry, XPGainResponse,
     DailyQuestResponse, NutritionStreakResponse, ScoreHistoryEntry,
 )
-from app.achievements_engine import check_achievements, award_xp, update_nutrition_streak, level_title
+from app.achievements_engine import (
+    advance_login_streak, award_xp, check_achievements, level_title, total_achievements,
+)
+from app.services.leaderboard import fetch_leaderboard
 from app.services.notifications import process_user_notifications, record_notification_event
-from typing import List, Optional
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import List
 from datetime import datetime, timedelta, date
+import hashlib
+import threading
+import time
 import uuid
-import random
 
 router = APIRouter()
 
 XP_PER_LEVEL = 1000
 
 
+# Daily score tier cut-offs: below 60 "none", then bronze / silver / gold.
+SCORE_TIER_THRESHOLDS = (60, 75, 90)
+SCORE_TIER_NAMES = ("none", "bronze", "silver", "gold")
+
+
+def request_now() -> datetime:
+    """One UTC timestamp per request; FastAPI caches dependencies per request."""
+    return datetime.utcnow()
+
+
 def calculate_level(xp: int) -> int:
     return (xp // XP_PER_LEVEL) + 1
 
@@ -32,18 +50,24 @@ def xp_to_next_level(xp: int) -> int:
 
 
 @router.get("/stats", response_model=UserStatsResponse)
-async def get_stats(
+def get_stats(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    total_achievements = db.query(Achievement).count()
-    unlocked = db.query(UserAchievement).filter(
-        UserAchievement.user_id == current_user.id
-    ).count()
+    # One round-trip: the unlock count and nutrition streak as scalar subqueries.
+    unlocked, ns_current, ns_longest = db.query(
+        select(func.count(UserAchievement.id))
+        .where(UserAchievement.user_id == current_user.id)
+        .scalar_subquery(),
+        select(NutritionStreak.current_streak)
+        .where(NutritionStreak.user_id == current_user.id)
+        .scalar_subquery(),
+        select(NutritionStreak.longest_streak)
+        .where(NutritionStreak.user_id == current_user.id)
+        .scalar_subquery(),
+    ).one()
     lvl = calculate_level(current_user.xp_points)
 
-    ns = db.query(NutritionStreak).filter(NutritionStreak.user_id == current_user.id).first()
-
     return UserStatsResponse(
         xp_points=current_user.xp_points,
         current_streak=current_user.current_streak,
@@ -52,51 +76,54 @@ async def get_stats(
         level_title=level_title(lvl),
         xp_to_next_level=xp_to_next_level(current_user.xp_points),
         achievements_unlocked=unlocked,
-        total_achievements=total_achievements,
-        nutrition_streak=ns.current_streak if ns else 0,
-        nutrition_longest_streak=ns.longest_streak if ns else 0,
+        total_achievements=total_achievements(db),
+        nutrition_streak=ns_current or 0,
+        nutrition_longest_streak=ns_longest or 0,
     )
 
 
-@router.get("/achievements", response_model=List[AchievementResponse])
-async def get_achievements(
+# Hot read-only list endpoints return plain dicts and skip response-model
+# validation; `responses=` keeps their schema in the OpenAPI docs.
+@router.get("/achievements", response_model=None, responses={200: {"model": List[AchievementResponse]}})
+def get_achievements(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    achievements = db.query(Achievement).all()
-    user_achievements = {
-        str(ua.achievement_id): ua.unlocked_at
-        for ua in db.query(UserAchievement).filter(
-            UserAchievement.user_id == current_user.id
-        ).all()
-    }
+    rows = (
+        db.query(Achievement, UserAchievement.unlocked_at)
+        .outerjoin(
+            UserAchievement,
+            (UserAchievement.achievement_id == Achievement.id)
+            & (UserAchievement.user_id == current_user.id),
+        )
+        .all()
+    )
 
     return [
-        AchievementResponse(
-            id=str(a.id),
-            name=a.name,
-            description=a.description,
-            icon=a.icon,
-            xp_reward=a.xp_reward,
-            category=a.category,
-            unlocked=str(a.id) in user_achievements,
-            unlocked_at=user_achievements.get(str(a.id), {
-            }).isoformat() if str(a.id) in user_achievements else None,
-        )
-        for a in achievements
+        {
+            "id": str(a.id),
+            "name": a.name,
+            "description": a.description,
+            "icon": a.icon,
+            "xp_reward": a.xp_reward,
+            "category": a.category,
+            "unlocked": unlocked_at is not None,
+            "unlocked_at": unlocked_at.isoformat() if unlocked_at else None,
+        }
+        for a, unlocked_at in rows
     ]
 
 
 @router.post("/xp", response_model=XPGainResponse)
-async def award_xp_endpoint(
+def award_xp_endpoint(
     amount: int,
     reason: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    result = award_xp(db, current_user, amount, reason)
+    result = award_xp(db, current_user, amount, reason, commit=False)
 
-    # Auto-check achievements after XP gain
+    # Auto-check achievements after XP gain; get_db commits both together.
     new_achievements = check_achievements(db, current_user)
 
     return XPGainResponse(
@@ -115,44 +142,53 @@ async def award_xp_endpoint(
     )
 
 
-@router.get("/leaderboard", response_model=List[LeaderboardEntry])
-async def get_leaderboard(
+@router.get("/leaderboard", response_model=None, responses={200: {"model": List[LeaderboardEntry]}})
+def get_leaderboard(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    top_users = db.query(User).order_by(User.xp_points.desc()).limit(20).all()
-    return [
-        LeaderboardEntry(
-            rank=i + 1,
-            name=u.name,
-            xp_points=u.xp_points,
-            streak=u.current_streak,
-            level=calculate_level(u.xp_points),
-            level_title=level_title(calculate_level(u.xp_points)),
-        )
-        for i, u in enumerate(top_users)
-    ]
+    entries = []
+    for rank, u in enumerate(fetch_leaderboard(db), start=1):
+        lvl = calculate_level(u.xp_points)
+        entries.append({
+            "rank": rank,
+            "name": u.name,
+            "xp_points": u.xp_points,
+            "streak": u.current_streak,
+            "level": lvl,
+            "level_title": level_title(lvl),
+        })
+    return entries
+
+
+def _reason_count(*needles: str):
+    """SUM expression counting XP transactions whose reason contains any needle."""
+    matched = or_(*(XPTransaction.reason.ilike(f"%{n}%") for n in needles))
+    return func.coalesce(func.sum(case((matched, 1), else_=0)), 0)
 
 
 @router.get("/weekly-stats")
-async def get_weekly_stats(
+def get_weekly_stats(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    now: datetime = Depends(request_now),
 ):
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    xp_this_week = (
-        db.query(XPTransaction)
+    week_ago = now - timedelta(days=7)
+
+    meals_cooked, foods_explored, xp_earned = (
+        db.query(
+            _reason_count("cook", "meal_log"),
+            _reason_count("explore", "browse"),
+            func.coalesce(func.sum(XPTransaction.amount), 0),
+        )
         .filter(XPTransaction.user_id == current_user.id, XPTransaction.created_at >= week_ago)
-        .all()
+        .one()
     )
-
-    meals_cooked = sum(1 for t in xp_this_week if "cook" in (t.reason or "").lower() or "meal_log" in (t.reason or "").lower())
     recipes_saved = (
         db.query(SavedRecipe)
         .filter(SavedRecipe.user_id == current_user.id, SavedRecipe.saved_at >= week_ago)
         .count()
     )
-    foods_explored = sum(1 for t in xp_this_week if "explore" in (t.reason or "").lower() or "browse" in (t.reason or "").lower())
     meals_logged = db.query(FoodLog).filter(
         FoodLog.user_id == current_user.id, FoodLog.created_at >= week_ago
     ).count()
@@ -162,12 +198,12 @@ async def get_weekly_stats(
         "recipes_saved": recipes_saved,
         "foods_explored": foods_explored,
         "meals_logged": meals_logged,
-        "xp_earned": sum(t.amount for t in xp_this_week),
+        "xp_earned": xp_earned,
     }
 
 
 @router.post("/check-achievements")
-async def trigger_achievement_check(
+def trigger_achievement_check(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -176,37 +212,18 @@ async def trigger_achievement_check(
 
 
 @router.post("/streak")
-async def update_streak(
+def update_streak(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    now: datetime = Depends(request_now),
 ):
-    today = datetime.utcnow().date()
-    last_active = current_user.last_active_date.date() if current_user.last_active_date else None
-
-    if last_active == today:
+    updated_streak = advance_login_streak(db, current_user, now)
+    if updated_streak is None:
         return {"message": "Already logged today", "streak": current_user.current_streak}
 
-    if last_active and (today - last_active).days == 1:
-        current_user.current_streak += 1
-    elif last_active and (today - last_active).days > 1:
-        current_user.current_streak = 1
-    else:
-        current_user.current_streak = 1
-
-    if current_user.current_streak > current_user.longest_streak:
-        current_user.longest_streak = current_user.current_streak
-
-    current_user.last_active_date = datetime.utcnow()
-    db.commit()
-
-    # Award daily streak XP (once per day)
-    existing_streak_xp = db.query(XPTransaction).filter(
-        XPTransaction.user_id == current_user.id,
-        XPTransaction.reason == "daily_streak",
-        XPTransaction.created_at >= datetime.combine(today, datetime.min.time()),
-    ).first()
-    if not existing_streak_xp:
-        award_xp(db, current_user, 100, "daily_streak")
+    # advance_login_streak succeeds at most once per day, so this is the
+    # day's only streak award.
+    award_xp(db, current_user, 100, "daily_streak", commit=False)
 
     # Check streak-related achievements
     check_achievements(db, current_user)
@@ -214,13 +231,13 @@ async def update_streak(
         db,
         current_user.id,
         "streak_updated",
-        properties={"streak": current_user.current_streak},
+        properties={"streak": updated_streak},
         source="server",
     )
     process_user_notifications(db, current_user.id)
     db.commit()
 
-    return {"message": "Streak updated", "streak": current_user.current_streak}
+    return {"message": "Streak updated", "streak": updated_streak}
 
 
 # ═══════════════════════════════════
@@ -228,7 +245,7 @@ async def update_streak(
 # ═══════════════════════════════════
 
 @router.get("/nutrition-streak", response_model=NutritionStreakResponse)
-async def get_nutrition_streak(
+def get_nutrition_streak(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -247,15 +264,16 @@ async def get_nutrition_streak(
 # Score History (30-day calendar data)
 # ═══════════════════════════════════
 
-@router.get("/score-history", response_model=List[ScoreHistoryEntry])
-async def get_score_history(
+@router.get("/score-history", response_model=None, responses={200: {"model": List[ScoreHistoryEntry]}})
+def get_score_history(
     days: int = 30,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    now: datetime = Depends(request_now),
 ):
-    start_date = datetime.utcnow().date() - timedelta(days=days)
-    summaries = (
-        db.query(DailyNutritionSummary)
+    start_date = now.date() - timedelta(days=days)
+    rows = (
+        db.query(DailyNutritionSummary.date, func.coalesce(DailyNutritionSummary.daily_score, 0.0))
         .filter(
             DailyNutritionSummary.user_id == current_user.id,
             DailyNutritionSummary.date >= start_date,
@@ -264,12 +282,12 @@ async def get_score_history(
         .all()
     )
     return [
-        ScoreHistoryEntry(
-            date=s.date.isoformat(),
-            score=round(s.daily_score or 0, 1),
-            tier="gold" if (s.daily_score or 0) >= 90 else "silver" if (s.daily_score or 0) >= 75 else "bronze" if (s.daily_score or 0) >= 60 else "none",
-        )
-        for s in summaries
+        {
+            "date": day.isoformat(),
+            "score": round(score, 1),
+            "tier": SCORE_TIER_NAMES[bisect_right(SCORE_TIER_THRESHOLDS, score)],
+        }
+        for day, score in rows
     ]
 
 
@@ -277,6 +295,11 @@ async def get_score_history(
 # Daily Quests
 # ═══════════════════════════════════
 
+def _quest_seed(user_id, day: date) -> int:
+    digest = hashlib.blake2b(f"{user_id}-{day.isoformat()}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
 def _generate_quests(db: Session, user: User, today: date) -> list[DailyQuest]:
     """Generate 3 daily quests: 1 general, 1 logging, 1 quality."""
     targets = db.query(NutritionTarget).filter(NutritionTarget.user_id == user.id).first()
@@ -317,40 +340,81 @@ def _generate_quests(db: Session, user: User, today: date) -> list[DailyQuest]:
         ("Budget Lockdown", "Hit all 3 metabolic guardrails today.", "budget_lockdown", 1, 100),
     ]
 
-    random.seed(f"{user.id}-{today.isoformat()}")  # deterministic per user per day
-    gen = random.choice(general_pool)
-    log = random.choice(logging_pool)
-    qual = random.choice(quality_pool)
-    meta = random.choice(metabolic_pool)
-
-    quests = []
-    for quest_type, (title, desc, meta_key, target, xp) in [("general", gen), ("logging", log), ("quality", qual), ("metabolic", meta)]:
-        q = DailyQuest(
-            id=str(uuid.uuid4()),
-            user_id=user.id,
-            date=today,
-            quest_type=quest_type,
-            title=title,
-            description=desc,
-            target_value=float(target),
-            current_value=0,
-            xp_reward=xp,
-            completed=False,
-            metadata_json={"key": meta_key},
-        )
-        db.add(q)
-        quests.append(q)
-
+    # Deterministic per user per day without touching the global `random` state.
+    seed = _quest_seed(user.id, today)
+    gen = general_pool[seed % len(general_pool)]
+    log = logging_pool[(seed >> 16) % len(logging_pool)]
+    qual = quality_pool[(seed >> 32) % len(quality_pool)]
+    meta = metabolic_pool[(seed >> 48) % len(metabolic_pool)]
+
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user.id,
+            "date": today,
+            "quest_type": quest_type,
+            "title": title,
+            "description": desc,
+            "target_value": float(target),
+            "current_value": 0,
+            "xp_reward": xp,
+            "completed": False,
+            "metadata_json": {"key": meta_key},
+        }
+        for quest_type, (title, desc, meta_key, target, xp) in [("general", gen), ("logging", log), ("quality", qual), ("metabolic", meta)]
+    ]
+    # One multi-row INSERT instead of a unit-of-work flush per quest.
+    db.execute(insert(DailyQuest), rows)
     db.commit()
-    return quests
+    # Transient instances are enough for the response; nothing else reads them.
+    return [DailyQuest(**row) for row in rows]
+
+
+# Per-process cache of each user's quest list for the day. Every quest write
+# goes through this router and drops the entry; the TTL bounds staleness when
+# a write lands on another API instance.
+QUEST_CACHE_TTL_SECONDS = 60
+QUEST_CACHE_MAX_ENTRIES = 2048
+_quest_cache: OrderedDict[tuple[str, date], tuple[float, list[dict]]] = OrderedDict()
+# Sync handlers run on threadpool workers; every read-modify of the
+# OrderedDict (lookup + move_to_end, insert + evict) happens under this lock.
+_quest_cache_lock = threading.Lock()
+
+
+def _cached_quests(key: tuple[str, date]) -> list[dict] | None:
+    with _quest_cache_lock:
+        cached = _quest_cache.get(key)
+        if cached is None or time.monotonic() - cached[0] >= QUEST_CACHE_TTL_SECONDS:
+            return None
+        _quest_cache.move_to_end(key)
+        return cached[1]
+
 
+def _store_quests(key: tuple[str, date], response: list[dict]) -> None:
+    with _quest_cache_lock:
+        _quest_cache[key] = (time.monotonic(), response)
+        _quest_cache.move_to_end(key)
+        while len(_quest_cache) > QUEST_CACHE_MAX_ENTRIES:
+            _quest_cache.popitem(last=False)
 
-@router.get("/daily-quests", response_model=List[DailyQuestResponse])
-async def get_daily_quests(
+
+def _drop_cached_quests(key: tuple[str, date]) -> None:
+    with _quest_cache_lock:
+        _quest_cache.pop(key, None)
+
+
+@router.get("/daily-quests", response_model=None, responses={200: {"model": List[DailyQuestResponse]}})
+def get_daily_quests(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    now: datetime = Depends(request_now),
 ):
-    today = datetime.utcnow().date()
+    today = now.date()
+    cache_key = (str(current_user.id), today)
+    cached = _cached_quests(cache_key)
+    if cached is not None:
+        return cached
+
     quests = (
         db.query(DailyQuest)
         .filter(DailyQuest.user_id == current_user.id, DailyQuest.date == today)
@@ -360,45 +424,70 @@ async def get_daily_quests(
     if not quests:
         quests = _generate_quests(db, current_user, today)
 
-    return [
-        DailyQuestResponse(
-            id=str(q.id),
-            quest_type=q.quest_type,
-            title=q.title,
-            description=q.description,
-            target_value=q.target_value,
-            current_value=q.current_value,
-            xp_reward=q.xp_reward,
-            completed=q.completed,
-        )
+    response = [
+        {
+            "id": str(q.id),
+            "quest_type": q.quest_type,
+            "title": q.title,
+            "description": q.description,
+            "target_value": q.target_value,
+            "current_value": q.current_value,
+            "xp_reward": q.xp_reward,
+            "completed": q.completed,
+        }
         for q in quests
     ]
+    _store_quests(cache_key, response)
+    return response
 
 
 @router.post("/daily-quests/{quest_id}/progress")
-async def update_quest_progress(
+def update_quest_progress(
     quest_id: str,
     amount: float = 1.0,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    now: datetime = Depends(request_now),
 ):
-    quest = db.query(DailyQuest).filter(
-        DailyQuest.id == quest_id,
-        DailyQuest.user_id == current_user.id,
+    # One conditional UPDATE: only a not-yet-completed quest matches, so two
+    # concurrent ticks can't both complete it and double-award XP.
+    progressed = func.coalesce(DailyQuest.current_value, 0) + amount
+    reached = progressed >= DailyQuest.target_value
+    quest = db.execute(
+        update(DailyQuest)
+        .where(
+            DailyQuest.id == quest_id,
+            DailyQuest.user_id == current_user.id,
+            DailyQuest.completed.is_(False),
+        )
+        .values(
+            current_value=case((reached, DailyQuest.target_value), else_=progressed),
+            completed=reached,
+            completed_at=case((reached, now), else_=None),
+        )
+        .returning(
+            DailyQuest.date,
+            DailyQuest.title,
+            DailyQuest.current_value,
+            DailyQuest.target_value,
+            DailyQuest.completed,
+            DailyQuest.xp_reward,
+        )
+        .execution_options(synchronize_session=False)
     ).first()
-    if not quest:
-        return {"error": "Quest not found"}
-    if quest.completed:
+    if quest is None:
+        exists = db.query(DailyQuest.id).filter(
+            DailyQuest.id == quest_id,
+            DailyQuest.user_id == current_user.id,
+        ).first()
+        if not exists:
+            return {"error": "Quest not found"}
         return {"message": "Already completed", "xp_gained": 0}
 
-    quest.current_value = min(quest.target_value, (quest.current_value or 0) + amount)
     xp_gained = 0
-    if quest.current_value >= quest.target_value:
-        quest.completed = True
-        quest.completed_at = datetime.utcnow()
-        xp_result = award_xp(db, current_user, quest.xp_reward, f"quest:{quest.title}")
+    if quest.completed:
+        award_xp(db, current_user, quest.xp_reward, f"quest:{quest.title}", commit=False)
         xp_gained = quest.xp_reward
-    db.commit()
     record_notification_event(
         db,
         current_user.id,
@@ -413,6 +502,9 @@ async def update_quest_progress(
     )
     process_user_notifications(db, current_user.id)
     db.commit()
+    # Only after the commit: a GET between the drop and the commit would
+    # otherwise re-cache the pre-update rows for a full TTL.
+    _drop_cached_quests((str(current_user.id), quest.date))
 
     return {
         "quest_id": quest_id,
@@ -1,77 +1,46 @@
+from collections import defaultdict
+
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.db import get_db
 from app.auth import get_current_user
 from app.models.user import User
 from app.models.meal_plan import MealPlan
 from app.models.grocery import GroceryList
 from app.schemas.grocery import GroceryListResponse, GroceryListGenerate, GroceryItem
+from app.services.grocery_items import format_quantity, normalize_ingredients, parse_quantity
 from typing import List
 from app.services.notifications import process_user_notifications, record_notification_event
 
 router = APIRouter()
 
 
-def _infer_category(name: str) -> str:
-    n = (name or "").lower()
-
-    if any(k in n for k in ["chicken", "beef", "pork", "turkey", "salmon", "fish", "shrimp", "egg", "tofu", "lentil", "bean", "chickpea"]):
-        return "protein"
-    if any(k in n for k in ["milk", "yogurt", "cheese", "butter", "cream"]):
-        return "dairy"
-    if any(k in n for k in ["rice", "oat", "quinoa", "bread", "pasta", "flour"]):
-        return "grains"
-    if any(k in n for k in ["salt", "pepper", "paprika", "cumin", "oregano", "cinnamon", "garlic powder", "onion powder"]):
-        return "spices"
-    if any(k in n for k in ["oil", "vinegar", "sauce", "broth", "stock", "can", "canned"]):
-        return "pantry"
-    return "produce"
-
-
-def _normalize_ingredient(ingredient) -> dict:
-    if isinstance(ingredient, dict):
-        name = str(ingredient.get("name", "")).strip()
-        quantity = str(ingredient.get("quantity", "1")).strip() or "1"
-        unit = str(ingredient.get("unit", "")).strip()
-        category = str(ingredient.get("category", "")).strip() or _infer_category(name)
-        return {
-            "name": name,
-            "quantity": quantity,
-            "unit": unit,
-            "category": category,
-            "checked": False,
-        }
-
-    name = str(ingredient or "").strip()
-    return {
-        "name": name,
-        "quantity": "1",
-        "unit": "",
-        "category": _infer_category(name),
-        "checked": False,
-    }
-
-
 def extract_grocery_items(meal_plan: MealPlan) -> List[dict]:
-    ingredient_map: dict[str, dict] = {}
+    # Lines merge on (name, unit); quantities are summed numerically and an
+    # unparseable quantity ("a pinch", "1-2") is kept as written.
+    totals: defaultdict[tuple[str, str], float] = defaultdict(float)
+    unparsed: defaultdict[tuple[str, str], list[str]] = defaultdict(list)
+    occurrences: defaultdict[tuple[str, str], int] = defaultdict(int)
+    display: dict[tuple[str, str], dict] = {}
 
     for item in meal_plan.items:
-        recipe = item.recipe_data or {}
-        raw_ingredients = recipe.get("ingredients", []) or []
-        for raw_ingredient in raw_ingredients:
-            normalized = _normalize_ingredient(raw_ingredient)
+        normalized_ingredients = item.normalized_ingredients
+        if normalized_ingredients is None:
+            # Items written before normalization moved to write time.
+            normalized_ingredients = normalize_ingredients(item.recipe_data)
+        for normalized in normalized_ingredients:
             name_key = normalized["name"].lower().strip()
             if not name_key:
                 continue
-
-            if name_key in ingredient_map:
-                existing = ingredient_map[name_key]
-                if existing.get("quantity") in {"", "1"}:
-                    existing["quantity"] = str(int(existing.get("quantity", "1")) + 1)
-                else:
-                    existing["quantity"] = f"{existing['quantity']} + 1"
+            key = (name_key, normalized["unit"].lower())
+            quantity = parse_quantity(normalized["quantity"])
+            if quantity is None:
+                unparsed[key].append(normalized["quantity"])
             else:
-                ingredient_map[name_key] = {
+                totals[key] += quantity
+            occurrences[key] += 1
+            if key not in display:
+                display[key] = {
                     "name": normalized["name"].title(),
                     "quantity": normalized["quantity"],
                     "unit": normalized["unit"],
@@ -79,7 +48,12 @@ def extract_grocery_items(meal_plan: MealPlan) -> List[dict]:
                     "checked": False,
                 }
 
-    return list(ingredient_map.values())
+    # A single occurrence keeps its original wording ("1 1/2", "a pinch").
+    for key, entry in display.items():
+        if occurrences[key] > 1:
+            parts = [format_quantity(totals[key])] if key in totals else []
+            entry["quantity"] = " + ".join(parts + unparsed[key])
+    return list(display.values())
 
 
 @router.post("/generate", response_model=GroceryListResponse)
@@ -88,7 +62,7 @@ async def generate_grocery_list(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    meal_plan = db.query(MealPlan).filter(
+    meal_plan = db.query(MealPlan).options(selectinload(MealPlan.items)).filter(
         MealPlan.id == request.meal_plan_id,
         MealPlan.user_id == current_user.id,
     ).first()
@@ -1,7 +1,8 @@
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, selectinload
 from datetime import date, timedelta
 from typing import List
 from app.db import get_db
@@ -26,6 +27,7 @@ from app.agents.meal_planner_fallback import (
     get_replacement_candidates,
     get_shortlist_candidates,
 )
+from app.services.grocery_items import normalize_ingredients
 from app.services.metabolic_engine import compute_meal_mes, load_budget_for_user
 from app.services.notifications import process_user_notifications, record_notification_event
 
@@ -220,21 +222,24 @@ async def generate_meal_plan(
     db.add(meal_plan)
     db.flush()
 
+    item_rows = []
     for day_data in result.get("days", []):
         for meal_data in day_data.get("meals", []):
             recipe_data = meal_data.get("recipe", {})
-
-            item = MealPlanItem(
-                meal_plan_id=meal_plan.id,
-                day_of_week=day_data["day"],
-                meal_type=meal_data["meal_type"],
-                meal_category=meal_data.get("category", "quick"),
-                is_bulk_cook=meal_data.get("is_bulk_cook", False),
-                servings=meal_data.get("servings", preferences.household_size),
-                recipe_id=recipe_data.get("id"),
-                recipe_data=recipe_data,
-            )
-            db.add(item)
+            item_rows.append({
+                "meal_plan_id": meal_plan.id,
+                "day_of_week": day_data["day"],
+                "meal_type": meal_data["meal_type"],
+                "meal_category": meal_data.get("category", "quick"),
+                "is_bulk_cook": meal_data.get("is_bulk_cook", False),
+                "servings": meal_data.get("servings", preferences.household_size),
+                "recipe_id": recipe_data.get("id"),
+                "recipe_data": recipe_data,
+                "normalized_ingredients": normalize_ingredients(recipe_data),
+            })
+    if item_rows:
+        # A week of meals goes out as one multi-row INSERT.
+        db.execute(insert(MealPlanItem), item_rows)
 
     db.commit()
     db.refresh(meal_plan)
@@ -357,6 +362,7 @@ async def replace_meal_plan_item(
         "repeat_index": 0,
         "prep_status": None,
     }
+    item.normalized_ingredients = normalize_ingredients(item.recipe_data)
     db.commit()
     db.refresh(item.meal_plan)
     budget = load_budget_for_user(db, current_user.id)
@@ -368,7 +374,7 @@ async def get_current_plan(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    plan = db.query(MealPlan).filter(
+    plan = db.query(MealPlan).options(selectinload(MealPlan.items)).filter(
         MealPlan.user_id == current_user.id
     ).order_by(MealPlan.created_at.desc()).first()
 
@@ -384,7 +390,7 @@ async def get_plan_history(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    plans = db.query(MealPlan).filter(
+    plans = db.query(MealPlan).options(selectinload(MealPlan.items)).filter(
         MealPlan.user_id == current_user.id
     ).order_by(MealPlan.created_at.desc()).limit(10).all()
     budget = load_budget_for_user(db, current_user.id)
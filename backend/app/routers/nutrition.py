@@ -1,11 +1,20 @@
+import hashlib
+import heapq
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, date
-from fastapi import APIRouter, Depends, HTTPException, Query
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Any
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import bindparam, delete, exists, func, select, update
+from sqlalchemy.dialects.postgresql import JSONB, array
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
-from app.db import get_db
+from app.db import SessionLocal, dialect_insert, get_db
 from app.auth import get_current_user
 from app.models.user import User
 from app.models.recipe import Recipe
@@ -64,20 +73,122 @@ ESSENTIAL_MICROS_DEFAULTS = {
 }
 
 
+# Recipe health_benefits tags that address each nutrient gap.
+GAP_RECIPE_HINTS = {
+    "protein": ["high-protein", "muscle_recovery"],
+    "fiber": ["gut_health"],
+    "vitamin_c_mg": ["immune_support"],
+    "iron_mg": ["energy_boost"],
+    "magnesium_mg": ["muscle_recovery"],
+    "potassium_mg": ["heart_health"],
+    "omega3_g": ["brain_health", "heart_health"],
+    "calcium_mg": ["bone_health"],
+    "vitamin_d_mcg": ["immune_support", "bone_health"],
+    "vitamin_b12_mcg": ["energy_boost", "brain_health"],
+}
+
+# Staple foods suggested for each nutrient gap, in preference order.
+GAP_FOODS = {
+    "protein": ["Greek Yogurt", "Chicken Breast", "Lentils"],
+    "fiber": ["Chia Seeds", "Black Beans", "Raspberries"],
+    "vitamin_c_mg": ["Red Bell Pepper", "Kiwi", "Orange"],
+    "iron_mg": ["Spinach", "Lentils", "Pumpkin Seeds"],
+    "magnesium_mg": ["Pumpkin Seeds", "Almonds", "Avocado"],
+    "potassium_mg": ["Banana", "Potato", "Coconut Water"],
+    "omega3_g": ["Salmon", "Sardines", "Chia Seeds"],
+    "calcium_mg": ["Sardines", "Yogurt", "Kale"],
+    "vitamin_d_mcg": ["Salmon", "Egg Yolk", "Mushrooms UV-exposed"],
+    "vitamin_b12_mcg": ["Salmon", "Eggs", "Greek Yogurt"],
+}
+
+# Per-serving nutrition used to seed missing staples into the local food DB.
+COACH_FOOD_PROFILES = {
+    "Greek Yogurt": {"protein": 17, "calories": 100, "calcium_mg": 180},
+    "Chicken Breast": {"protein": 31, "calories": 165},
+    "Lentils": {"protein": 9, "fiber": 8, "iron_mg": 3.3},
+    "Chia Seeds": {"fiber": 10, "omega3_g": 5, "protein": 5},
+    "Black Beans": {"fiber": 8, "protein": 8, "iron_mg": 2.1},
+    "Raspberries": {"fiber": 8, "vitamin_c_mg": 26, "calories": 64},
+    "Red Bell Pepper": {"vitamin_c_mg": 95, "fiber": 2},
+    "Kiwi": {"vitamin_c_mg": 64, "fiber": 3},
+    "Orange": {"vitamin_c_mg": 70, "fiber": 3},
+    "Spinach": {"iron_mg": 2.7, "magnesium_mg": 79},
+    "Pumpkin Seeds": {"magnesium_mg": 150, "iron_mg": 2.5, "protein": 8},
+    "Almonds": {"magnesium_mg": 80, "fiber": 3.5},
+    "Avocado": {"potassium_mg": 485, "fiber": 7},
+    "Banana": {"potassium_mg": 422, "vitamin_b6_mg": 0.4},
+    "Potato": {"potassium_mg": 620, "vitamin_c_mg": 19},
+    "Coconut Water": {"potassium_mg": 470, "calories": 45},
+    "Salmon": {"omega3_g": 2.2, "protein": 22, "vitamin_d_mcg": 11},
+    "Sardines": {"omega3_g": 1.5, "calcium_mg": 325, "vitamin_b12_mcg": 8.9},
+    "Yogurt": {"calcium_mg": 200, "protein": 10},
+    "Kale": {"calcium_mg": 150, "vitamin_c_mg": 80},
+    "Egg Yolk": {"vitamin_d_mcg": 1.1, "vitamin_b12_mcg": 0.3},
+    "Mushrooms UV-exposed": {"vitamin_d_mcg": 10, "fiber": 1},
+    "Eggs": {"protein": 6, "vitamin_b12_mcg": 0.5},
+}
+
+# Hot per-request reads, built once so each call only binds parameters.
+_TARGETS_BY_USER = select(NutritionTarget).where(NutritionTarget.user_id == bindparam("user_id"))
+_LOGS_BY_DAY = (
+    select(FoodLog)
+    .where(FoodLog.user_id == bindparam("user_id"), FoodLog.date == bindparam("day"))
+    .order_by(FoodLog.created_at.asc())
+)
+# The day's stored summary columns plus the newest change to its logs, to
+# tell whether the summary still reflects them.
+_SUMMARY_WITH_LAST_LOG_CHANGE = select(
+    DailyNutritionSummary.totals_json,
+    DailyNutritionSummary.comparison_json,
+    DailyNutritionSummary.daily_score,
+    DailyNutritionSummary.updated_at,
+    select(func.max(FoodLog.updated_at))
+    .where(FoodLog.user_id == bindparam("user_id"), FoodLog.date == bindparam("day"))
+    .scalar_subquery(),
+).where(DailyNutritionSummary.user_id == bindparam("user_id"), DailyNutritionSummary.date == bindparam("day"))
+# Timestamps that change whenever the day's gaps could: any log edit, and
+# every summary recompute (which also covers deletes).
+_DAY_VERSION = select(
+    select(func.max(FoodLog.updated_at))
+    .where(FoodLog.user_id == bindparam("user_id"), FoodLog.date == bindparam("day"))
+    .scalar_subquery(),
+    select(DailyNutritionSummary.updated_at)
+    .where(DailyNutritionSummary.user_id == bindparam("user_id"), DailyNutritionSummary.date == bindparam("day"))
+    .scalar_subquery(),
+)
+_USER_LOG = select(FoodLog).where(FoodLog.id == bindparam("log_id"), FoodLog.user_id == bindparam("user_id"))
+
+
 def _clear_scan_log_references(db: Session, log_ids: list[str]) -> None:
     if not log_ids:
         return
-    scans = (
-        db.query(ScannedMealLog)
-        .filter(ScannedMealLog.logged_food_log_id.in_(log_ids))
-        .all()
+    db.execute(
+        update(ScannedMealLog)
+        .where(ScannedMealLog.logged_food_log_id.in_(log_ids))
+        .values(logged_food_log_id=None, logged_to_chronometer=False)
     )
-    for scan in scans:
-        scan.logged_food_log_id = None
-        scan.logged_to_chronometer = False
 
 MACRO_KEYS = ["calories", "protein", "carbs", "fat", "fiber"]
 
+# Snapshot keys summed into each macro total; the first non-zero one wins.
+MACRO_SNAPSHOT_KEYS = {
+    "calories": ("calories",),
+    "protein": ("protein", "protein_g"),
+    "carbs": ("carbs", "carbs_g"),
+    "fat": ("fat", "fat_g"),
+    "fiber": ("fiber", "fiber_g"),
+}
+# NutritionTarget column holding the goal for each macro.
+MACRO_TARGET_FIELDS = {
+    "calories": "calories_target",
+    "protein": "protein_g_target",
+    "carbs": "carbs_g_target",
+    "fat": "fat_g_target",
+    "fiber": "fiber_g_target",
+}
+# Macros that count toward the daily score; calories are reported but not scored.
+SCORED_MACRO_KEYS = ("protein", "carbs", "fat", "fiber")
+
 
 def _default_targets() -> NutritionTarget:
     return NutritionTarget(
@@ -130,7 +241,7 @@ def _sync_targets_from_profile_if_needed(
 
 
 def _get_or_create_targets(db: Session, user_id: str) -> NutritionTarget:
-    target = db.query(NutritionTarget).filter(NutritionTarget.user_id == user_id).first()
+    target = db.scalars(_TARGETS_BY_USER, {"user_id": user_id}).first()
     if target:
         target = _sync_targets_from_profile_if_needed(db, user_id, target)
         if not target.micronutrient_targets:
@@ -155,18 +266,28 @@ def _get_or_create_targets(db: Session, user_id: str) -> NutritionTarget:
 def _parse_date(value: str | None) -> date:
     if not value:
         return datetime.utcnow().date()
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        pass
+    # Some clients still send a full ISO timestamp.
     try:
         return datetime.fromisoformat(value).date()
-    except Exception:
+    except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
 
 
 def _scaled_nutrition(nutrition: dict, factor: float) -> dict:
+    nutrition = nutrition or {}
+    # Payloads are almost always all-numeric; scale those in one comprehension
+    # and only fall back to per-value parsing when something else shows up.
+    if all(isinstance(v, (int, float)) for v in nutrition.values()):
+        return {k: float(v) * factor for k, v in nutrition.items()}
     out = {}
-    for k, v in (nutrition or {}).items():
+    for k, v in nutrition.items():
         try:
             out[k] = float(v) * factor
-        except Exception:
+        except (TypeError, ValueError):
             continue
     return out
 
@@ -182,7 +303,7 @@ def _resolve_source_nutrition(db: Session, payload: FoodLogCreate) -> tuple[str,
     if source_type in {"recipe", "cook_mode"}:
         if not payload.source_id:
             raise HTTPException(status_code=400, detail="source_id is required for recipe/cook_mode")
-        recipe = db.query(Recipe).filter(Recipe.id == payload.source_id).first()
+        recipe = db.get(Recipe, payload.source_id)
         if not recipe:
             raise HTTPException(status_code=404, detail="Recipe not found")
         return recipe.title, recipe.nutrition_info or {}
@@ -196,7 +317,7 @@ def _resolve_source_nutrition(db: Session, payload: FoodLogCreate) -> tuple[str,
         title = (item.recipe_data or {}).get("title") or "Meal Plan Item"
         nutrition = (item.recipe_data or {}).get("nutrition_info") or {}
         if not nutrition and item.recipe_id:
-            recipe = db.query(Recipe).filter(Recipe.id == item.recipe_id).first()
+            recipe = db.get(Recipe, item.recipe_id)
             nutrition = recipe.nutrition_info if recipe else {}
         return title, nutrition or {}
 
@@ -224,156 +345,260 @@ def _resolve_source_nutrition(db: Session, payload: FoodLogCreate) -> tuple[str,
     raise HTTPException(status_code=400, detail="Unsupported source_type")
 
 
-def _serialize_log(log: FoodLog) -> FoodLogResponse:
-    return FoodLogResponse(
-        id=str(log.id),
-        date=log.date.isoformat(),
-        meal_type=log.meal_type,
-        source_type=log.source_type,
-        source_id=log.source_id,
-        group_id=log.group_id,
-        group_mes_score=log.group_mes_score,
-        group_mes_tier=log.group_mes_tier,
-        title=log.title,
-        servings=float(log.servings or 1),
-        quantity=float(log.quantity or 1),
-        nutrition_snapshot=log.nutrition_snapshot or {},
+def _serialize_log(log: FoodLog) -> dict:
+    """FoodLogResponse-shaped dict; list endpoints return these without model validation."""
+    return {
+        "id": str(log.id),
+        "date": log.date.isoformat(),
+        "meal_type": log.meal_type,
+        "source_type": log.source_type,
+        "source_id": log.source_id,
+        "group_id": log.group_id,
+        "group_mes_score": log.group_mes_score,
+        "group_mes_tier": log.group_mes_tier,
+        "title": log.title,
+        "servings": float(log.servings or 1),
+        "quantity": float(log.quantity or 1),
+        "nutrition_snapshot": log.nutrition_snapshot or {},
+    }
+
+
+def _snapshot_sum(keys: tuple[str, ...]):
+    snap = FoodLog.nutrition_snapshot
+    values = [func.nullif(snap[key].as_float(), 0) for key in keys]
+    return func.coalesce(func.sum(func.coalesce(*values, 0.0)), 0.0)
+
+
+@lru_cache(maxsize=64)
+def _daily_totals_stmt(micro_keys: tuple[str, ...]):
+    """SELECT summing every macro and the given micros over one user's day of logs."""
+    macros = [_snapshot_sum(MACRO_SNAPSHOT_KEYS[k]) for k in MACRO_KEYS]
+    micros = [_snapshot_sum((micro,)) for micro in micro_keys]
+    return select(*macros, *micros).where(
+        FoodLog.user_id == bindparam("user_id"), FoodLog.date == bindparam("day")
     )
 
 
-def _compute_daily(db: Session, user_id: str, day: date):
-    targets = _get_or_create_targets(db, user_id)
-    logs = db.query(FoodLog).filter(FoodLog.user_id == user_id, FoodLog.date == day).all()
-
-    totals = {k: 0.0 for k in MACRO_KEYS}
-    micros = {k: 0.0 for k in (targets.micronutrient_targets or {}).keys()}
-
-    for log in logs:
-        snap = log.nutrition_snapshot or {}
-        totals["calories"] += float(snap.get("calories", 0) or 0)
-        totals["protein"] += float(snap.get("protein", 0) or snap.get("protein_g", 0) or 0)
-        totals["carbs"] += float(snap.get("carbs", 0) or snap.get("carbs_g", 0) or 0)
-        totals["fat"] += float(snap.get("fat", 0) or snap.get("fat_g", 0) or 0)
-        totals["fiber"] += float(snap.get("fiber", 0) or snap.get("fiber_g", 0) or 0)
-
-        for micro in micros.keys():
-            micros[micro] += float(snap.get(micro, 0) or 0)
-
-    comparison = {
-        "calories": {
-            "consumed": totals["calories"],
-            "target": float(targets.calories_target or 0),
-            "pct": (totals["calories"] / float(targets.calories_target or 1)) * 100,
-        },
-        "protein": {
-            "consumed": totals["protein"],
-            "target": float(targets.protein_g_target or 0),
-            "pct": (totals["protein"] / float(targets.protein_g_target or 1)) * 100,
-        },
-        "carbs": {
-            "consumed": totals["carbs"],
-            "target": float(targets.carbs_g_target or 0),
-            "pct": (totals["carbs"] / float(targets.carbs_g_target or 1)) * 100,
-        },
-        "fat": {
-            "consumed": totals["fat"],
-            "target": float(targets.fat_g_target or 0),
-            "pct": (totals["fat"] / float(targets.fat_g_target or 1)) * 100,
-        },
-        "fiber": {
-            "consumed": totals["fiber"],
-            "target": float(targets.fiber_g_target or 0),
-            "pct": (totals["fiber"] / float(targets.fiber_g_target or 1)) * 100,
-        },
+def _sum_daily_totals(db: Session, user_id: str, day: date, micro_keys: tuple[str, ...]) -> tuple[dict, dict]:
+    row = db.execute(_daily_totals_stmt(micro_keys), {"user_id": user_id, "day": day}).one()
+    values = [float(v or 0) for v in row]
+    totals = dict(zip(MACRO_KEYS, values))
+    micros = dict(zip(micro_keys, values[len(MACRO_KEYS):]))
+    return totals, micros
+
+
+def _list_day_logs(db: Session, user_id: str, day: date) -> list[FoodLog]:
+    return db.scalars(_LOGS_BY_DAY, {"user_id": user_id, "day": day}).all()
+
+
+def _compute_daily(db: Session, user_id: str, day: date, targets: NutritionTarget | None = None):
+    if targets is None:
+        targets = _get_or_create_targets(db, user_id)
+    micro_targets = targets.micronutrient_targets or {}
+    micro_keys = tuple(micro_targets)
+    totals, micros = _sum_daily_totals(db, user_id, day, micro_keys)
+
+    # Entries are plain dicts because that is what comparison_json stores and
+    # the API returns; scores accumulate while they are built.
+    comparison: dict[str, dict] = {}
+    macro_pct_total = 0.0
+    for key in MACRO_KEYS:
+        consumed = totals[key]
+        goal = float(getattr(targets, MACRO_TARGET_FIELDS[key]) or 0)
+        pct = (consumed / (goal or 1.0)) * 100
+        comparison[key] = {"consumed": consumed, "target": goal, "pct": pct}
+        if key in SCORED_MACRO_KEYS:
+            macro_pct_total += min(100.0, pct)
+
+    micro_pct_total = 0.0
+    micro_count = 0
+    for micro, target in micro_targets.items():
+        if micro in comparison:
+            # A micro target named like a macro never overrides the macro goal.
+            continue
+        consumed = micros.get(micro, 0.0)
+        goal = float(target or 1)
+        pct = (consumed / goal) * 100
+        comparison[micro] = {"consumed": consumed, "target": goal, "pct": pct}
+        micro_pct_total += min(100.0, pct)
+        micro_count += 1
+
+    macro_score = macro_pct_total / len(SCORED_MACRO_KEYS)
+    micro_score = micro_pct_total / micro_count if micro_count else 0
+    daily_score = round((macro_score * 0.6) + (micro_score * 0.4), 1)
+
+    # One upsert on (user_id, date): no read first, and concurrent writers for
+    # the same day cannot both insert. updated_at is always bumped because
+    # _read_daily relies on it to know the summary is current.
+    written = {
+        "totals_json": {**totals, **micros},
+        "comparison_json": comparison,
+        "daily_score": daily_score,
+        "updated_at": datetime.utcnow(),
     }
+    db.execute(
+        dialect_insert(db, DailyNutritionSummary)
+        .values(user_id=user_id, date=day, **written)
+        .on_conflict_do_update(index_elements=["user_id", "date"], set_=written)
+    )
+    db.commit()
 
-    for micro, target in (targets.micronutrient_targets or {}).items():
-        consumed = float(micros.get(micro, 0) or 0)
-        comparison[micro] = {
-            "consumed": consumed,
-            "target": float(target or 1),
-            "pct": (consumed / float(target or 1)) * 100,
-        }
-
-    macro_pcts = [
-        min(100.0, comparison["protein"]["pct"]),
-        min(100.0, comparison["carbs"]["pct"]),
-        min(100.0, comparison["fat"]["pct"]),
-        min(100.0, comparison["fiber"]["pct"]),
-    ]
-    micro_values = [min(100.0, v["pct"]) for k, v in comparison.items() if k not in {"calories", "protein", "carbs", "fat", "fiber"}]
-    micro_score = sum(micro_values) / len(micro_values) if micro_values else 0
-    macro_score = sum(macro_pcts) / len(macro_pcts)
-    daily_score = round((macro_score * 0.6) + (micro_score * 0.4), 1)
+    return totals, comparison, daily_score
 
-    summary = (
-        db.query(DailyNutritionSummary)
-        .filter(DailyNutritionSummary.user_id == user_id, DailyNutritionSummary.date == day)
-        .first()
+
+def _recipes_with_any_benefit(db: Session, tags: list[str], limit: int = 180) -> list:
+    """(id, title, health_benefits) rows for recipes tagged with any of `tags`."""
+    if db.get_bind().dialect.name == "postgresql":
+        # Served by the GIN index on health_benefits::jsonb.
+        match = Recipe.health_benefits.cast(JSONB).op("?|")(array(tags))
+    else:
+        benefit = func.json_each(Recipe.health_benefits).table_valued("value").alias("benefit")
+        match = exists(select(1).select_from(benefit).where(benefit.c.value.in_(tags)))
+    return (
+        db.query(Recipe.id, Recipe.title, Recipe.health_benefits)
+        .filter(match)
+        .limit(limit)
+        .all()
     )
-    if not summary:
-        summary = DailyNutritionSummary(user_id=user_id, date=day)
-        db.add(summary)
 
-    summary.totals_json = {**totals, **micros}
-    summary.comparison_json = comparison
-    summary.daily_score = daily_score
-    db.commit()
 
-    return totals, comparison, daily_score, logs
+def _coach_food_row(name: str, gap_key: str, profile: dict) -> dict:
+    serving_nutrition = canonicalize_nutrition(profile)
+    return {
+        "name": name,
+        "brand": None,
+        "category": "Coach Staples",
+        "source_kind": "coach_staple",
+        "aliases": [],
+        "default_serving_label": "1 serving",
+        "default_serving_grams": 100,
+        "serving_options": [],
+        "nutrition_per_100g": profile,
+        "nutrition_per_serving": serving_nutrition,
+        "mes_ready_nutrition": serving_nutrition,
+        "micronutrients": {},
+        "serving": "1 serving",
+        "nutrition_info": serving_nutrition,
+        "tags": ["coach", gap_key],
+        "is_active": True,
+    }
 
 
-@router.get("/targets", response_model=NutritionTargetsResponse)
-async def get_targets(
+def _ensure_coach_foods(db: Session, wanted: dict[str, str]) -> dict:
+    """Look up (and seed, if missing) the staple foods named in `wanted` (name -> gap key)."""
+    if not wanted:
+        return {}
+    columns = (LocalFood.id, LocalFood.name, LocalFood.category, LocalFood.nutrition_per_serving, LocalFood.nutrition_info)
+    found = {row.name: row for row in db.execute(select(*columns).where(LocalFood.name.in_(wanted)))}
+    missing = [name for name in wanted if name not in found]
+    if missing:
+        db.execute(
+            dialect_insert(db, LocalFood).on_conflict_do_nothing(index_elements=["name"]),
+            [_coach_food_row(name, wanted[name], COACH_FOOD_PROFILES.get(name, {})) for name in missing],
+        )
+        db.commit()
+        found.update((row.name, row) for row in db.execute(select(*columns).where(LocalFood.name.in_(missing))))
+    return found
+
+
+def _read_daily(db: Session, user_id: str, day: date, targets: NutritionTarget):
+    """Same result as _compute_daily, served from the stored summary when no log
+    or target changed since it was written."""
+    row = db.execute(_SUMMARY_WITH_LAST_LOG_CHANGE, {"user_id": user_id, "day": day}).first()
+    if row is not None:
+        stored_totals, comparison, score, written_at, last_log_change = row
+        changes = [ts for ts in (last_log_change, targets.updated_at) if ts is not None]
+        if written_at is not None and comparison and all(written_at >= ts for ts in changes):
+            stored_totals = stored_totals or {}
+            totals = {k: float(stored_totals.get(k, 0) or 0) for k in MACRO_KEYS}
+            return totals, comparison, float(score or 0)
+    return _compute_daily(db, user_id, day, targets)
+
+
+def get_request_targets(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+) -> NutritionTarget:
+    # Loaded at most once per request and shared with _compute_daily.
+    cached = getattr(request.state, "nutrition_targets", None)
+    if cached is not None:
+        return cached
+    targets = _get_or_create_targets(db, current_user.id)
+    request.state.nutrition_targets = targets
+    return targets
+
+
+@router.get("/targets", response_model=NutritionTargetsResponse)
+async def get_targets(
+    targets: NutritionTarget = Depends(get_request_targets),
 ):
-    t = _get_or_create_targets(db, current_user.id)
     return NutritionTargetsResponse(
-        calories_target=float(t.calories_target or 0),
-        protein_g_target=float(t.protein_g_target or 0),
-        carbs_g_target=float(t.carbs_g_target or 0),
-        fat_g_target=float(t.fat_g_target or 0),
-        fiber_g_target=float(t.fiber_g_target or 0),
-        micronutrient_targets=t.micronutrient_targets or ESSENTIAL_MICROS_DEFAULTS,
+        calories_target=float(targets.calories_target or 0),
+        protein_g_target=float(targets.protein_g_target or 0),
+        carbs_g_target=float(targets.carbs_g_target or 0),
+        fat_g_target=float(targets.fat_g_target or 0),
+        fiber_g_target=float(targets.fiber_g_target or 0),
+        micronutrient_targets=targets.micronutrient_targets or ESSENTIAL_MICROS_DEFAULTS,
     )
 
 
 @router.put("/targets", response_model=NutritionTargetsResponse)
 async def update_targets(
     payload: NutritionTargetsUpdate,
-    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    targets: NutritionTarget = Depends(get_request_targets),
 ):
-    t = _get_or_create_targets(db, current_user.id)
-
-    for field in ["calories_target", "protein_g_target", "carbs_g_target", "fat_g_target", "fiber_g_target"]:
+    for field in MACRO_TARGET_FIELDS.values():
         val = getattr(payload, field)
         if val is not None:
-            setattr(t, field, val)
+            setattr(targets, field, val)
 
     if payload.micronutrient_targets is not None:
         merged = {**ESSENTIAL_MICROS_DEFAULTS, **payload.micronutrient_targets}
-        t.micronutrient_targets = merged
+        targets.micronutrient_targets = merged
 
     db.commit()
-    db.refresh(t)
+    db.refresh(targets)
 
     return NutritionTargetsResponse(
-        calories_target=float(t.calories_target or 0),
-        protein_g_target=float(t.protein_g_target or 0),
-        carbs_g_target=float(t.carbs_g_target or 0),
-        fat_g_target=float(t.fat_g_target or 0),
-        fiber_g_target=float(t.fiber_g_target or 0),
-        micronutrient_targets=t.micronutrient_targets or ESSENTIAL_MICROS_DEFAULTS,
+        calories_target=float(targets.calories_target or 0),
+        protein_g_target=float(targets.protein_g_target or 0),
+        carbs_g_target=float(targets.carbs_g_target or 0),
+        fat_g_target=float(targets.fat_g_target or 0),
+        fiber_g_target=float(targets.fiber_g_target or 0),
+        micronutrient_targets=targets.micronutrient_targets or ESSENTIAL_MICROS_DEFAULTS,
     )
 
 
+def _run_post_log_hooks(user_id: str, daily_score: float, day: date) -> None:
+    """Gamification follow-up for a new food log, run after the response is sent."""
+    db = SessionLocal()
+    try:
+        user = db.get(User, user_id)
+        if user is None:
+            return
+        # +50 XP for logging a meal
+        award_xp(db, user, 50, "meal_log", commit=False)
+        # Update nutrition streak based on new daily score
+        update_nutrition_streak(db, user, daily_score, day)
+        # Check achievements (food_log_count, nutrition_streak, tier achievements, etc.)
+        check_achievements(db, user)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("food_log.post_hooks_failed user=%s", user_id)
+    finally:
+        db.close()
+
+
 @router.post("/logs", response_model=FoodLogResponse)
 async def create_log(
     payload: FoodLogCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    targets: NutritionTarget = Depends(get_request_targets),
 ):
     day = _parse_date(payload.date)
     title, base_nutrition = _resolve_source_nutrition(db, payload)
@@ -396,18 +621,15 @@ async def create_log(
         nutrition_snapshot=nutrition_snapshot,
     )
     db.add(log)
-    db.commit()
-    db.refresh(log)
+    # Flush assigns the client-side id and defaults; serialize now, before the
+    # commit inside _compute_daily expires the instance.
+    db.flush()
+    result = _serialize_log(log)
 
-    _, _, daily_score, _ = _compute_daily(db, current_user.id, day)
+    _, _, daily_score = _compute_daily(db, current_user.id, day, targets)
 
-    # ── Gamification hooks ──
-    # +50 XP for logging a meal
-    award_xp(db, current_user, 50, "meal_log")
-    # Update nutrition streak based on new daily score
-    update_nutrition_streak(db, current_user, daily_score, day)
-    # Check achievements (food_log_count, nutrition_streak, tier achievements, etc.)
-    check_achievements(db, current_user)
+    # ── Gamification hooks ── (nothing in the response depends on them)
+    background_tasks.add_task(_run_post_log_hooks, current_user.id, daily_score, day)
 
     # ── Metabolic Energy Score hook ──
     try:
@@ -419,7 +641,7 @@ async def create_log(
         db,
         current_user.id,
         "food_logged_today",
-        properties={"log_id": str(log.id), "meal_type": log.meal_type, "date": day.isoformat()},
+        properties={"log_id": result["id"], "meal_type": result["meal_type"], "date": day.isoformat()},
         source="server",
     )
     record_notification_event(
@@ -432,22 +654,19 @@ async def create_log(
     process_user_notifications(db, current_user.id)
     db.commit()
 
-    return _serialize_log(log)
+    return result
 
 
-@router.get("/logs", response_model=list[FoodLogResponse])
+# Hot read endpoints return plain dicts straight to the JSON encoder, skipping
+# response-model validation; `responses=` keeps their schema in the OpenAPI docs.
+@router.get("/logs", response_model=None, responses={200: {"model": list[FoodLogResponse]}})
 async def list_logs(
     date_str: str | None = Query(default=None, alias="date"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     day = _parse_date(date_str)
-    logs = (
-        db.query(FoodLog)
-        .filter(FoodLog.user_id == current_user.id, FoodLog.date == day)
-        .order_by(FoodLog.created_at.asc())
-        .all()
-    )
+    logs = _list_day_logs(db, current_user.id, day)
     return [_serialize_log(x) for x in logs]
 
 
@@ -457,8 +676,9 @@ async def update_log(
     payload: FoodLogUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    targets: NutritionTarget = Depends(get_request_targets),
 ):
-    log = db.query(FoodLog).filter(FoodLog.id == log_id, FoodLog.user_id == current_user.id).first()
+    log = db.scalars(_USER_LOG, {"log_id": log_id, "user_id": current_user.id}).first()
     if not log:
         raise HTTPException(status_code=404, detail="Log not found")
 
@@ -479,12 +699,12 @@ async def update_log(
         factor = max(0.1, float(log.servings or 1.0)) * max(0.1, float(log.quantity or 1.0))
         log.nutrition_snapshot = canonicalize_nutrition(_scaled_nutrition(payload.nutrition, factor))
 
-    db.commit()
-    db.refresh(log)
+    db.flush()
+    result = _serialize_log(log)
 
-    _compute_daily(db, current_user.id, log.date)
+    _compute_daily(db, current_user.id, log.date, targets)
 
-    return _serialize_log(log)
+    return result
 
 
 @router.delete("/logs/group/{group_id}")
@@ -492,30 +712,29 @@ async def delete_group_logs(
     group_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    targets: NutritionTarget = Depends(get_request_targets),
 ):
     """Delete all food logs that share the given group_id."""
-    group_logs = (
-        db.query(FoodLog)
-        .filter(FoodLog.user_id == current_user.id, FoodLog.group_id == group_id)
-        .all()
-    )
+    # Only ids and the day are needed; the rows go in set-based DELETEs.
+    group_logs = db.execute(
+        select(FoodLog.id, FoodLog.date).where(FoodLog.user_id == current_user.id, FoodLog.group_id == group_id)
+    ).all()
     if not group_logs:
         raise HTTPException(status_code=404, detail="No logs found for this group")
 
     day = group_logs[0].date
     group_log_ids = [str(log.id) for log in group_logs]
     _clear_scan_log_references(db, group_log_ids)
-
-    for log in group_logs:
-        db.query(MetabolicScore).filter(
+    db.execute(
+        delete(MetabolicScore).where(
             MetabolicScore.user_id == current_user.id,
-            MetabolicScore.food_log_id == log.id,
-        ).delete(synchronize_session=False)
-        db.delete(log)
-
+            MetabolicScore.food_log_id.in_(group_log_ids),
+        )
+    )
+    db.execute(delete(FoodLog).where(FoodLog.id.in_(group_log_ids)))
     db.commit()
 
-    _compute_daily(db, current_user.id, day)
+    _compute_daily(db, current_user.id, day, targets)
 
     try:
         budget = load_budget_for_user(db, current_user.id)
@@ -532,8 +751,9 @@ async def delete_log(
     log_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    targets: NutritionTarget = Depends(get_request_targets),
 ):
-    log = db.query(FoodLog).filter(FoodLog.id == log_id, FoodLog.user_id == current_user.id).first()
+    log = db.scalars(_USER_LOG, {"log_id": log_id, "user_id": current_user.id}).first()
     if not log:
         raise HTTPException(status_code=404, detail="Log not found")
 
@@ -550,7 +770,7 @@ async def delete_log(
     db.delete(log)
     db.commit()
 
-    _compute_daily(db, current_user.id, day)
+    _compute_daily(db, current_user.id, day, targets)
 
     # Keep metabolic daily score + streak in sync after deletion.
     try:
@@ -563,32 +783,72 @@ async def delete_log(
     return {"ok": True}
 
 
-@router.get("/daily", response_model=DailyNutritionResponse)
+@router.get("/daily", response_model=None, responses={200: {"model": DailyNutritionResponse}})
 async def get_daily(
     date_str: str | None = Query(default=None, alias="date"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    targets: NutritionTarget = Depends(get_request_targets),
 ):
     day = _parse_date(date_str)
-    totals, comparison, score, logs = _compute_daily(db, current_user.id, day)
-
-    return DailyNutritionResponse(
-        date=day.isoformat(),
-        totals=totals,
-        comparison=comparison,
-        daily_score=score,
-        logs=[_serialize_log(x) for x in logs],
-    )
+    totals, comparison, score = _read_daily(db, current_user.id, day, targets)
+    logs = _list_day_logs(db, current_user.id, day)
+
+    return {
+        "date": day.isoformat(),
+        "totals": totals,
+        "comparison": comparison,
+        "daily_score": score,
+        "logs": [_serialize_log(x) for x in logs],
+    }
+
+
+GAPS_CACHE_TTL_SECONDS = 60
+GAPS_CACHE_MAX_ENTRIES = 2048
+# (user_id, day) -> (stored_at, etag, response body)
+_gaps_cache: OrderedDict[tuple[str, date], tuple[float, str, dict]] = OrderedDict()
+
+
+def _gaps_etag(db: Session, user_id: str, day: date, targets: NutritionTarget) -> str:
+    last_log_change, summary_written = db.execute(_DAY_VERSION, {"user_id": user_id, "day": day}).one()
+    version = f"{user_id}:{day.isoformat()}:{last_log_change}:{summary_written}:{targets.updated_at}"
+    return '"%s"' % hashlib.blake2b(version.encode(), digest_size=12).hexdigest()
 
 
 @router.get("/gaps")
 async def get_nutrition_gaps(
+    request: Request,
+    response: Response,
     date_str: str | None = Query(default=None, alias="date"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    targets: NutritionTarget = Depends(get_request_targets),
 ):
     day = _parse_date(date_str)
-    _, comparison, _, _ = _compute_daily(db, current_user.id, day)
+    etag = _gaps_etag(db, current_user.id, day, targets)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    cache_key = (str(current_user.id), day)
+    cached = _gaps_cache.get(cache_key)
+    if cached is not None and cached[1] == etag and time.monotonic() - cached[0] < GAPS_CACHE_TTL_SECONDS:
+        _gaps_cache.move_to_end(cache_key)
+        response.headers["ETag"] = etag
+        return cached[2]
+
+    body = _build_nutrition_gaps(db, current_user.id, day, targets)
+    # Building may have (re)written the day's summary, which moves the version.
+    etag = _gaps_etag(db, current_user.id, day, targets)
+    response.headers["ETag"] = etag
+    _gaps_cache[cache_key] = (time.monotonic(), etag, body)
+    _gaps_cache.move_to_end(cache_key)
+    while len(_gaps_cache) > GAPS_CACHE_MAX_ENTRIES:
+        _gaps_cache.popitem(last=False)
+    return body
+
+
+def _build_nutrition_gaps(db: Session, user_id: str, day: date, targets: NutritionTarget) -> dict:
+    _, comparison, _ = _read_daily(db, user_id, day, targets)
 
     low_items: list[dict] = []
     for key, values in comparison.items():
@@ -604,107 +864,45 @@ async def get_nutrition_gaps(
                 "gap": max(0.0, float(values.get("target", 0) or 0) - float(values.get("consumed", 0) or 0)),
             })
 
-    low_items = sorted(low_items, key=lambda x: x["pct"])[:4]
-
-    gap_to_recipe_hint = {
-        "protein": ["high-protein", "muscle_recovery"],
-        "fiber": ["gut_health"],
-        "vitamin_c_mg": ["immune_support"],
-        "iron_mg": ["energy_boost"],
-        "magnesium_mg": ["muscle_recovery"],
-        "potassium_mg": ["heart_health"],
-        "omega3_g": ["brain_health", "heart_health"],
-        "calcium_mg": ["bone_health"],
-        "vitamin_d_mcg": ["immune_support", "bone_health"],
-        "vitamin_b12_mcg": ["energy_boost", "brain_health"],
-    }
-
-    gap_to_foods = {
-        "protein": ["Greek Yogurt", "Chicken Breast", "Lentils"],
-        "fiber": ["Chia Seeds", "Black Beans", "Raspberries"],
-        "vitamin_c_mg": ["Red Bell Pepper", "Kiwi", "Orange"],
-        "iron_mg": ["Spinach", "Lentils", "Pumpkin Seeds"],
-        "magnesium_mg": ["Pumpkin Seeds", "Almonds", "Avocado"],
-        "potassium_mg": ["Banana", "Potato", "Coconut Water"],
-        "omega3_g": ["Salmon", "Sardines", "Chia Seeds"],
-        "calcium_mg": ["Sardines", "Yogurt", "Kale"],
-        "vitamin_d_mcg": ["Salmon", "Egg Yolk", "Mushrooms UV-exposed"],
-        "vitamin_b12_mcg": ["Salmon", "Eggs", "Greek Yogurt"],
-    }
-
-    # Seed missing local foods so coach can recommend individual foods from local DB.
-    default_food_profiles = {
-        "Greek Yogurt": {"protein": 17, "calories": 100, "calcium_mg": 180},
-        "Chicken Breast": {"protein": 31, "calories": 165},
-        "Lentils": {"protein": 9, "fiber": 8, "iron_mg": 3.3},
-        "Chia Seeds": {"fiber": 10, "omega3_g": 5, "protein": 5},
-        "Black Beans": {"fiber": 8, "protein": 8, "iron_mg": 2.1},
-        "Raspberries": {"fiber": 8, "vitamin_c_mg": 26, "calories": 64},
-        "Red Bell Pepper": {"vitamin_c_mg": 95, "fiber": 2},
-        "Kiwi": {"vitamin_c_mg": 64, "fiber": 3},
-        "Orange": {"vitamin_c_mg": 70, "fiber": 3},
-        "Spinach": {"iron_mg": 2.7, "magnesium_mg": 79},
-        "Pumpkin Seeds": {"magnesium_mg": 150, "iron_mg": 2.5, "protein": 8},
-        "Almonds": {"magnesium_mg": 80, "fiber": 3.5},
-        "Avocado": {"potassium_mg": 485, "fiber": 7},
-        "Banana": {"potassium_mg": 422, "vitamin_b6_mg": 0.4},
-        "Potato": {"potassium_mg": 620, "vitamin_c_mg": 19},
-        "Coconut Water": {"potassium_mg": 470, "calories": 45},
-        "Salmon": {"omega3_g": 2.2, "protein": 22, "vitamin_d_mcg": 11},
-        "Sardines": {"omega3_g": 1.5, "calcium_mg": 325, "vitamin_b12_mcg": 8.9},
-        "Yogurt": {"calcium_mg": 200, "protein": 10},
-        "Kale": {"calcium_mg": 150, "vitamin_c_mg": 80},
-        "Egg Yolk": {"vitamin_d_mcg": 1.1, "vitamin_b12_mcg": 0.3},
-        "Mushrooms UV-exposed": {"vitamin_d_mcg": 10, "fiber": 1},
-        "Eggs": {"protein": 6, "vitamin_b12_mcg": 0.5},
-    }
+    low_items = heapq.nsmallest(4, low_items, key=lambda x: x["pct"])
 
     suggestions_meals: list[dict] = []
     suggestions_foods: list[dict] = []
 
+    # One tag-filtered query covers every gap's meal suggestion.
+    all_hint_tags = sorted({tag for gap in low_items for tag in GAP_RECIPE_HINTS.get(gap["key"], [])})
+    candidate_recipes = _recipes_with_any_benefit(db, all_hint_tags) if all_hint_tags else []
+    # Earliest candidate carrying each tag, found in a single pass.
+    first_with_tag: dict[str, tuple[int, Any]] = {}
+    for position, recipe in enumerate(candidate_recipes):
+        for tag in recipe.health_benefits or []:
+            first_with_tag.setdefault(tag, (position, recipe))
+
+    # Staple foods to suggest, keyed to the first gap that asks for them.
+    wanted_foods: dict[str, str] = {}
+    for gap in low_items:
+        for food_name in GAP_FOODS.get(gap["key"], [])[:2]:
+            wanted_foods.setdefault(food_name, gap["key"])
+    coach_foods = _ensure_coach_foods(db, wanted_foods)
+
     for gap in low_items:
         key = gap["key"]
 
         # Meal suggestions
-        hint_tags = gap_to_recipe_hint.get(key, [])
-        if hint_tags:
-            all_recipes = db.query(Recipe).limit(180).all()
-            filtered = [r for r in all_recipes if any(tag in (r.health_benefits or []) for tag in hint_tags)]
-            if filtered:
-                candidate_recipe = filtered[0]
-                suggestions_meals.append({
-                    "for": key,
-                    "recipe_id": str(candidate_recipe.id),
-                    "title": candidate_recipe.title,
-                    "health_benefits": candidate_recipe.health_benefits or [],
-                })
+        hint_tags = GAP_RECIPE_HINTS.get(key, [])
+        matches = [first_with_tag[tag] for tag in hint_tags if tag in first_with_tag]
+        if matches:
+            _, candidate_recipe = min(matches, key=lambda match: match[0])
+            suggestions_meals.append({
+                "for": key,
+                "recipe_id": str(candidate_recipe.id),
+                "title": candidate_recipe.title,
+                "health_benefits": candidate_recipe.health_benefits or [],
+            })
 
         # Food suggestions (ensuring they exist in local DB)
-        for food_name in gap_to_foods.get(key, [])[:2]:
-            row = db.query(LocalFood).filter(LocalFood.name == food_name).first()
-            if not row:
-                row = LocalFood(
-                    name=food_name,
-                    brand=None,
-                    category="Coach Staples",
-                    source_kind="coach_staple",
-                    aliases=[],
-                    default_serving_label="1 serving",
-                    default_serving_grams=100,
-                    serving_options=[],
-                    nutrition_per_100g=default_food_profiles.get(food_name, {}),
-                    nutrition_per_serving=canonicalize_nutrition(default_food_profiles.get(food_name, {})),
-                    mes_ready_nutrition=canonicalize_nutrition(default_food_profiles.get(food_name, {})),
-                    micronutrients={},
-                    serving="1 serving",
-                    nutrition_info=canonicalize_nutrition(default_food_profiles.get(food_name, {})),
-                    tags=["coach", key],
-                    is_active=True,
-                )
-                db.add(row)
-                db.commit()
-                db.refresh(row)
-
+        for food_name in GAP_FOODS.get(key, [])[:2]:
+            row = coach_foods[food_name]
             suggestions_foods.append({
                 "for": key,
                 "food_id": str(row.id),
@@ -716,7 +914,7 @@ async def get_nutrition_gaps(
     return {
         "date": day.isoformat(),
         "low_nutrients": low_items,
-        "suggestions": (suggestions_meals + suggestions_foods)[:8],
+        "suggestions": list(islice(chain(suggestions_meals, suggestions_foods), 8)),
         "recommended_meals": suggestions_meals[:4],
         "recommended_foods": suggestions_foods[:6],
     }
@@ -1,9 +1,13 @@
 import logging
+import threading
+import time
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
-from app.db import get_db
+from collections import OrderedDict
+from functools import lru_cache
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session, joinedload, load_only
+from app.db import dialect_insert, get_db, json_array_has_any
 
 logger = logging.getLogger(__name__)
 from app.auth import get_current_user
@@ -11,9 +15,11 @@ from app.models.user import User
 from app.models.recipe import Recipe
 from app.models.saved_recipe import SavedRecipe
 from app.nutrition_tags import HEALTH_BENEFIT_LABELS
+from app.responses import FastJSONResponse
 from app.achievements_engine import check_achievements
 from app.services.ingredient_substitution import apply_user_substitutions
 from app.services.metabolic_engine import compute_meal_mes, compute_meal_mes_with_pairing, display_tier, load_budget_for_user
+from app.services.recipe_facets import TOTAL_FACET, fetch_facet_counts, refresh_facet_counts
 from app.services.recipe_retrieval import ensure_recipe_embedding
 from typing import Optional
 from app.services.notifications import process_user_notifications, record_notification_event
@@ -21,6 +27,19 @@ from app.services.notifications import process_user_notifications, record_notifi
 router = APIRouter()
 
 
+# Columns read by _serialize_recipe_card and _compute_card_pairing_score; list
+# endpoints load only these and leave ingredients/steps unfetched. Both
+# helpers read attributes only, so browse and search pass plain result rows
+# of these columns instead of hydrated Recipe instances.
+RECIPE_CARD_COLUMNS = (
+    Recipe.id, Recipe.title, Recipe.description, Recipe.cuisine, Recipe.prep_time_min, Recipe.cook_time_min,
+    Recipe.total_time_min, Recipe.difficulty, Recipe.tags, Recipe.flavor_profile, Recipe.dietary_tags,
+    Recipe.health_benefits, Recipe.protein_type, Recipe.carb_type, Recipe.nutrition_info, Recipe.servings,
+    Recipe.recipe_role, Recipe.is_component, Recipe.meal_group_id, Recipe.default_pairing_ids,
+    Recipe.needs_default_pairing, Recipe.is_mes_scoreable, Recipe.pairing_synergy_profile,
+)
+
+
 def _compute_card_pairing_score(r: Recipe, db: Session, current_user: User) -> dict:
     if getattr(r, 'needs_default_pairing', None) is not True:
         return {}
@@ -29,7 +48,9 @@ def _compute_card_pairing_score(r: Recipe, db: Session, current_user: User) -> d
     if not default_ids:
         return {}
 
-    default_recipes = db.query(Recipe).filter(Recipe.id.in_(default_ids)).all()
+    default_recipes = (
+        db.query(Recipe).options(load_only(*RECIPE_CARD_COLUMNS)).filter(Recipe.id.in_(default_ids)).all()
+    )
     if not default_recipes:
         return {}
 
@@ -180,14 +201,6 @@ def _serialize_recipe_full(r: Recipe, db: Session | None = None) -> dict:
     return card
 
 
-def _json_contains(column_value, search_value: str) -> bool:
-    """Check if a JSON list column contains a value (case-insensitive)."""
-    if not column_value:
-        return False
-    items = column_value if isinstance(column_value, list) else []
-    return search_value.lower() in [str(v).lower() for v in items]
-
-
 # Category aliases — "meal-prep" and "bulk-cook"/"bulk_cook" are the same thing
 CATEGORY_ALIASES: dict[str, set[str]] = {
     "quick": {"quick"},
@@ -195,9 +208,6 @@ CATEGORY_ALIASES: dict[str, set[str]] = {
     "sit-down": {"sit-down", "sit_down"},
 }
 
-# Only real meal-type values (not category / meta tags)
-MEAL_TYPE_WHITELIST = {"breakfast", "lunch", "dinner", "snack", "condiment", "dessert"}
-
 # View-mode → recipe_role / is_component mapping
 VIEW_MODE_FILTERS: dict[str, dict] = {
     "meal_prep": {"is_component": True},    # show decoupled components only
@@ -206,8 +216,50 @@ VIEW_MODE_FILTERS: dict[str, dict] = {
 }
 
 
+# Browse results are the same for every user apart from the per-user pairing
+# scores on each card, so only the matching page of recipe ids and the total
+# are cached, keyed by the normalized filters.
+BROWSE_CACHE_TTL_SECONDS = 120
+BROWSE_CACHE_MAX_ENTRIES = 512
+_browse_cache: OrderedDict[tuple, tuple[float, int, list[str]]] = OrderedDict()
+# Browse runs on threadpool workers and invalidation on the event loop, so
+# every lookup + move_to_end, insert + evict and clear happens under this lock.
+_browse_cache_lock = threading.Lock()
+
+
+def _cached_browse_page(key: tuple) -> tuple[int, list[str]] | None:
+    with _browse_cache_lock:
+        cached = _browse_cache.get(key)
+        if cached is None or time.monotonic() - cached[0] >= BROWSE_CACHE_TTL_SECONDS:
+            return None
+        _browse_cache.move_to_end(key)
+        return cached[1], cached[2]
+
+
+def _store_browse_page(key: tuple, total: int, ids: list[str]) -> None:
+    with _browse_cache_lock:
+        _browse_cache[key] = (time.monotonic(), total, ids)
+        _browse_cache.move_to_end(key)
+        while len(_browse_cache) > BROWSE_CACHE_MAX_ENTRIES:
+            _browse_cache.popitem(last=False)
+
+
+def _browse_response(
+    page_items: list, total: int, page: int, page_size: int, db: Session, current_user: User
+) -> FastJSONResponse:
+    # Returned as a Response so FastAPI skips its jsonable_encoder pass over
+    # the cards; everything in them is already JSON-native.
+    return FastJSONResponse({
+        "items": [_serialize_recipe_card(r, db, current_user) for r in page_items],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": max(1, (total + page_size - 1) // page_size),
+    })
+
+
 @router.get("/browse")
-async def browse_recipes(
+def browse_recipes(
     q: Optional[str] = None,
     cuisine: Optional[str] = None,
     meal_type: Optional[str] = None,
@@ -227,7 +279,20 @@ async def browse_recipes(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    query = db.query(Recipe)
+    cache_key = (
+        (q or "").lower(), (cuisine or "").lower(), (meal_type or "").lower(), (category or "").lower(),
+        view_mode, recipe_role, meal_group_id, (flavor or "").lower(), (dietary or "").lower(), cook_time,
+        (difficulty or "").lower(), (health_benefit or "").lower(), (protein_type or "").lower(),
+        (carb_type or "").lower(), page, page_size,
+    )
+    cached = _cached_browse_page(cache_key)
+    if cached is not None:
+        total, ids = cached
+        page_recipes = db.query(*RECIPE_CARD_COLUMNS).filter(Recipe.id.in_(ids)).all() if ids else []
+        by_id = {str(r.id): r for r in page_recipes}
+        return _browse_response([by_id[i] for i in ids if i in by_id], total, page, page_size, db, current_user)
+
+    query = db.query(*RECIPE_CARD_COLUMNS)
 
     # Resolve view_mode to role/component constraints
     vm_filter = VIEW_MODE_FILTERS.get(view_mode, {}) if view_mode and view_mode != "all" else {}
@@ -237,7 +302,7 @@ async def browse_recipes(
         pattern = f"%{q}%"
         query = query.filter(or_(Recipe.title.ilike(pattern), Recipe.description.ilike(pattern)))
     if cuisine:
-        query = query.filter(Recipe.cuisine.ilike(cuisine))
+        query = query.filter(func.lower(Recipe.cuisine) == cuisine.lower())
     if vm_filter.get("is_component") is not None:
         query = query.filter(Recipe.is_component == vm_filter["is_component"])
     if vm_filter.get("recipe_role"):
@@ -247,130 +312,103 @@ async def browse_recipes(
     if meal_group_id:
         query = query.filter(Recipe.meal_group_id == meal_group_id)
     if difficulty:
-        query = query.filter(Recipe.difficulty.ilike(difficulty))
-
-    all_recipes = query.all()
+        query = query.filter(func.lower(Recipe.difficulty) == difficulty.lower())
 
     # Parse comma-separated multi-select values
     protein_values = [v.strip().lower() for v in protein_type.split(",") if v.strip()] if protein_type else []
     carb_values = [v.strip().lower() for v in carb_type.split(",") if v.strip()] if carb_type else []
 
-    # Resolve category filter to a set of matching tag values
-    category_matches: set[str] | None = None
-    if category:
-        category_matches = CATEGORY_ALIASES.get(category.lower(), {category.lower()})
-
-    filtered = []
-    for r in all_recipes:
-        if meal_type and not _json_contains(r.tags, meal_type):
-            continue
-        if category_matches:
-            tags_lower = {str(t).lower() for t in (r.tags or [])}
-            if not category_matches & tags_lower:
-                continue
-        # ── Composition filters ──
-        if flavor and not _json_contains(r.flavor_profile, flavor):
-            continue
-        if dietary and not _json_contains(r.dietary_tags, dietary):
-            continue
-        if health_benefit and not _json_contains(r.health_benefits, health_benefit):
-            continue
-        if cook_time:
-            total = r.total_time_min or 0
-            if cook_time == "quick" and total > 30:
-                continue
-            elif cook_time == "medium" and (total <= 30 or total > 60):
-                continue
-            elif cook_time == "long" and total <= 60:
-                continue
-        if protein_values:
-            recipe_proteins = [v.lower() for v in (r.protein_type or [])]
-            if not any(pv in recipe_proteins for pv in protein_values):
-                continue
-        if carb_values:
-            recipe_carbs = [v.lower() for v in (r.carb_type or [])]
-            if not any(cv in recipe_carbs for cv in carb_values):
-                continue
-
-        filtered.append(r)
-
-    total = len(filtered)
+    # JSON list filters match case-insensitively on any element, in SQL.
+    dialect_name = db.get_bind().dialect.name
+    json_filters = [
+        (Recipe.tags, [meal_type] if meal_type else []),
+        (Recipe.tags, sorted(CATEGORY_ALIASES.get(category.lower(), {category.lower()})) if category else []),
+        (Recipe.flavor_profile, [flavor] if flavor else []),
+        (Recipe.dietary_tags, [dietary] if dietary else []),
+        (Recipe.health_benefits, [health_benefit] if health_benefit else []),
+        (Recipe.protein_type, protein_values),
+        (Recipe.carb_type, carb_values),
+    ]
+    for column, values in json_filters:
+        if values:
+            query = query.filter(json_array_has_any(column, values, dialect_name))
+
+    if cook_time:
+        total_time = func.coalesce(Recipe.total_time_min, 0)
+        if cook_time == "quick":
+            query = query.filter(total_time <= 30)
+        elif cook_time == "medium":
+            query = query.filter(total_time > 30, total_time <= 60)
+        elif cook_time == "long":
+            query = query.filter(total_time > 60)
+
+    total = query.count()
     start = (page - 1) * page_size
-    end = start + page_size
-    page_items = filtered[start:end]
-
-    return {
-        "items": [_serialize_recipe_card(r, db, current_user) for r in page_items],
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": max(1, (total + page_size - 1) // page_size),
-    }
+    page_items = (
+        query.order_by(Recipe.created_at, Recipe.id).offset(start).limit(page_size).all()
+        if start < total
+        else []
+    )
 
+    _store_browse_page(cache_key, total, [str(r.id) for r in page_items])
+    return _browse_response(page_items, total, page, page_size, db, current_user)
 
-@router.get("/filters")
-async def get_recipe_filters(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    all_recipes = db.query(Recipe).all()
-
-    meal_types: dict[str, int] = {}
-    flavors: dict[str, int] = {}
-    dietary: dict[str, int] = {}
-    difficulties: dict[str, int] = {}
-    health_benefits: dict[str, int] = {}
-    protein_types: dict[str, int] = {}
-    carb_types: dict[str, int] = {}
 
-    for r in all_recipes:
-        for tag in (r.tags or []):
-            if tag and tag.lower() in MEAL_TYPE_WHITELIST:
-                meal_types[tag] = meal_types.get(tag, 0) + 1
+# Facet counts move only when recipes are added, so one snapshot is shared
+# by every request in this process for a minute. On PostgreSQL the counts
+# themselves come from the recipe_facet_counts materialized view.
+FILTERS_CACHE_SECONDS = 60
+_filters_snapshot: tuple[float, bytes] | None = None
 
-        for f in (r.flavor_profile or []):
-            if f:
-                flavors[f] = flavors.get(f, 0) + 1
 
-        for d in (r.dietary_tags or []):
-            if d:
-                dietary[d] = dietary.get(d, 0) + 1
+def invalidate_recipe_caches() -> None:
+    """Drop the cached browse pages and filter counts after recipes change."""
+    global _filters_snapshot
+    _filters_snapshot = None
+    with _browse_cache_lock:
+        _browse_cache.clear()
 
-        diff = (r.difficulty or "easy").lower()
-        difficulties[diff] = difficulties.get(diff, 0) + 1
 
-        for hb in (r.health_benefits or []):
-            if hb:
-                health_benefits[hb] = health_benefits.get(hb, 0) + 1
+@lru_cache(maxsize=4096)
+def _facet_label(value: str) -> str:
+    return HEALTH_BENEFIT_LABELS.get(value) or value.replace("_", " ").title()
 
-        for pt in (r.protein_type or []):
-            if pt:
-                protein_types[pt] = protein_types.get(pt, 0) + 1
 
-        for ct in (r.carb_type or []):
-            if ct:
-                carb_types[ct] = carb_types.get(ct, 0) + 1
+@router.get("/filters")
+def get_recipe_filters(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    global _filters_snapshot
+    now = time.monotonic()
+    if _filters_snapshot is not None and now - _filters_snapshot[0] < FILTERS_CACHE_SECONDS:
+        return Response(content=_filters_snapshot[1], media_type="application/json")
+
+    facets = ("meal_types", "flavors", "dietary", "difficulties", "health_benefits", "protein_types", "carb_types")
+    counts: dict[str, dict[str, int]] = {facet: {} for facet in facets}
+    total_recipes = 0
+    for facet, value, count in fetch_facet_counts(db):
+        if facet == TOTAL_FACET:
+            total_recipes = count
+        else:
+            counts[facet][value] = count
 
     def to_list(d: dict) -> list:
         return sorted(
-            [{"value": k, "label": HEALTH_BENEFIT_LABELS.get(k, k.replace("_", " ").title()), "count": v} for k, v in d.items()],
-            key=lambda x: -x["count"],
+            [{"value": k, "label": _facet_label(k), "count": v} for k, v in d.items()],
+            key=lambda x: (-x["count"], x["value"]),
         )
 
-    return {
-        "meal_types": to_list(meal_types),
-        "flavors": to_list(flavors),
-        "dietary": to_list(dietary),
-        "difficulties": to_list(difficulties),
-        "health_benefits": to_list(health_benefits),
-        "protein_types": to_list(protein_types),
-        "carb_types": to_list(carb_types),
-        "total_recipes": len(all_recipes),
-    }
+    result = {facet: to_list(values) for facet, values in counts.items()}
+    result["total_recipes"] = total_recipes
+    response = FastJSONResponse(result)
+    # Cache the encoded body so hits skip serialization entirely.
+    _filters_snapshot = (now, bytes(response.body))
+    return response
 
 
 @router.get("/{recipe_id}")
-async def get_recipe(
+def get_recipe(
     recipe_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -382,7 +420,7 @@ async def get_recipe(
 
 
 @router.get("/")
-async def search_recipes(
+def search_recipes(
     q: Optional[str] = None,
     tag: Optional[str] = None,
     difficulty: Optional[str] = None,
@@ -390,7 +428,7 @@ async def search_recipes(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    query = db.query(Recipe)
+    query = db.query(*RECIPE_CARD_COLUMNS)
     if q:
         query = query.filter(Recipe.title.ilike(f"%{q}%"))
     if difficulty:
@@ -403,58 +441,57 @@ async def search_recipes(
 
 
 @router.get("/saved/list")
-async def get_saved_recipes(
+def get_saved_recipes(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     saved = (
         db.query(SavedRecipe)
+        .options(joinedload(SavedRecipe.recipe, innerjoin=True).load_only(*RECIPE_CARD_COLUMNS))
         .filter(SavedRecipe.user_id == current_user.id)
         .order_by(SavedRecipe.saved_at.desc())
         .all()
     )
-    recipe_ids = [str(s.recipe_id) for s in saved]
-    recipes = db.query(Recipe).filter(Recipe.id.in_(recipe_ids)).all() if recipe_ids else []
-    recipe_map = {str(r.id): r for r in recipes}
     return {
-        "items": [
-            _serialize_recipe_card(recipe_map[rid], db, current_user)
-            for rid in recipe_ids
-            if rid in recipe_map
-        ],
-        "saved_ids": recipe_ids,
+        "items": [_serialize_recipe_card(s.recipe, db, current_user) for s in saved],
+        "saved_ids": [str(s.recipe_id) for s in saved],
     }
 
 
+def _saved_recipe_count(db: Session, user_id: str) -> int:
+    # count(*) on user_id alone can be answered from the (user_id, ...) indexes.
+    return db.query(func.count()).select_from(SavedRecipe).filter(SavedRecipe.user_id == user_id).scalar() or 0
+
+
 @router.post("/saved/{recipe_id}")
-async def save_recipe(
+def save_recipe(
     recipe_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    recipe_exists = db.query(Recipe).filter(Recipe.id == recipe_id).first()
-    if not recipe_exists:
+    recipe_title = db.query(Recipe.title).filter(Recipe.id == recipe_id).scalar()
+    if recipe_title is None:
         raise HTTPException(status_code=404, detail="Recipe not found")
 
-    existing = (
-        db.query(SavedRecipe)
-        .filter(SavedRecipe.user_id == current_user.id, SavedRecipe.recipe_id == recipe_id)
-        .first()
-    )
-    if existing:
+    inserted = db.execute(
+        dialect_insert(db, SavedRecipe)
+        .values(user_id=current_user.id, recipe_id=recipe_id)
+        .on_conflict_do_nothing(index_elements=["user_id", "recipe_id"])
+        .returning(SavedRecipe.id)
+    ).first()
+    if inserted is None:
         return {"status": "already_saved"}
 
-    db.add(SavedRecipe(id=str(uuid.uuid4()), user_id=current_user.id, recipe_id=recipe_id))
     db.commit()
     record_notification_event(
         db,
         current_user.id,
         "recipe_saved",
-        properties={"recipe_id": recipe_id, "recipe_title": recipe_exists.title},
+        properties={"recipe_id": recipe_id, "recipe_title": recipe_title},
         source="server",
     )
 
-    saved_count = db.query(SavedRecipe).filter(SavedRecipe.user_id == current_user.id).count()
+    saved_count = _saved_recipe_count(db, current_user.id)
     new_achievements = check_achievements(db, current_user, {"saved_recipe_count": saved_count})
     process_user_notifications(db, current_user.id)
     db.commit()
@@ -463,7 +500,7 @@ async def save_recipe(
 
 
 @router.delete("/saved/{recipe_id}")
-async def unsave_recipe(
+def unsave_recipe(
     recipe_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -513,6 +550,7 @@ class SaveGeneratedRecipeBody(_BM):
 @router.post("/saved")
 async def save_generated_recipe(
     body: SaveGeneratedRecipeBody,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -538,8 +576,10 @@ async def save_generated_recipe(
     db.add(recipe)
     db.flush()
 
-    db.add(SavedRecipe(id=str(uuid.uuid4()), user_id=current_user.id, recipe_id=recipe.id))
+    db.add(SavedRecipe(user_id=current_user.id, recipe_id=recipe.id))
     db.commit()
+    invalidate_recipe_caches()
+    background_tasks.add_task(refresh_facet_counts)
     record_notification_event(
         db,
         current_user.id,
@@ -552,7 +592,7 @@ async def save_generated_recipe(
     except Exception:
         logger.warning("Recipe embedding failed for %s", recipe.id, exc_info=True)
 
-    saved_count = db.query(SavedRecipe).filter(SavedRecipe.user_id == current_user.id).count()
+    saved_count = _saved_recipe_count(db, current_user.id)
     new_achievements = check_achievements(db, current_user, {"saved_recipe_count": saved_count})
     process_user_notifications(db, current_user.id)
     db.commit()
@@ -577,13 +617,19 @@ async def substitute_recipe_ingredients(
 
     original_recipe = _serialize_recipe_full(recipe)
 
+    user_id = current_user.id
     allergies = current_user.allergies if body.use_allergies else []
     disliked_ingredients = current_user.disliked_ingredients if body.use_dislikes else []
     protein_preferences = current_user.protein_preferences or {}
 
+    # Everything below works on the plain dicts read above. Hand the pooled
+    # connection back before waiting on the model so a slow substitution
+    # does not hold it for the whole call.
+    db.close()
+
     logger.info(
         "substitute.start recipe_id=%s user_id=%s allergies=%s dislikes=%s",
-        recipe_id, current_user.id, allergies, disliked_ingredients
+        recipe_id, user_id, allergies, disliked_ingredients
     )
 
     try:
@@ -604,7 +650,7 @@ async def substitute_recipe_ingredients(
     except Exception as exc:
         logger.exception(
             "substitute.failed recipe_id=%s user_id=%s error=%s",
-            recipe_id, current_user.id, exc
+            recipe_id, user_id, exc
         )
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
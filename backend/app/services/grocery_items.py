@@ -0,0 +1,97 @@
+"""
+Ingredient normalization for grocery lists.
+
+Meal plan items store their ingredients pre-normalized (see
+`MealPlanItem.normalized_ingredients`) so grocery generation only has to
+merge them.
+"""
+import re
+import unicodedata
+from typing import Any
+
+
+# Checked in priority order: "chicken broth" is protein, not pantry.
+CATEGORY_KEYWORDS = (
+    ("protein", ("chicken", "beef", "pork", "turkey", "salmon", "fish", "shrimp", "egg", "tofu", "lentil", "bean", "chickpea")),
+    ("dairy", ("milk", "yogurt", "cheese", "butter", "cream")),
+    ("grains", ("rice", "oat", "quinoa", "bread", "pasta", "flour")),
+    ("spices", ("salt", "pepper", "paprika", "cumin", "oregano", "cinnamon", "garlic powder", "onion powder")),
+    ("pantry", ("oil", "vinegar", "sauce", "broth", "stock", "can", "canned")),
+)
+_KEYWORD_RANK = {
+    keyword: rank
+    for rank, (_, keywords) in enumerate(CATEGORY_KEYWORDS)
+    for keyword in keywords
+}
+# Zero-width lookahead so overlapping keywords are all seen in a single scan.
+_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_KEYWORD_RANK, key=_KEYWORD_RANK.get)) + "))"
+)
+
+
+def infer_category(name: str) -> str:
+    n = (name or "").lower()
+    rank = min((_KEYWORD_RANK[m.group(1)] for m in _KEYWORD_RE.finditer(n)), default=None)
+    return CATEGORY_KEYWORDS[rank][0] if rank is not None else "produce"
+
+
+def normalize_ingredient(ingredient: Any) -> dict:
+    if isinstance(ingredient, dict):
+        name = str(ingredient.get("name", "")).strip()
+        quantity = str(ingredient.get("quantity", "1")).strip() or "1"
+        unit = str(ingredient.get("unit", "")).strip()
+        category = str(ingredient.get("category", "")).strip() or infer_category(name)
+        return {
+            "name": name,
+            "quantity": quantity,
+            "unit": unit,
+            "category": category,
+            "checked": False,
+        }
+
+    name = str(ingredient or "").strip()
+    return {
+        "name": name,
+        "quantity": "1",
+        "unit": "",
+        "category": infer_category(name),
+        "checked": False,
+    }
+
+
+# Tried in order: "1 1/2" and "3/4", then "1½" and "½", then "2" and "1.5".
+_FRACTION_RE = re.compile(r"\s*(?:(\d+)\s+)?(\d+)\s*/\s*(\d+)")
+_VULGAR_FRACTIONS = {c: unicodedata.numeric(c) for c in "¼½¾⅓⅔⅕⅖⅗⅘⅙⅚⅛⅜⅝⅞"}
+_VULGAR_RE = re.compile(r"\s*(\d+)?\s*([" + "".join(_VULGAR_FRACTIONS) + "])")
+_NUMBER_RE = re.compile(r"\s*(\d+(?:\.\d+)?)")
+# "1-2 cloves", "2 to 3 cups": a range has no single amount to add up.
+_RANGE_TAIL_RE = re.compile(r"\s*(?:[-–]|to\s)\s*\d")
+
+
+def parse_quantity(quantity: str) -> float | None:
+    """Leading amount of a quantity string, or None when there isn't a
+    single one ("2 cups" -> 2, "1 1/2" -> 1.5, "½" -> 0.5, "1-2" -> None)."""
+    quantity = quantity or ""
+    if match := _FRACTION_RE.match(quantity):
+        whole, numerator, denominator = match.groups()
+        if not int(denominator):
+            return None
+        value = int(whole or 0) + int(numerator) / int(denominator)
+    elif match := _VULGAR_RE.match(quantity):
+        value = int(match.group(1) or 0) + _VULGAR_FRACTIONS[match.group(2)]
+    elif match := _NUMBER_RE.match(quantity):
+        value = float(match.group(1))
+    else:
+        return None
+    if _RANGE_TAIL_RE.match(quantity, match.end()):
+        return None
+    return float(value)
+
+
+def format_quantity(value: float) -> str:
+    return f"{round(value, 2):g}"
+
+
+def normalize_ingredients(recipe_data: dict | None) -> list[dict]:
+    """Normalize every ingredient of a stored recipe payload."""
+    return [normalize_ingredient(i) for i in (recipe_data or {}).get("ingredients", []) or []]
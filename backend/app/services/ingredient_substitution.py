@@ -1,5 +1,6 @@
 import asyncio
-from copy import deepcopy
+import re
+from functools import lru_cache
 from typing import Any, Dict, List
 
 from app.agents.ingredient_swapper import generate_ai_substitutions
@@ -36,6 +37,26 @@ def _contains_any(text: str, keywords: List[str]) -> bool:
     return any(k in t for k in keywords)
 
 
+@lru_cache(maxsize=256)
+def _term_matcher(terms: tuple[str, ...]) -> re.Pattern | None:
+    """One alternation over every term, so an ingredient name is scanned once
+    to learn whether any of them occurs in it."""
+    terms = tuple(t for t in terms if t)
+    if not terms:
+        return None
+    return re.compile("|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True)))
+
+
+def _first_term_in(name: str, terms: tuple[str, ...]) -> str | None:
+    """First of `terms` (in order) that is a substring of `name`."""
+    matcher = _term_matcher(terms)
+    if matcher is None or not matcher.search(name):
+        return None
+    # Most names match nothing and stop above; on a hit keep the original
+    # term-order precedence, which decides the replacement.
+    return next(t for t in terms if t and t in name)
+
+
 def _deterministic_substitute(
     recipe: Dict[str, Any],
     allergies: List[str],
@@ -44,46 +65,43 @@ def _deterministic_substitute(
     disliked_proteins: List[str],
     custom_excludes: List[str] | None = None,
 ) -> Dict[str, Any]:
-    modified = deepcopy(recipe)
     swaps: List[Dict[str, Any]] = []
     warnings: List[str] = []
 
-    all_excludes = {x.lower() for x in (disliked_ingredients or []) + (custom_excludes or [])}
+    all_excludes = tuple({x.lower() for x in (disliked_ingredients or []) + (custom_excludes or [])})
 
     allergy_terms: List[str] = []
     for allergy in allergies or []:
         allergy_terms.extend(ALLERGY_KEYWORDS.get((allergy or "").lower(), [(allergy or "").lower()]))
+    allergy_terms = tuple(allergy_terms)
 
-    disliked_protein_set = {p.lower() for p in (disliked_proteins or [])}
+    disliked_protein_set = tuple({p.lower() for p in (disliked_proteins or [])})
     liked_protein_choice = (liked_proteins or [None])[0]
 
     next_ingredients = []
-    for ing in modified.get("ingredients", []) or []:
+    for ing in recipe.get("ingredients", []) or []:
         name = (ing.get("name") or "").lower()
         original_name = ing.get("name") or ""
 
         replaced_with = None
         reason = None
 
-        for term in allergy_terms:
-            if term and term in name:
-                replaced_with = DEFAULT_SWAP_MAP.get(term, DEFAULT_SWAP_MAP.get(original_name.lower(), "ingredient alternative"))
-                reason = "allergy-safe substitution"
-                break
+        term = _first_term_in(name, allergy_terms)
+        if term:
+            replaced_with = DEFAULT_SWAP_MAP.get(term, DEFAULT_SWAP_MAP.get(original_name.lower(), "ingredient alternative"))
+            reason = "allergy-safe substitution"
 
         if not replaced_with:
-            for d in all_excludes:
-                if d and d in name:
-                    replaced_with = DEFAULT_SWAP_MAP.get(d, "ingredient alternative")
-                    reason = "based on your dislikes"
-                    break
+            d = _first_term_in(name, all_excludes)
+            if d:
+                replaced_with = DEFAULT_SWAP_MAP.get(d, "ingredient alternative")
+                reason = "based on your dislikes"
 
         if not replaced_with:
-            for p in disliked_protein_set:
-                if p and p in name:
-                    replaced_with = liked_protein_choice or DEFAULT_SWAP_MAP.get(p, "protein alternative")
-                    reason = "based on your protein preferences"
-                    break
+            p = _first_term_in(name, disliked_protein_set)
+            if p:
+                replaced_with = liked_protein_choice or DEFAULT_SWAP_MAP.get(p, "protein alternative")
+                reason = "based on your protein preferences"
 
         if replaced_with:
             new_ing = {**ing, "name": replaced_with}
@@ -99,7 +117,9 @@ def _deterministic_substitute(
         else:
             next_ingredients.append(ing)
 
-    modified["ingredients"] = next_ingredients
+    # Only the ingredient list changes: swapped entries are new dicts and the
+    # rest of the recipe is shared with the input rather than deep-copied.
+    modified = {**recipe, "ingredients": next_ingredients}
 
     if len(swaps) >= 4:
         warnings.append("Many ingredient substitutions were applied; flavor profile may differ.")
@@ -0,0 +1,113 @@
+"""
+Leaderboard reads backed by the `leaderboard_top20` materialized view.
+
+The view is created by Alembic on PostgreSQL and refreshed periodically by
+`leaderboard_refresh_loop` (run on the dedicated worker). Other backends, and
+databases that have not run the migration yet, use a live top-N query on
+`users` instead. Either way the result is held in-process for one refresh
+interval.
+"""
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db import SessionLocal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_VIEW = "leaderboard_top20"
+LEADERBOARD_SIZE = 20
+
+_SELECT_VIEW = text(
+    f"SELECT id, name, xp_points, current_streak FROM {LEADERBOARD_VIEW} "
+    "ORDER BY xp_points DESC"
+)
+_REFRESH_VIEW = text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {LEADERBOARD_VIEW}")
+_PROBE_VIEW = text("SELECT 1 FROM pg_matviews WHERE matviewname = :name")
+
+# Once found, the view stays. A miss is re-probed after one refresh interval,
+# so a process started before `alembic upgrade` picks the view up without a
+# restart.
+_view_available = False
+_view_probed_at: float | None = None
+
+# (fetched_at, rows) snapshot shared by every request in this process. The
+# view itself only changes once per refresh interval, so re-reading it more
+# often than that buys nothing.
+_snapshot: tuple[float, list] | None = None
+
+
+def leaderboard_view_available(db: Session) -> bool:
+    global _view_available, _view_probed_at
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    if _view_available:
+        return True
+    now = time.monotonic()
+    if _view_probed_at is not None and now - _view_probed_at < get_settings().leaderboard_refresh_seconds:
+        return False
+    first_probe = _view_probed_at is None
+    _view_probed_at = now
+    _view_available = db.execute(_PROBE_VIEW, {"name": LEADERBOARD_VIEW}).first() is not None
+    if _view_available and not first_probe:
+        logger.info("leaderboard.view_found switching from live users query")
+    elif not _view_available and first_probe:
+        logger.warning("leaderboard.view_missing using live users query until it appears")
+    return _view_available
+
+
+def _query_leaderboard(db: Session) -> list:
+    if leaderboard_view_available(db):
+        return db.execute(_SELECT_VIEW).all()
+    return (
+        db.query(User.id, User.name, User.xp_points, User.current_streak)
+        .order_by(User.xp_points.desc())
+        .limit(LEADERBOARD_SIZE)
+        .all()
+    )
+
+
+def fetch_leaderboard(db: Session) -> list:
+    """Return the top users as (id, name, xp_points, current_streak) rows."""
+    global _snapshot
+    now = time.monotonic()
+    if _snapshot is not None and now - _snapshot[0] < get_settings().leaderboard_refresh_seconds:
+        return _snapshot[1]
+    rows = _query_leaderboard(db)
+    _snapshot = (now, rows)
+    return rows
+
+
+def invalidate_leaderboard_cache() -> None:
+    global _snapshot
+    _snapshot = None
+
+
+def refresh_leaderboard() -> bool:
+    db = SessionLocal()
+    try:
+        if not leaderboard_view_available(db):
+            return False
+        db.execute(_REFRESH_VIEW)
+        db.commit()
+        return True
+    finally:
+        db.close()
+
+
+async def leaderboard_refresh_loop(poll_seconds: int = 30) -> None:
+    # Keeps polling while the view is missing; leaderboard_view_available
+    # re-probes for it, so refreshes start once the migration has run.
+    while True:
+        try:
+            await asyncio.to_thread(refresh_leaderboard)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("leaderboard_refresh.tick_failed")
+        await asyncio.sleep(poll_seconds)
@@ -1915,7 +1915,7 @@ def on_food_log_created(db: Session, user_id: str, food_log: FoodLog) -> dict[st
             user = db.query(User).filter(User.id == user_id).first()
             if user:
                 tier_label = daily.tier
-                award_xp(db, user, tier_xp, f"metabolic_tier:{tier_label}")
+                award_xp(db, user, tier_xp, f"metabolic_tier:{tier_label}", commit=False)
 
     # Dessert / treat feedback
     dessert_feedback = None
@@ -0,0 +1,112 @@
+"""
+Recipe facet counts for /recipes/filters, backed by the `recipe_facet_counts`
+materialized view.
+
+The view is created by Alembic on PostgreSQL and refreshed after recipes are
+added. Other backends, and databases that have not run the migration yet,
+aggregate the recipes table live with the same (facet, value, count) shape.
+"""
+import logging
+import time
+from typing import Any
+
+from sqlalchemy import and_, func, literal, select, text, true, union_all
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal, json_array_elements
+from app.models.recipe import Recipe
+
+logger = logging.getLogger(__name__)
+
+FACET_COUNTS_VIEW = "recipe_facet_counts"
+TOTAL_FACET = "total_recipes"
+
+# Only real meal-type values (not category / meta tags)
+MEAL_TYPE_WHITELIST = {"breakfast", "lunch", "dinner", "snack", "condiment", "dessert"}
+
+# Facet name → JSON list column it counts. The migration that creates the
+# view spells out the same facets in SQL; keep the two in step.
+FACET_LIST_COLUMNS: dict[str, Any] = {
+    "meal_types": Recipe.tags,
+    "flavors": Recipe.flavor_profile,
+    "dietary": Recipe.dietary_tags,
+    "health_benefits": Recipe.health_benefits,
+    "protein_types": Recipe.protein_type,
+    "carb_types": Recipe.carb_type,
+}
+
+_SELECT_VIEW = text(f"SELECT facet, value, count FROM {FACET_COUNTS_VIEW}")
+_REFRESH_VIEW = text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {FACET_COUNTS_VIEW}")
+_PROBE_VIEW = text("SELECT 1 FROM pg_matviews WHERE matviewname = :name")
+
+VIEW_REPROBE_SECONDS = 60
+
+# Once found, the view stays. A miss is re-probed after VIEW_REPROBE_SECONDS,
+# so a process started before `alembic upgrade` picks the view up without a
+# restart.
+_view_available = False
+_view_probed_at: float | None = None
+
+
+def facet_counts_view_available(db: Session) -> bool:
+    global _view_available, _view_probed_at
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    if _view_available:
+        return True
+    now = time.monotonic()
+    if _view_probed_at is not None and now - _view_probed_at < VIEW_REPROBE_SECONDS:
+        return False
+    first_probe = _view_probed_at is None
+    _view_probed_at = now
+    _view_available = db.execute(_PROBE_VIEW, {"name": FACET_COUNTS_VIEW}).first() is not None
+    if _view_available and not first_probe:
+        logger.info("recipe_facets.view_found switching from live aggregate")
+    elif not _view_available and first_probe:
+        logger.warning("recipe_facets.view_missing using live aggregate until it appears")
+    return _view_available
+
+
+def facet_counts_stmt(dialect_name: str):
+    """(facet, value, count) rows for every facet in one UNION ALL, plus a
+    `total_recipes` row with an empty value."""
+    parts = []
+    for facet, column in FACET_LIST_COLUMNS.items():
+        element = json_array_elements(column, dialect_name)
+        value = element.c.value
+        if facet == "meal_types":
+            keep = func.lower(value).in_(sorted(MEAL_TYPE_WHITELIST))
+        else:
+            keep = and_(value.isnot(None), value != "")
+        parts.append(
+            select(literal(facet), value, func.count())
+            .select_from(Recipe.__table__.join(element, true()))
+            .where(keep)
+            .group_by(value)
+        )
+    difficulty = func.lower(func.coalesce(Recipe.difficulty, "easy"))
+    parts.append(select(literal("difficulties"), difficulty, func.count()).group_by(difficulty))
+    parts.append(select(literal(TOTAL_FACET), literal(""), func.count()).select_from(Recipe.__table__))
+    return union_all(*parts)
+
+
+def fetch_facet_counts(db: Session) -> list:
+    """Return (facet, value, count) rows for every /filters facet."""
+    if facet_counts_view_available(db):
+        return db.execute(_SELECT_VIEW).all()
+    return db.execute(facet_counts_stmt(db.get_bind().dialect.name)).all()
+
+
+def refresh_facet_counts() -> bool:
+    db = SessionLocal()
+    try:
+        if not facet_counts_view_available(db):
+            return False
+        db.execute(_REFRESH_VIEW)
+        db.commit()
+        return True
+    except Exception:
+        logger.exception("recipe_facets.refresh_failed")
+        return False
+    finally:
+        db.close()
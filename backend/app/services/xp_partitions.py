@@ -0,0 +1,79 @@
+"""
+Monthly partition upkeep for `xp_transactions`.
+
+On PostgreSQL the table is range-partitioned on `created_at` (see the
+`c5d7e9f1a2b3` migration). The worker calls `ensure_xp_partitions` daily so
+the next few months always exist before rows arrive; anything that slips
+through lands in the DEFAULT partition instead of failing the insert.
+"""
+import asyncio
+import logging
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+XP_TABLE = "xp_transactions"
+MONTHS_AHEAD = 2
+
+_PROBE_PARTITIONED = text(
+    "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+    "WHERE c.relname = :name"
+)
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.month - 1 + months
+    return date(day.year + index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month_start: date) -> str:
+    return f"{XP_TABLE}_{month_start:%Y_%m}"
+
+
+def months_to_prepare(today: date, months_ahead: int = MONTHS_AHEAD) -> list[tuple[date, date]]:
+    """Return [start, end) bounds for the current month and `months_ahead` after it."""
+    first = today.replace(day=1)
+    return [(_add_months(first, i), _add_months(first, i + 1)) for i in range(months_ahead + 1)]
+
+
+def xp_table_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.execute(_PROBE_PARTITIONED, {"name": XP_TABLE}).first() is not None
+
+
+def ensure_xp_partitions(today: date | None = None) -> bool:
+    db = SessionLocal()
+    try:
+        if not xp_table_partitioned(db):
+            return False
+        for start, end in months_to_prepare(today or date.today()):
+            db.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF {XP_TABLE} "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                )
+            )
+        db.commit()
+        return True
+    finally:
+        db.close()
+
+
+async def xp_partition_maintenance_loop(poll_seconds: int = 24 * 60 * 60) -> None:
+    while True:
+        try:
+            prepared = await asyncio.to_thread(ensure_xp_partitions)
+            if not prepared:
+                logger.info("xp_partitions.stopped table_not_partitioned")
+                return
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("xp_partitions.tick_failed")
+        await asyncio.sleep(poll_seconds)
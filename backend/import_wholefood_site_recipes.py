@@ -18,17 +18,23 @@ What this script does:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
 import html
 import json
 import re
-import ssl
 import uuid
+from collections import deque
+from contextlib import aclosing
 from dataclasses import dataclass, field
+from functools import lru_cache
 from html.parser import HTMLParser
-from typing import Any
+from pathlib import Path
+from typing import Any, AsyncIterator
 from urllib.parse import urljoin, urlparse
-from urllib.error import URLError
-from urllib.request import Request, urlopen
+
+import httpx
+from sqlalchemy import insert, update
 
 from app.db import SessionLocal, init_db
 from app.models.recipe import Recipe, RECIPE_ROLES
@@ -45,6 +51,19 @@ from app.services.metabolic_engine import (
 
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124 Safari/537.36"
 
+# Pages fetched at once by the crawl and the import. Each wave is parsed (and
+# written to the DB) before the next one is requested.
+FETCH_CONCURRENCY = 10
+FETCH_TIMEOUT_SECONDS = 30.0
+# Transient failures (connection errors, timeouts, 5xx) are retried with
+# exponential backoff: 0.3s, then 0.6s.
+FETCH_RETRIES = 2
+FETCH_BACKOFF_SECONDS = 0.3
+
+# Set by --cache-dir: successful fetches are kept on disk, keyed by URL, so a
+# rerun while tuning the policy or classifiers does not hit the site again.
+_html_cache_dir: Path | None = None
+
 PROTEIN_OPTIONS = ["chicken", "beef", "lamb", "pork", "salmon", "shrimp", "other_fish", "eggs", "vegetarian"]
 CARB_OPTIONS = ["rice", "sweet_potato", "potato", "sourdough_bread", "oats", "quinoa", "tortillas", "noodles", "plantain"]
 
@@ -60,31 +79,137 @@ DEFAULT_MES_BUDGET = {
 }
 
 
-class LinkParser(HTMLParser):
+class PageParser(HTMLParser):
+    """One pass over a page that collects everything the extractors read:
+    link targets, JSON-LD script bodies, the first <h1> and <title>, and the
+    text of every <li> (in document order)."""
+
     def __init__(self):
         super().__init__()
         self.links: list[str] = []
+        self.json_ld_blocks: list[str] = []
+        self.h1: str | None = None
+        self.title: str | None = None
+        self.list_items: list[str | None] = []
+        self._json_ld: list[str] | None = None
+        self._h1: list[str] | None = None
+        self._title: list[str] | None = None
+        self._open_items: list[tuple[int, list[str]]] = []
 
     def handle_starttag(self, tag, attrs):
-        if tag.lower() != "a":
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.links.append(href)
+        elif tag == "script":
+            if str(dict(attrs).get("type") or "").lower() == "application/ld+json":
+                self._json_ld = []
+        elif tag == "h1":
+            if self.h1 is None and self._h1 is None:
+                self._h1 = []
+        elif tag == "title":
+            if self.title is None and self._title is None:
+                self._title = []
+        elif tag == "li":
+            self._open_items.append((len(self.list_items), []))
+            self.list_items.append(None)
+        elif tag == "br":
+            self.handle_data(" ")
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._json_ld is not None:
+            self.json_ld_blocks.append("".join(self._json_ld))
+            self._json_ld = None
+        elif tag == "h1" and self._h1 is not None:
+            self.h1 = "".join(self._h1)
+            self._h1 = None
+        elif tag == "title" and self._title is not None:
+            self.title = "".join(self._title)
+            self._title = None
+        elif tag == "li" and self._open_items:
+            index, chunks = self._open_items.pop()
+            self.list_items[index] = "".join(chunks)
+
+    def handle_data(self, data):
+        if self._json_ld is not None:
+            self._json_ld.append(data)
             return
-        href = dict(attrs).get("href")
-        if href:
-            self.links.append(href)
+        for chunks in (self._h1, self._title):
+            if chunks is not None:
+                chunks.append(data)
+        for _, chunks in self._open_items:
+            chunks.append(data)
+
+
+def parse_page(page_html: str) -> PageParser:
+    page = PageParser()
+    page.feed(page_html)
+    page.close()
+    return page
+
+
+def crawler_client(verify: bool = True) -> httpx.AsyncClient:
+    # One keep-alive pool per run, sized to a full wave, so every page after
+    # the first reuses an open TCP/TLS connection to the crawled host.
+    return httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT},
+        timeout=FETCH_TIMEOUT_SECONDS,
+        limits=httpx.Limits(max_connections=FETCH_CONCURRENCY, max_keepalive_connections=FETCH_CONCURRENCY),
+        follow_redirects=True,
+        verify=verify,
+    )
+
+
+async def _get_with_retries(client: httpx.AsyncClient, url: str) -> httpx.Response:
+    attempt = 0
+    while True:
+        try:
+            resp = await client.get(url)
+        except httpx.TransportError as exc:
+            if attempt >= FETCH_RETRIES or "certificate verify failed" in str(exc).lower():
+                raise
+        else:
+            if resp.status_code < 500 or attempt >= FETCH_RETRIES:
+                return resp
+        await asyncio.sleep(FETCH_BACKOFF_SECONDS * 2**attempt)
+        attempt += 1
+
+
+def enable_html_cache(cache_dir: str | Path | None) -> None:
+    global _html_cache_dir
+    _html_cache_dir = Path(cache_dir) if cache_dir else None
+    if _html_cache_dir is not None:
+        _html_cache_dir.mkdir(parents=True, exist_ok=True)
 
 
-def fetch_html(url: str, timeout: int = 30) -> str:
-    req = Request(url, headers={"User-Agent": USER_AGENT})
+def _html_cache_path(url: str) -> Path | None:
+    if _html_cache_dir is None:
+        return None
+    return _html_cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.html"
+
+
+async def fetch_html(client: httpx.AsyncClient, url: str) -> str:
+    cache_path = _html_cache_path(url)
+    if cache_path is not None and cache_path.exists():
+        return cache_path.read_text(encoding="utf-8")
+
     try:
-        with urlopen(req, timeout=timeout) as resp:
-            return resp.read().decode("utf-8", "ignore")
-    except URLError as exc:
-        message = str(exc).lower()
-        if "certificate verify failed" not in message:
+        resp = await _get_with_retries(client, url)
+    except httpx.ConnectError as exc:
+        if "certificate verify failed" not in str(exc).lower():
             raise
-        insecure_ctx = ssl._create_unverified_context()
-        with urlopen(req, timeout=timeout, context=insecure_ctx) as resp:
-            return resp.read().decode("utf-8", "ignore")
+        async with crawler_client(verify=False) as insecure:
+            resp = await _get_with_retries(insecure, url)
+    resp.raise_for_status()
+    page_html = resp.content.decode("utf-8", "ignore")
+    if cache_path is not None:
+        cache_path.write_text(page_html, encoding="utf-8")
+    return page_html
+
+
+async def fetch_many(client: httpx.AsyncClient, urls: list[str]) -> list[str | BaseException]:
+    """Fetch `urls` concurrently; a failed fetch comes back as its exception."""
+    return await asyncio.gather(*(fetch_html(client, u) for u in urls), return_exceptions=True)
 
 
 def normalize_url(base: str, href: str) -> str:
@@ -100,80 +225,83 @@ def same_domain(u: str, allowed_domain: str) -> bool:
         return False
 
 
+# URL path fragments of index, archive and utility pages.
+BLOCKED_FRAGMENTS = (
+    "/category/", "/tag/", "/shop/", "/contact/", "/about/", "/privacy", "/wp-", "/feed/", "/author/",
+    "/page/", "/search/", "/cdn-cgi/",
+)
+
+
 def looks_like_post(u: str) -> bool:
     p = urlparse(u).path.lower()
-    blocked = [
-        "/category/", "/tag/", "/shop/", "/contact/", "/about/", "/privacy", "/wp-", "/feed/", "/author/",
-        "/page/", "/search/", "/cdn-cgi/",
-    ]
-    if any(b in p for b in blocked):
+    if any(b in p for b in BLOCKED_FRAGMENTS):
         return False
     segments = [s for s in p.split("/") if s]
     return len(segments) <= 2 and len("".join(segments)) > 5
 
 
-def extract_links(base_url: str, html: str, allowed_domain: str) -> list[str]:
-    parser = LinkParser()
-    parser.feed(html)
+def extract_links(base_url: str, page: PageParser, allowed_domain: str) -> list[str]:
     out: list[str] = []
-    for href in parser.links:
+    for href in page.links:
         u = normalize_url(base_url, href)
         if same_domain(u, allowed_domain):
             out.append(u)
     return out
 
 
-def _find_json_ld_blocks(html: str) -> list[str]:
-    pat = re.compile(r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.I | re.S)
-    return [m.strip() for m in pat.findall(html) if m and m.strip()]
+# JSON-LD node types that never contain a Recipe; their subtrees (logos,
+# breadcrumbs, author profiles) are not searched.
+_NON_RECIPE_TYPES = frozenset({"organization", "website", "breadcrumblist", "imageobject", "person"})
 
 
-def _walk_json(obj: Any):
-    if isinstance(obj, dict):
-        yield obj
-        for v in obj.values():
-            yield from _walk_json(v)
-    elif isinstance(obj, list):
-        for i in obj:
-            yield from _walk_json(i)
+def _find_recipe(obj: Any) -> dict[str, Any] | None:
+    """Depth-first, document-order search for the first Recipe node that has
+    ingredients."""
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+        t = node.get("@type")
+        types = {str(x).lower() for x in t} if isinstance(t, list) else {str(t).lower()}
+        if "recipe" in types and node.get("recipeIngredient"):
+            return node
+        if types <= _NON_RECIPE_TYPES:
+            continue
+        stack.extend(reversed(node.values()))
+    return None
 
 
-def extract_recipe_jsonld(html: str) -> dict[str, Any] | None:
-    for block in _find_json_ld_blocks(html):
+def extract_recipe_jsonld(page: PageParser) -> dict[str, Any] | None:
+    for block in page.json_ld_blocks:
+        if not block.strip():
+            continue
         try:
             parsed = json.loads(block)
         except Exception:
             continue
-        for node in _walk_json(parsed):
-            t = node.get("@type")
-            if isinstance(t, list):
-                is_recipe = any(str(x).lower() == "recipe" for x in t)
-            else:
-                is_recipe = str(t).lower() == "recipe"
-            if is_recipe and node.get("recipeIngredient"):
-                return node
+        node = _find_recipe(parsed)
+        if node is not None:
+            return node
     return None
 
 
-def _strip_tags(s: str) -> str:
-    s = re.sub(r"<br\s*/?>", " ", s, flags=re.I)
-    s = re.sub(r"<[^>]+>", "", s)
-    s = html.unescape(s)
-    return re.sub(r"\s+", " ", s).strip()
+def _collapse_text(s: str) -> str:
+    # PageParser has already dropped the tags and decoded entities.
+    # str.split() splits on the same Unicode whitespace as \s, in C.
+    return " ".join(s.split())
 
 
-def extract_recipe_fallback(html: str) -> dict[str, Any] | None:
-    title = ""
-    m_title = re.search(r"<h1[^>]*>(.*?)</h1>", html, flags=re.I | re.S)
-    if m_title:
-        title = _strip_tags(m_title.group(1))
+def extract_recipe_fallback(page: PageParser) -> dict[str, Any] | None:
+    title = _collapse_text(page.h1) if page.h1 is not None else ""
 
-    if not title:
-        m_t = re.search(r"<title>(.*?)</title>", html, flags=re.I | re.S)
-        if m_t:
-            title = _strip_tags(m_t.group(1)).split("|")[0].strip()
+    if not title and page.title is not None:
+        title = _collapse_text(page.title).split("|")[0].strip()
 
-    ingredients = [_strip_tags(li) for li in re.findall(r"<li[^>]*>(.*?)</li>", html, flags=re.I | re.S)]
+    ingredients = [_collapse_text(li) for li in page.list_items if li is not None]
     ingredients = [x for x in ingredients if x and len(x) > 2]
     if len(ingredients) < 4:
         return None
@@ -192,11 +320,17 @@ def extract_recipe_fallback(html: str) -> dict[str, Any] | None:
     }
 
 
+_ISO_HOURS_RE = re.compile(r"(\d+)H")
+_ISO_MINUTES_RE = re.compile(r"(\d+)M")
+_INT_RE = re.compile(r"(\d+)")
+_STEP_SPLIT_RE = re.compile(r"\n+|\.\s+")
+
+
 def parse_iso_minutes(v: str | None) -> int:
     if not v:
         return 0
-    h = re.search(r"(\d+)H", v)
-    m = re.search(r"(\d+)M", v)
+    h = _ISO_HOURS_RE.search(v)
+    m = _ISO_MINUTES_RE.search(v)
     return (int(h.group(1)) if h else 0) * 60 + (int(m.group(1)) if m else 0)
 
 
@@ -204,14 +338,14 @@ def parse_yield(v: Any) -> int:
     if isinstance(v, int):
         return max(v, 1)
     s = str(v or "").lower()
-    m = re.search(r"(\d+)", s)
+    m = _INT_RE.search(s)
     return int(m.group(1)) if m else 2
 
 
 def parse_instructions(v: Any) -> list[str]:
     out: list[str] = []
     if isinstance(v, str):
-        out = [x.strip() for x in re.split(r"\n+|\.\s+", v) if x.strip()]
+        out = [x.strip() for x in _STEP_SPLIT_RE.split(v) if x.strip()]
     elif isinstance(v, list):
         for item in v:
             if isinstance(item, str) and item.strip():
@@ -263,11 +397,39 @@ HARD_REJECT_PATTERNS = [
 
 ALLOWED_GLUTEN_EXCEPTIONS = ["sourdough bread", "sourdough bun", "sourdough buns"]
 
+UNRESOLVED_SEED_OILS = [
+    "canola oil", "soybean oil", "corn oil", "sunflower oil", "safflower oil", "grapeseed oil", "vegetable oil",
+    "cottonseed oil", "rice bran oil",
+]
+UNRESOLVED_REFINED_SUGARS = [
+    "white sugar", "granulated sugar", "brown sugar", "powdered sugar", "confectioners sugar", "high fructose corn syrup",
+    "corn syrup",
+]
+
+# apply_policy runs on every ingredient line of every crawled recipe, so each
+# pattern list is fused into one alternation that scans the line once. The
+# named group that matched (m.lastgroup) selects the replacement / category.
+# Alternatives are tried in list order at each position, so a longer phrase
+# listed first ("high fructose corn syrup") wins over its suffix.
+_BANNED_RE = re.compile("|".join(f"(?P<g{i}>{p})" for i, p in enumerate(BANNED_PATTERNS)), re.I)
+_BANNED_SUBS = {f"g{i}": sub for i, sub in enumerate(BANNED_PATTERNS.values())}
+_HARD_REJECT_RE = re.compile("|".join(f"(?:{p})" for p in HARD_REJECT_PATTERNS))
+_UNRESOLVED_RE = re.compile(
+    r"(?P<gluten>\b(?:all-purpose flour|plain flour|wheat flour|semolina|farina|barley|rye)\b)"
+    f"|(?P<seed_oil>{'|'.join(map(re.escape, UNRESOLVED_SEED_OILS))})"
+    f"|(?P<refined_sugar>{'|'.join(map(re.escape, UNRESOLVED_REFINED_SUGARS))})"
+)
+_UNRESOLVED_REASONS = {
+    "gluten": "unresolved gluten ingredient",
+    "seed_oil": "unresolved seed oil ingredient",
+    "refined_sugar": "unresolved refined sugar ingredient",
+}
+
 
 def _clean_ingredient_line(s: str) -> str:
     s = html.unescape(s)
-    s = re.sub(r"\s+", " ", s).strip(" -\t\n\r")
-    return s.replace("\u00a0", " ")
+    # Collapsing also folds the non-breaking spaces html.unescape produces.
+    return " ".join(s.split()).strip(" -\t\n\r")
 
 
 def apply_policy(ingredients: list[str]) -> tuple[list[str], list[str], list[str], bool]:
@@ -280,36 +442,18 @@ def apply_policy(ingredients: list[str]) -> tuple[list[str], list[str], list[str
         original = _clean_ingredient_line(raw)
         lower_original = original.lower()
 
-        for pat in HARD_REJECT_PATTERNS:
-            if re.search(pat, lower_original):
-                reject_reasons.append(f"hard-reject ingredient: {original}")
+        if _HARD_REJECT_RE.search(lower_original):
+            reject_reasons.append(f"hard-reject ingredient: {original}")
 
-        replaced = original
-        for pat, sub in BANNED_PATTERNS.items():
-            if re.search(pat, replaced, flags=re.I):
-                replaced = re.sub(pat, sub, replaced, flags=re.I)
+        replaced = _BANNED_RE.sub(lambda m: _BANNED_SUBS[m.lastgroup], original)
 
         lower_replaced = replaced.lower()
-        unresolved_gluten = (
-            bool(re.search(r"\b(all-purpose flour|plain flour|wheat flour|semolina|farina|barley|rye)\b", lower_replaced))
-            and not any(exc in lower_replaced for exc in ALLOWED_GLUTEN_EXCEPTIONS)
-        )
-        if unresolved_gluten:
-            reject_reasons.append(f"unresolved gluten ingredient: {original}")
-
-        unresolved_seed_oil = any(
-            o in lower_replaced
-            for o in ["canola oil", "soybean oil", "corn oil", "sunflower oil", "safflower oil", "grapeseed oil", "vegetable oil", "cottonseed oil", "rice bran oil"]
-        )
-        if unresolved_seed_oil:
-            reject_reasons.append(f"unresolved seed oil ingredient: {original}")
-
-        unresolved_refined_sugar = any(
-            z in lower_replaced
-            for z in ["white sugar", "granulated sugar", "brown sugar", "powdered sugar", "confectioners sugar", "corn syrup", "high fructose corn syrup"]
-        )
-        if unresolved_refined_sugar:
-            reject_reasons.append(f"unresolved refined sugar ingredient: {original}")
+        unresolved = {m.lastgroup for m in _UNRESOLVED_RE.finditer(lower_replaced)}
+        if "gluten" in unresolved and any(exc in lower_replaced for exc in ALLOWED_GLUTEN_EXCEPTIONS):
+            unresolved.discard("gluten")
+        for category, reason in _UNRESOLVED_REASONS.items():
+            if category in unresolved:
+                reject_reasons.append(f"{reason}: {original}")
 
         if replaced != original:
             changed = True
@@ -320,36 +464,52 @@ def apply_policy(ingredients: list[str]) -> tuple[list[str], list[str], list[str
     return new_ing, substitutions, reject_reasons, changed
 
 
+def _keyword_re(*words: str) -> re.Pattern:
+    # Substring semantics, same as any(w in s for w in words), in one scan.
+    return re.compile("|".join(map(re.escape, words)))
+
+
+# First match wins, so the order matters ("peanut butter" is a fat, "egg
+# noodles" a protein).
+_CATEGORY_KEYWORDS: tuple[tuple[str, re.Pattern], ...] = (
+    ("protein", _keyword_re("chicken", "beef", "lamb", "salmon", "shrimp", "fish", "tofu", "egg", "turkey", "tuna", "chickpea", "lentil")),
+    ("grains", _keyword_re("rice", "potato", "quinoa", "oats", "pasta", "sourdough", "tortilla", "bread", "noodle", "plantain")),
+    ("fats", _keyword_re("oil", "butter", "ghee")),
+    ("spices", _keyword_re("salt", "pepper", "paprika", "cumin", "garlic powder", "cinnamon", "oregano", "thyme", "spice")),
+    ("dairy", _keyword_re("milk", "yogurt", "cheese", "cream")),
+    ("sweetener", _keyword_re("syrup", "honey", "monk fruit", "stevia", "agave", "sugar")),
+)
+
+
+@lru_cache(maxsize=4096)
 def guess_category(name: str) -> str:
+    # Runs for every ingredient line; the same names ("salt", "olive oil")
+    # recur across most recipes, hence the cache.
     s = name.lower()
-    if any(x in s for x in ["chicken", "beef", "lamb", "salmon", "shrimp", "fish", "tofu", "egg", "turkey", "tuna", "chickpea", "lentil"]):
-        return "protein"
-    if any(x in s for x in ["rice", "potato", "quinoa", "oats", "pasta", "sourdough", "tortilla", "bread", "noodle", "plantain"]):
-        return "grains"
-    if any(x in s for x in ["oil", "butter", "ghee", "avocado oil", "olive oil"]):
-        return "fats"
-    if any(x in s for x in ["salt", "pepper", "paprika", "cumin", "garlic powder", "cinnamon", "oregano", "thyme", "spice"]):
-        return "spices"
-    if any(x in s for x in ["milk", "yogurt", "cheese", "cream"]):
-        return "dairy"
-    if any(x in s for x in ["syrup", "honey", "monk fruit", "stevia", "agave", "date syrup", "sugar"]):
-        return "sweetener"
+    for category, keywords in _CATEGORY_KEYWORDS:
+        if keywords.search(s):
+            return category
     return "produce"
 
 
+_QUANTITY_LINE_RE = re.compile(r"^(?P<qty>[\d\/\.\s]+)\s+(?P<unit>[a-zA-Z]+)?\s*(?P<name>.*)$")
+_NUMBER_RE = re.compile(r"(\d+(?:\.\d+)?)")
+
+
 def to_ingredient_objs(lines: list[str]) -> list[dict[str, str]]:
+    """Split cleaned ingredient lines (apply_policy output) into quantity,
+    unit and name."""
     out = []
     for line in lines:
-        clean = _clean_ingredient_line(line)
-        m = re.match(r"^([\d\/\.\s]+)\s+([a-zA-Z]+)?\s*(.*)$", clean)
-        if m and len(m.group(3)) > 1:
-            qty = (m.group(1) or "").strip()
-            unit = (m.group(2) or "").strip()
-            name = (m.group(3) or "").strip(", ")
+        m = _QUANTITY_LINE_RE.match(line)
+        if m and len(m["name"]) > 1:
+            qty = m["qty"].strip()
+            unit = m["unit"] or ""
+            name = m["name"].strip(", ")
         else:
             qty = ""
             unit = ""
-            name = clean
+            name = line
         out.append({"name": name, "quantity": qty, "unit": unit, "category": guess_category(name)})
     return out
 
@@ -357,7 +517,7 @@ def to_ingredient_objs(lines: list[str]) -> list[dict[str, str]]:
 def parse_number(v: Any) -> float | None:
     if v is None:
         return None
-    m = re.search(r"(\d+(?:\.\d+)?)", str(v))
+    m = _NUMBER_RE.search(str(v))
     return float(m.group(1)) if m else None
 
 
@@ -714,7 +874,7 @@ def twist_title(original: str) -> str:
 
 def twist_description(original_desc: str, substitutions_count: int) -> str:
     base = (original_desc or "Flavor-forward meal reworked for clean whole-food cooking.").strip()
-    base = re.sub(r"\s+", " ", base)
+    base = " ".join(base.split())
     if substitutions_count > 0:
         return f"{base} Built with smarter whole-food swaps while keeping the original flavor profile."
     return base
@@ -723,7 +883,7 @@ def twist_description(original_desc: str, substitutions_count: int) -> str:
 def twist_steps(steps: list[str]) -> list[str]:
     out: list[str] = []
     for i, step in enumerate(steps, start=1):
-        txt = re.sub(r"\s+", " ", step.strip())
+        txt = " ".join(step.split())
         if txt and not txt.endswith("."):
             txt += "."
         if i == 1:
@@ -774,188 +934,295 @@ class RecipeResult:
     reject_reasons: list[str] = field(default_factory=list)
 
 
-def crawl_recipe_urls(start_url: str, allowed_domain: str, max_pages: int = 400) -> list[str]:
-    queue = [start_url]
-    seen: set[str] = set()
-    recipe_urls: set[str] = set()
+async def crawl_recipe_urls(
+    client: httpx.AsyncClient,
+    start_url: str,
+    allowed_domain: str,
+    max_pages: int = 400,
+    concurrency: int = FETCH_CONCURRENCY,
+) -> dict[str, dict[str, Any] | None]:
+    """Return recipe URL → the recipe node read from it during the crawl,
+    sorted by URL. An empty node means the page had no usable recipe data;
+    None means the crawl could not fetch it, so the import has to."""
+    queue = deque([start_url])
+    # Every URL ever queued, so a link found on many pages is scheduled once.
+    queued: set[str] = {start_url}
+    fetched = 0
+    recipe_urls: dict[str, dict[str, Any] | None] = {}
+    start_node: dict[str, Any] | None = None
+
+    while queue and fetched < max_pages:
+        # Breadth-first in waves: fetch the next URLs off the queue together,
+        # then queue the new links found on each page.
+        wave = [queue.popleft() for _ in range(min(concurrency, max_pages - fetched, len(queue)))]
+        fetched += len(wave)
+
+        for url, page_html in zip(wave, await fetch_many(client, wave)):
+            if isinstance(page_html, BaseException):
+                continue
 
-    while queue and len(seen) < max_pages:
-        url = queue.pop(0)
-        if url in seen:
-            continue
-        seen.add(url)
+            page = parse_page(page_html)
+            # Index pages (the bulk of a crawl) are only read for their links;
+            # the recipe node is looked for on post URLs and the start page.
+            is_post = looks_like_post(url)
+            if is_post or url == start_url:
+                recipe_node = extract_recipe_jsonld(page)
+                is_recipe_page = is_post and (
+                    ("recipe-card-details" in page_html and "recipe-ingredient" in page_html and "recipe-instruction" in page_html)
+                    or bool(recipe_node and recipe_node.get("recipeIngredient"))
+                )
+            else:
+                recipe_node, is_recipe_page = None, False
 
-        try:
-            page_html = fetch_html(url)
-        except Exception:
-            continue
+            if is_recipe_page or url == start_url:
+                node = recipe_node or extract_recipe_fallback(page) or {}
+                if is_recipe_page:
+                    recipe_urls[url] = node
+                else:
+                    # Kept for the start-url fallback below.
+                    start_node = node
 
-        recipe_node = extract_recipe_jsonld(page_html)
-        has_recipe = bool(
-            (recipe_node and recipe_node.get("recipeIngredient"))
-            or ("recipe-card-details" in page_html and "recipe-ingredient" in page_html and "recipe-instruction" in page_html)
-        )
+            for nxt in extract_links(url, page, allowed_domain):
+                if nxt not in queued:
+                    queued.add(nxt)
+                    queue.append(nxt)
 
-        if has_recipe and looks_like_post(url):
-            recipe_urls.add(url)
+    if not recipe_urls and looks_like_post(start_url) and same_domain(start_url, allowed_domain):
+        recipe_urls[start_url] = start_node
 
-        for nxt in extract_links(url, page_html, allowed_domain):
-            if nxt not in seen:
-                queue.append(nxt)
+    return dict(sorted(recipe_urls.items()))
 
-    if not recipe_urls and looks_like_post(start_url) and same_domain(start_url, allowed_domain):
-        recipe_urls.add(start_url)
 
-    return sorted(recipe_urls)
+async def iter_recipe_nodes(
+    client: httpx.AsyncClient, crawled: dict[str, dict[str, Any] | None], concurrency: int = FETCH_CONCURRENCY
+) -> AsyncIterator[tuple[str, dict[str, Any] | None | BaseException]]:
+    """Yield (url, recipe node or fetch exception) in crawl order. Nodes the
+    crawl already extracted are reused; the rest are fetched a wave at a time,
+    one wave ahead of the consumer. Close it (aclosing) when stopping early."""
+    urls = list(crawled)
+    waves = [urls[i:i + concurrency] for i in range(0, len(urls), concurrency)]
 
+    def start_wave(wave: list[str]) -> tuple[list[str], asyncio.Future]:
+        refetch = [u for u in wave if crawled[u] is None]
+        return refetch, asyncio.ensure_future(fetch_many(client, refetch))
 
-def import_recipes(start_url: str, allowed_domain: str, limit: int = 25, max_pages: int = 400) -> tuple[list[RecipeResult], int, int]:
-    init_db()
-    db = SessionLocal()
+    pending = start_wave(waves[0]) if waves else None
+    try:
+        for n, wave in enumerate(waves):
+            refetch, task = pending
+            fetched = dict(zip(refetch, await task))
+            # Start on the next wave before handing this one out, so its
+            # downloads overlap with the caller's processing.
+            pending = start_wave(waves[n + 1]) if n + 1 < len(waves) else None
+            for url in wave:
+                if url not in fetched:
+                    yield url, crawled[url]
+                elif isinstance(fetched[url], BaseException):
+                    yield url, fetched[url]
+                else:
+                    page = parse_page(fetched[url])
+                    yield url, extract_recipe_jsonld(page) or extract_recipe_fallback(page) or {}
+    finally:
+        if pending is not None:
+            pending[1].cancel()
+
+
+def import_recipe_node(db, url: str, node: dict[str, Any], start_url: str) -> tuple[RecipeResult, dict[str, Any] | None]:
+    """Screen and classify one crawled recipe.
+
+    Returns its RecipeResult plus the Recipe column values when it was
+    accepted (None otherwise); import_recipes writes them. Blocking (the MES
+    rescue reads the side library), so it runs in a worker thread while the
+    next wave of pages keeps downloading.
+    """
+    if not node:
+        return RecipeResult(url=url, title=url, accepted=False, reject_reasons=["no recipe data found"]), None
+
+    source_title = html.unescape(str(node.get("name") or "Untitled Recipe")).strip()
+    source_desc = html.unescape(str(node.get("description") or "")).strip()
+    ingredient_lines = [_clean_ingredient_line(x) for x in (node.get("recipeIngredient") or []) if str(x).strip()]
+
+    if not ingredient_lines:
+        return RecipeResult(url=url, title=source_title, accepted=False, reject_reasons=["no ingredients found"]), None
+
+    updated_ingredients, substitutions, reject_reasons, _ = apply_policy(ingredient_lines)
+    if reject_reasons:
+        return RecipeResult(url=url, title=source_title, accepted=False, substitutions=substitutions, reject_reasons=sorted(set(reject_reasons))), None
+
+    steps = parse_instructions(node.get("recipeInstructions"))
+    if not steps:
+        # allow import with generated minimal steps if instructions missing
+        steps = ["Gather ingredients.", "Cook using medium heat until done.", "Serve and enjoy."]
+
+    prep = parse_iso_minutes(node.get("prepTime"))
+    cook = parse_iso_minutes(node.get("cookTime"))
+    total = parse_iso_minutes(node.get("totalTime")) or (prep + cook)
+    servings = parse_yield(node.get("recipeYield"))
+
+    title = twist_title(source_title)
+    description = twist_description(source_desc, len(substitutions))
+    ingredients_obj = to_ingredient_objs(updated_ingredients)
+    steps_twisted = twist_steps(steps)
+    meal_type = infer_meal_type(node, url, source_title)
+    service_tag = infer_service_tag(total, source_title, steps_twisted)
+    dietary_tags = infer_dietary_tags(updated_ingredients)
+    nutrition = build_nutrition(node, updated_ingredients)
+
+    # ── Role classification ──────────────────────────────────
+    role, is_component, is_mes_scoreable = classify_recipe_role(
+        title, meal_type, nutrition
+    )
 
-    results: list[RecipeResult] = []
-    inserted = 0
-    updated = 0
+    # ── MES gate (only for scoreable full meals) ─────────────
+    default_pairing_ids: list[str] = []
+    mes_score = 0.0
+
+    if is_mes_scoreable and role == "full_meal":
+        passes_gate, mes_score = passes_import_gate(nutrition)
+        if not passes_gate:
+            # Attempt MES rescue via side pairing
+            cuisine_hint = infer_cuisine(url, source_title)
+            rescued, rescue_score, pairing_ids = attempt_mes_rescue(
+                nutrition, db, cuisine=cuisine_hint
+            )
+            if rescued:
+                default_pairing_ids = pairing_ids
+                mes_score = rescue_score
+            else:
+                return RecipeResult(
+                    url=url,
+                    title=source_title,
+                    accepted=False,
+                    substitutions=substitutions,
+                    reject_reasons=[
+                        f"MES gate failed: {mes_score} < {MIN_IMPORT_MES} (rescue best: {rescue_score})"
+                    ],
+                ), None
+    elif is_mes_scoreable:
+        # Scoreable component — compute but don't gate
+        _, mes_score = passes_import_gate(nutrition)
+    # Non-scoreable (desserts, sauces, sides) skip MES gate entirely
+
+    benefits = compute_health_benefits(ingredients_obj)
+    protein_type = infer_protein_types(updated_ingredients)
+    carb_type = infer_carb_types(updated_ingredients)
+    flavor_profile = infer_flavor_profile(title, updated_ingredients, steps_twisted)
+    cuisine = infer_cuisine(url, source_title)
+    source_slug = urlparse(start_url).netloc.replace("www.", "").replace(".", "_")
+
+    recipe_payload = {
+        "title": title,
+        "description": description,
+        "ingredients": ingredients_obj,
+        "steps": steps_twisted,
+        "prep_time_min": prep,
+        "cook_time_min": cook,
+        "total_time_min": total,
+        "servings": servings,
+        "nutrition_info": nutrition,
+        "difficulty": "easy" if total <= 30 else ("medium" if total <= 60 else "hard"),
+        "tags": [meal_type, service_tag, f"{source_slug}_import", "whole-food"],
+        "flavor_profile": flavor_profile,
+        "dietary_tags": dietary_tags,
+        "cuisine": cuisine,
+        "health_benefits": benefits,
+        "protein_type": protein_type,
+        "carb_type": carb_type,
+        "is_ai_generated": False,
+        "image_url": (node.get("image")[0] if isinstance(node.get("image"), list) and node.get("image") else (node.get("image") if isinstance(node.get("image"), str) else None)),
+        # ── Composition fields (Phase C) ──
+        "recipe_role": role,
+        "is_component": is_component,
+        "is_mes_scoreable": is_mes_scoreable,
+        "default_pairing_ids": default_pairing_ids,
+        "needs_default_pairing": node.get("needs_default_pairing"),
+    }
 
-    urls = crawl_recipe_urls(start_url=start_url, allowed_domain=allowed_domain, max_pages=max_pages)
+    # ── Taxonomy quality enforcement ─────────────────────────
+    tax_warnings = enforce_taxonomy(recipe_payload, role, updated_ingredients, title)
+    for w in tax_warnings:
+        print(f"  [taxonomy] {w}")
 
-    for url in urls:
-        if inserted >= limit:
-            break
+    return RecipeResult(url=url, title=source_title, accepted=True, substitutions=substitutions), recipe_payload
 
-        try:
-            page_html = fetch_html(url)
-            node = extract_recipe_jsonld(page_html) or extract_recipe_fallback(page_html)
-            if not node:
-                results.append(RecipeResult(url=url, title=url, accepted=False, reject_reasons=["no recipe data found"]))
-                continue
 
-            source_title = html.unescape(str(node.get("name") or "Untitled Recipe")).strip()
-            source_desc = html.unescape(str(node.get("description") or "")).strip()
-            ingredient_lines = [_clean_ingredient_line(x) for x in (node.get("recipeIngredient") or []) if str(x).strip()]
+# Accepted recipes are written (and committed) in batches of this many rows,
+# so an interrupted import keeps everything but the last partial batch.
+IMPORT_BATCH_SIZE = 25
 
-            if not ingredient_lines:
-                results.append(RecipeResult(url=url, title=source_title, accepted=False, reject_reasons=["no ingredients found"]))
-                continue
 
-            updated_ingredients, substitutions, reject_reasons, _ = apply_policy(ingredient_lines)
-            if reject_reasons:
-                results.append(RecipeResult(url=url, title=source_title, accepted=False, substitutions=substitutions, reject_reasons=sorted(set(reject_reasons))))
-                continue
+def write_recipe_rows(db, new_rows: dict[str, dict[str, Any]], changed_rows: dict[str, dict[str, Any]]) -> None:
+    """Insert and update one batch with an executemany each, commit, and
+    empty both dicts."""
+    if new_rows:
+        db.execute(insert(Recipe), list(new_rows.values()))
+    if changed_rows:
+        db.execute(update(Recipe), list(changed_rows.values()))
+    db.commit()
+    new_rows.clear()
+    changed_rows.clear()
 
-            steps = parse_instructions(node.get("recipeInstructions"))
-            if not steps:
-                # allow import with generated minimal steps if instructions missing
-                steps = ["Gather ingredients.", "Cook using medium heat until done.", "Serve and enjoy."]
-
-            prep = parse_iso_minutes(node.get("prepTime"))
-            cook = parse_iso_minutes(node.get("cookTime"))
-            total = parse_iso_minutes(node.get("totalTime")) or (prep + cook)
-            servings = parse_yield(node.get("recipeYield"))
-
-            title = twist_title(source_title)
-            description = twist_description(source_desc, len(substitutions))
-            ingredients_obj = to_ingredient_objs(updated_ingredients)
-            steps_twisted = twist_steps(steps)
-            meal_type = infer_meal_type(node, url, source_title)
-            service_tag = infer_service_tag(total, source_title, steps_twisted)
-            dietary_tags = infer_dietary_tags(updated_ingredients)
-            nutrition = build_nutrition(node, updated_ingredients)
-
-            # ── Role classification ──────────────────────────────────
-            role, is_component, is_mes_scoreable = classify_recipe_role(
-                title, meal_type, nutrition
-            )
 
-            # ── MES gate (only for scoreable full meals) ─────────────
-            default_pairing_ids: list[str] = []
-            mes_score = 0.0
-
-            if is_mes_scoreable and role == "full_meal":
-                passes_gate, mes_score = passes_import_gate(nutrition)
-                if not passes_gate:
-                    # Attempt MES rescue via side pairing
-                    cuisine_hint = infer_cuisine(url, source_title)
-                    rescued, rescue_score, pairing_ids = attempt_mes_rescue(
-                        nutrition, db, cuisine=cuisine_hint
-                    )
-                    if rescued:
-                        default_pairing_ids = pairing_ids
-                        mes_score = rescue_score
-                    else:
-                        results.append(
-                            RecipeResult(
-                                url=url,
-                                title=source_title,
-                                accepted=False,
-                                substitutions=substitutions,
-                                reject_reasons=[
-                                    f"MES gate failed: {mes_score} < {MIN_IMPORT_MES} (rescue best: {rescue_score})"
-                                ],
-                            )
-                        )
-                        continue
-            elif is_mes_scoreable:
-                # Scoreable component — compute but don't gate
-                _, mes_score = passes_import_gate(nutrition)
-            # Non-scoreable (desserts, sauces, sides) skip MES gate entirely
-
-            benefits = compute_health_benefits(ingredients_obj)
-            protein_type = infer_protein_types(updated_ingredients)
-            carb_type = infer_carb_types(updated_ingredients)
-            flavor_profile = infer_flavor_profile(title, updated_ingredients, steps_twisted)
-            cuisine = infer_cuisine(url, source_title)
-            source_slug = urlparse(start_url).netloc.replace("www.", "").replace(".", "_")
-
-            recipe_payload = {
-                "title": title,
-                "description": description,
-                "ingredients": ingredients_obj,
-                "steps": steps_twisted,
-                "prep_time_min": prep,
-                "cook_time_min": cook,
-                "total_time_min": total,
-                "servings": servings,
-                "nutrition_info": nutrition,
-                "difficulty": "easy" if total <= 30 else ("medium" if total <= 60 else "hard"),
-                "tags": [meal_type, service_tag, f"{source_slug}_import", "whole-food"],
-                "flavor_profile": flavor_profile,
-                "dietary_tags": dietary_tags,
-                "cuisine": cuisine,
-                "health_benefits": benefits,
-                "protein_type": protein_type,
-                "carb_type": carb_type,
-                "is_ai_generated": False,
-                "image_url": (node.get("image")[0] if isinstance(node.get("image"), list) and node.get("image") else (node.get("image") if isinstance(node.get("image"), str) else None)),
-                # ── Composition fields (Phase C) ──
-                "recipe_role": role,
-                "is_component": is_component,
-                "is_mes_scoreable": is_mes_scoreable,
-                "default_pairing_ids": default_pairing_ids,
-                "needs_default_pairing": node.get("needs_default_pairing"),
-            }
-
-            # ── Taxonomy quality enforcement ─────────────────────────
-            tax_warnings = enforce_taxonomy(recipe_payload, role, updated_ingredients, title)
-            for w in tax_warnings:
-                print(f"  [taxonomy] {w}")
-
-            existing = db.query(Recipe).filter(Recipe.title == title).first()
-            if existing:
-                for k, v in recipe_payload.items():
-                    setattr(existing, k, v)
-                updated += 1
-            else:
-                db.add(Recipe(id=str(uuid.uuid4()), **recipe_payload))
-                inserted += 1
+async def import_recipes(start_url: str, allowed_domain: str, limit: int = 25, max_pages: int = 400) -> tuple[list[RecipeResult], int, int]:
+    init_db()
+    db = SessionLocal()
+
+    results: list[RecipeResult] = []
+    inserted = 0
+    updated = 0
+    # Recipes are matched on title. Look every existing title up once, then
+    # write rows in batched executemany statements instead of a SELECT plus
+    # INSERT/UPDATE per recipe.
+    recipe_ids: dict[str, str] = dict(db.query(Recipe.title, Recipe.id).all())
+    imported_titles: set[str] = set()
+    new_rows: dict[str, dict[str, Any]] = {}
+    changed_rows: dict[str, dict[str, Any]] = {}
 
-            results.append(RecipeResult(url=url, title=source_title, accepted=True, substitutions=substitutions))
+    try:
+        async with crawler_client() as client:
+            crawled = await crawl_recipe_urls(client, start_url=start_url, allowed_domain=allowed_domain, max_pages=max_pages)
+
+            # Recipes are processed and written one step at a time, so the
+            # session is never shared between threads at once.
+            async with aclosing(iter_recipe_nodes(client, crawled)) as nodes:
+                async for url, node in nodes:
+                    if inserted >= limit:
+                        break
+
+                    try:
+                        if isinstance(node, BaseException):
+                            raise node
+                        result, payload = await asyncio.to_thread(import_recipe_node, db, url, node, start_url)
+                    except Exception as exc:
+                        result, payload = RecipeResult(url=url, title=url, accepted=False, reject_reasons=[f"exception: {exc}"]), None
+
+                    results.append(result)
+                    if payload is None:
+                        continue
+                    title = payload["title"]
+                    if title in recipe_ids:
+                        row = {"id": recipe_ids[title], **payload}
+                        if title in new_rows:
+                            # Inserted earlier in this run and not written yet:
+                            # the later page replaces the pending insert.
+                            new_rows[title] = row
+                        else:
+                            changed_rows[title] = row
+                        # A title repeated within this run is not another update.
+                        if title not in imported_titles:
+                            updated += 1
+                    else:
+                        recipe_ids[title] = str(uuid.uuid4())
+                        new_rows[title] = {"id": recipe_ids[title], **payload}
+                        inserted += 1
+                    imported_titles.add(title)
 
-        except Exception as exc:
-            results.append(RecipeResult(url=url, title=url, accepted=False, reject_reasons=[f"exception: {exc}"]))
+                    if len(new_rows) + len(changed_rows) >= IMPORT_BATCH_SIZE:
+                        await asyncio.to_thread(write_recipe_rows, db, new_rows, changed_rows)
 
-    db.commit()
-    db.close()
+        await asyncio.to_thread(write_recipe_rows, db, new_rows, changed_rows)
+    finally:
+        db.close()
 
     return results, inserted, updated
 
@@ -967,17 +1234,19 @@ def main() -> None:
     parser.add_argument("--limit", type=int, default=25, help="Max accepted recipes to insert")
     parser.add_argument("--max-pages", type=int, default=400, help="Max pages to crawl")
     parser.add_argument("--report", type=str, default="wholefood_site_import_report.json", help="Report JSON path")
+    parser.add_argument("--cache-dir", type=str, default=None, help="Keep fetched pages here and reuse them on reruns")
     args = parser.parse_args()
+    enable_html_cache(args.cache_dir)
 
     parsed = urlparse(args.start_url)
     allowed_domain = args.domain or parsed.netloc.replace("www.", "")
 
-    results, inserted, updated = import_recipes(
+    results, inserted, updated = asyncio.run(import_recipes(
         start_url=args.start_url,
         allowed_domain=allowed_domain,
         limit=args.limit,
         max_pages=args.max_pages,
-    )
+    ))
 
     accepted = [r for r in results if r.accepted]
     rejected = [r for r in results if not r.accepted]
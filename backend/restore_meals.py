@@ -2,8 +2,13 @@
 Restore recipes from seed_meals_backup.json into the database.
 Run:  python restore_meals.py
 """
-import json
-import uuid
+from sqlalchemy import insert, select
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib parser reads the same bytes
+    from json import loads as json_loads
+
 from app.db import SessionLocal, init_db
 from app.models.recipe import Recipe
 
@@ -11,45 +16,66 @@ from app.models.recipe import Recipe
 from app.models import user, meal_plan, recipe, grocery, gamification, saved_recipe, nutrition, local_food  # noqa: F401
 
 
+# Rows per executemany. insertmanyvalues turns each batch into multi-row
+# INSERTs, and only one batch of column dicts is held at a time.
+RESTORE_BATCH_SIZE = 1000
+
+
+# Column → value used when a backup entry lacks it. The shared lists and
+# dicts only ever reach the INSERT, which serializes them; nothing mutates
+# them. Other entry keys (created_at) are not restored.
+_RECIPE_DEFAULTS = dict(
+    description=None,
+    ingredients=[],
+    steps=[],
+    prep_time_min=0,
+    cook_time_min=0,
+    total_time_min=0,
+    servings=1,
+    nutrition_info={},
+    difficulty="easy",
+    tags=[],
+    flavor_profile=[],
+    dietary_tags=[],
+    cuisine="american",
+    health_benefits=[],
+    protein_type=[],
+    carb_type=[],
+    is_ai_generated=True,
+    image_url=None,
+    needs_default_pairing=None,
+)
+_RECIPE_COLUMNS = ("id", "title", *_RECIPE_DEFAULTS)
+
+
+def _recipe_row(entry: dict) -> dict:
+    merged = {**_RECIPE_DEFAULTS, **entry}
+    return {column: merged[column] for column in _RECIPE_COLUMNS}
+
+
 def restore():
     init_db()
     db = SessionLocal()
 
-    with open("seed_meals_backup.json") as f:
-        data = json.load(f)
+    with open("seed_meals_backup.json", "rb") as f:
+        data = json_loads(f.read())
 
-    existing_ids = {r[0] for r in db.query(Recipe.id).all()}
-    added = 0
+    # Ids only, streamed in chunks straight into the set.
+    existing_ids = set(db.scalars(select(Recipe.id).execution_options(yield_per=1000)))
 
+    added = 0
+    batch: list[dict] = []
     for entry in data:
         if entry["id"] in existing_ids:
             continue
-
-        r = Recipe(
-            id=entry["id"],
-            title=entry["title"],
-            description=entry.get("description"),
-            ingredients=entry.get("ingredients", []),
-            steps=entry.get("steps", []),
-            prep_time_min=entry.get("prep_time_min", 0),
-            cook_time_min=entry.get("cook_time_min", 0),
-            total_time_min=entry.get("total_time_min", 0),
-            servings=entry.get("servings", 1),
-            nutrition_info=entry.get("nutrition_info", {}),
-            difficulty=entry.get("difficulty", "easy"),
-            tags=entry.get("tags", []),
-            flavor_profile=entry.get("flavor_profile", []),
-            dietary_tags=entry.get("dietary_tags", []),
-            cuisine=entry.get("cuisine", "american"),
-            health_benefits=entry.get("health_benefits", []),
-            protein_type=entry.get("protein_type", []),
-            carb_type=entry.get("carb_type", []),
-            is_ai_generated=entry.get("is_ai_generated", True),
-            image_url=entry.get("image_url"),
-            needs_default_pairing=entry.get("needs_default_pairing"),
-        )
-        db.add(r)
-        added += 1
+        batch.append(_recipe_row(entry))
+        if len(batch) >= RESTORE_BATCH_SIZE:
+            db.execute(insert(Recipe), batch)
+            added += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(Recipe), batch)
+        added += len(batch)
 
     db.commit()
     total = db.query(Recipe).count()
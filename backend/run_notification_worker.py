@@ -4,7 +4,9 @@ import logging
 
 from app.config import get_settings
 from app.main import _configure_logging, _validate_security_settings
+from app.services.leaderboard import leaderboard_refresh_loop
 from app.services.notifications import notification_scheduler_loop
+from app.services.xp_partitions import xp_partition_maintenance_loop
 
 
 logger = logging.getLogger("wholefoodlabs.notifications.worker")
@@ -18,7 +20,10 @@ async def main() -> None:
         logger.error(json.dumps({"event": "scheduler.disabled"}))
         raise SystemExit("RUN_NOTIFICATION_SCHEDULER must be true for the notification worker.")
     logger.info(json.dumps({"event": "scheduler.worker_started"}))
-    await notification_scheduler_loop()
+    loops = [notification_scheduler_loop(), xp_partition_maintenance_loop()]
+    if settings.run_leaderboard_refresh:
+        loops.append(leaderboard_refresh_loop(settings.leaderboard_refresh_seconds))
+    await asyncio.gather(*loops)
 
 
 if __name__ == "__main__":
@@ -4,7 +4,10 @@ Combines original 150 meals + global cuisine meals.
 Auto-computes health benefits from ingredients.
 Run:  python seed_db.py
 """
-import uuid
+import re
+
+from sqlalchemy import insert
+
 from app.db import SessionLocal, init_db
 from app.models import gamification as _gamification_models  # noqa: F401
 from app.models import grocery as _grocery_models  # noqa: F401
@@ -46,30 +49,48 @@ CARB_KEYWORDS: dict[str, list[str]] = {
 }
 
 # Carb terms that override the "rice" keyword inside noodle/wrapper names
-_NOODLE_HINTS = {"noodle", "vermicelli", "paper", "wrapper"}
+_NOODLE_HINTS = frozenset({"noodle", "vermicelli", "paper", "wrapper"})
+
+
+def _keyword_re(words) -> re.Pattern:
+    # Substring semantics, same as any(w in s for w in words), in one scan.
+    return re.compile("|".join(map(re.escape, words)))
+
+
+# Precompiled once; the classifiers run for every ingredient of every meal.
+_PROTEIN_PATTERNS = tuple((tag, _keyword_re(kws)) for tag, kws in PROTEIN_KEYWORDS.items())
+_CARB_PATTERNS = tuple((tag, _keyword_re(kws)) for tag, kws in CARB_KEYWORDS.items())
+_NOODLE_HINT_RE = _keyword_re(sorted(_NOODLE_HINTS))
+_CARB_CATEGORIES = frozenset({"grains", "produce"})
 
 
-def _classify_proteins(ingredients: list[dict]) -> list[str]:
-    """Return sorted, deduplicated protein_type tags for a recipe."""
+def _ingredient_pairs(ingredients: list[dict]) -> list[tuple[str, str]]:
+    """Lowercased (name, category) pairs, shared by both classifiers."""
+    return list(((ing.get("name") or "").lower(), (ing.get("category") or "").lower()) for ing in ingredients)
+
+
+def _classify_ingredients(ingredients: list[dict]) -> tuple[list[str], list[str]]:
+    """Return sorted, deduplicated (protein_type, carb_type) tags for a recipe."""
+    pairs = _ingredient_pairs(ingredients)
+    return _protein_tags(pairs), _carb_tags(pairs)
+
+
+def _protein_tags(ingredients: list[tuple[str, str]]) -> list[str]:
     tags: set[str] = set()
-    for ing in ingredients:
-        if (ing.get("category") or "").lower() != "protein":
+    for name, cat in ingredients:
+        if cat != "protein":
             continue
-        name = (ing.get("name") or "").lower()
-        for tag, keywords in PROTEIN_KEYWORDS.items():
-            if any(kw in name for kw in keywords):
+        for tag, pattern in _PROTEIN_PATTERNS:
+            if pattern.search(name):
                 tags.add(tag)
     return sorted(tags)
 
 
-def _classify_carbs(ingredients: list[dict]) -> list[str]:
-    """Return sorted, deduplicated carb_type tags for a recipe."""
+def _carb_tags(ingredients: list[tuple[str, str]]) -> list[str]:
     tags: set[str] = set()
-    for ing in ingredients:
-        cat = (ing.get("category") or "").lower()
-        name = (ing.get("name") or "").lower()
+    for name, cat in ingredients:
         # Only consider grains + starchy produce
-        if cat not in ("grains", "produce"):
+        if cat not in _CARB_CATEGORIES:
             continue
         if cat == "produce":
             # Only match explicit starchy produce
@@ -82,11 +103,11 @@ def _classify_carbs(ingredients: list[dict]) -> list[str]:
             continue
         # cat == "grains"
         # Check noodle-like items first to avoid false "rice" match
-        if any(h in name for h in _NOODLE_HINTS):
+        if _NOODLE_HINT_RE.search(name):
             tags.add("noodles")
             continue
-        for tag, keywords in CARB_KEYWORDS.items():
-            if any(kw in name for kw in keywords):
+        for tag, pattern in _CARB_PATTERNS:
+            if pattern.search(name):
                 tags.add(tag)
                 break  # one tag per ingredient
     return sorted(tags)
@@ -168,25 +189,32 @@ CUISINE_DEFAULTS = {
     ],
 }
 
+# Lowercased once; the first cuisine (in dict order) with a matching title
+# keyword wins.
+_CUISINE_PATTERNS = tuple(
+    (cuisine, _keyword_re(kw.lower() for kw in keywords)) for cuisine, keywords in CUISINE_DEFAULTS.items()
+)
+
 
 def _guess_cuisine(title: str) -> str:
     """Match an existing meal title to a cuisine using substring lookup."""
     title_lower = title.lower()
-    for cuisine, keywords in CUISINE_DEFAULTS.items():
-        for kw in keywords:
-            if kw.lower() in title_lower:
-                return cuisine
+    for cuisine, pattern in _CUISINE_PATTERNS:
+        if pattern.search(title_lower):
+            return cuisine
     return "american"
 
 
-def _build_recipe(meal: dict) -> Recipe:
-    health = meal.get("health_benefits") or compute_health_benefits(meal.get("ingredients", []))
+def _build_recipe_row(meal: dict) -> dict:
+    """Recipe column values for a new seeded meal."""
+    ingredients = meal.get("ingredients", [])
+    health = meal.get("health_benefits") or compute_health_benefits(ingredients)
     cuisine = meal.get("cuisine") or _guess_cuisine(meal.get("title", ""))
-    return Recipe(
-        id=str(uuid.uuid4()),
+    protein_type, carb_type = _classify_ingredients(ingredients)
+    return dict(
         title=meal["title"],
         description=meal.get("description", ""),
-        ingredients=meal.get("ingredients", []),
+        ingredients=ingredients,
         steps=meal.get("steps", []),
         prep_time_min=meal.get("prep_time_min", 0),
         cook_time_min=meal.get("cook_time_min", 0),
@@ -200,8 +228,8 @@ def _build_recipe(meal: dict) -> Recipe:
         cuisine=cuisine,
         health_benefits=health,
         is_ai_generated=False,
-        protein_type=_classify_proteins(meal.get("ingredients", [])),
-        carb_type=_classify_carbs(meal.get("ingredients", [])),
+        protein_type=protein_type,
+        carb_type=carb_type,
         needs_default_pairing=meal.get("needs_default_pairing"),
     )
 
@@ -211,32 +239,42 @@ ALL_MEALS = SEED_MEALS + GLOBAL_MEALS
 
 def seed_recipes():
     init_db()
-    db = SessionLocal()
+    # Nothing is read back after the single commit, so don't expire every
+    # loaded row on it. (SessionLocal already has autoflush off.)
+    db = SessionLocal(expire_on_commit=False)
     try:
         added = 0
         updated = 0
         skipped_mes = 0
+        # One query for every seeded title instead of one per meal. Titles are
+        # not unique in the table; like .first(), keep one row per title.
+        existing_by_title: dict[str, Recipe] = {}
+        for row in db.query(Recipe).filter(Recipe.title.in_({m["title"] for m in ALL_MEALS})):
+            existing_by_title.setdefault(row.title, row)
+        new_rows: list[dict] = []
         for meal in ALL_MEALS:
-            existing = db.query(Recipe).filter(Recipe.title == meal["title"]).first()
+            existing = existing_by_title.get(meal["title"])
+            ingredients = meal.get("ingredients", [])
             if existing:
                 needs_update = (
                     not existing.cuisine
                     or existing.cuisine == "american"
                     or not existing.health_benefits
                 )
+                changes: dict = {}
                 if needs_update:
-                    cuisine = meal.get("cuisine") or _guess_cuisine(meal["title"])
-                    benefits = meal.get("health_benefits") or compute_health_benefits(
-                        meal.get("ingredients", [])
-                    )
-                    existing.cuisine = cuisine
-                    existing.health_benefits = benefits
+                    changes["cuisine"] = meal.get("cuisine") or _guess_cuisine(meal["title"])
+                    changes["health_benefits"] = meal.get("health_benefits") or compute_health_benefits(ingredients)
                     if meal.get("nutrition_estimate"):
-                        existing.nutrition_info = meal["nutrition_estimate"]
+                        changes["nutrition_info"] = meal["nutrition_estimate"]
                     updated += 1
                 # Always refresh protein / carb tags
-                existing.protein_type = _classify_proteins(meal.get("ingredients", []))
-                existing.carb_type = _classify_carbs(meal.get("ingredients", []))
+                changes["protein_type"], changes["carb_type"] = _classify_ingredients(ingredients)
+                # Assign only what differs, so rows a reseed leaves unchanged
+                # stay clean and the flush skips them.
+                for field, value in changes.items():
+                    if getattr(existing, field) != value:
+                        setattr(existing, field, value)
                 continue
 
             # MES import gate: skip meals below quality threshold
@@ -245,9 +283,13 @@ def seed_recipes():
                 skipped_mes += 1
                 continue
 
-            db.add(_build_recipe(meal))
+            new_rows.append(_build_recipe_row(meal))
             added += 1
 
+        # New meals go in as one executemany (multi-row INSERTs) without
+        # building ORM objects; changed rows are flushed by the commit.
+        if new_rows:
+            db.execute(insert(Recipe), new_rows)
         db.commit()
         print(f"Seeded {added} new + updated {updated} existing, skipped {skipped_mes} (MES < 75) ({len(ALL_MEALS)} total definitions).")
     finally:
@@ -0,0 +1,25 @@
+import unittest
+
+from app import db as db_module
+
+
+class EngineOptionsTests(unittest.TestCase):
+    def test_postgres_gets_sized_pool_with_pre_ping(self) -> None:
+        options = db_module._engine_options("postgresql://user:pw@localhost/db")
+        self.assertTrue(options["pool_pre_ping"])
+        self.assertEqual(options["pool_size"], db_module.settings.db_pool_size)
+        self.assertEqual(options["max_overflow"], db_module.settings.db_max_overflow)
+
+    def test_sqlite_keeps_driver_pool_defaults(self) -> None:
+        self.assertEqual(
+            db_module._engine_options("sqlite:///local.db"),
+            {"query_cache_size": db_module.settings.db_query_cache_size},
+        )
+
+    def test_statement_cache_is_sized_from_settings(self) -> None:
+        options = db_module._engine_options("postgresql://user:pw@localhost/db")
+        self.assertEqual(options["query_cache_size"], db_module.settings.db_query_cache_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
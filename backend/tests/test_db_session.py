@@ -0,0 +1,85 @@
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import db as db_module
+from app.achievements_engine import award_xp
+from app.db import Base
+from app.models.gamification import XPTransaction
+from app.models.user import User
+
+
+class GetDbTests(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        patcher = mock.patch.object(db_module, "SessionLocal", self.session_factory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        seed = self.session_factory()
+        seed.add(User(id="user-1", email="xp@example.com", name="XP User", xp_points=0))
+        seed.commit()
+        seed.close()
+
+    def _stored_xp(self) -> tuple[int, int]:
+        check = self.session_factory()
+        try:
+            user = check.get(User, "user-1")
+            return user.xp_points, check.query(XPTransaction).count()
+        finally:
+            check.close()
+
+    def test_commits_staged_writes_on_success(self) -> None:
+        gen = db_module.get_db()
+        session = next(gen)
+        award_xp(session, session.get(User, "user-1"), 50, "meal_log", commit=False)
+        award_xp(session, session.get(User, "user-1"), 100, "daily_streak", commit=False)
+        with self.assertRaises(StopIteration):
+            next(gen)
+        self.assertEqual(self._stored_xp(), (150, 2))
+
+    def test_rolls_back_on_exception(self) -> None:
+        gen = db_module.get_db()
+        session = next(gen)
+        award_xp(session, session.get(User, "user-1"), 50, "meal_log", commit=False)
+        with self.assertRaises(RuntimeError):
+            gen.throw(RuntimeError("handler failed"))
+        self.assertEqual(self._stored_xp(), (0, 0))
+
+
+class AwardXPTests(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        seed = self.session_factory()
+        seed.add(User(id="user-1", email="xp@example.com", name="XP User", xp_points=950))
+        seed.commit()
+        seed.close()
+
+    def test_increment_is_applied_in_the_database(self) -> None:
+        first, second = self.session_factory(), self.session_factory()
+        try:
+            stale = second.get(User, "user-1")
+            result = award_xp(first, first.get(User, "user-1"), 100, "meal_log")
+            # A second session holding the old total must not overwrite the first award.
+            award_xp(second, stale, 25, "daily_streak")
+
+            self.assertEqual((result["total_xp"], result["new_level"]), (1050, 2))
+            self.assertEqual(stale.xp_points, 1075)
+            self.assertNotIn(stale, second.dirty)
+        finally:
+            first.close()
+            second.close()
+        check = self.session_factory()
+        self.assertEqual(check.get(User, "user-1").xp_points, 1075)
+        check.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
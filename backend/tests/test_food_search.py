@@ -0,0 +1,48 @@
+import unittest
+
+from app.models import (  # noqa: F401
+    gamification,
+    grocery,
+    meal_plan,
+    metabolic,
+    metabolic_profile,
+    notification,
+    nutrition,
+    recipe,
+    recipe_embedding,
+    saved_recipe,
+    scanned_meal,
+    user,
+)
+from app.models.local_food import LocalFood
+from app.routers.food_db import _matches_query
+
+
+class FoodSearchMatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.food = LocalFood(
+            name="Greek Yogurt",
+            brand="Fage",
+            category="Dairy",
+            aliases=["strained yogurt", "labneh"],
+        )
+
+    def test_matches_name_brand_category_and_alias(self) -> None:
+        for lowered_query in ("greek", "fage", "dairy", "labneh"):
+            with self.subTest(query=lowered_query):
+                self.assertTrue(_matches_query(self.food, lowered_query))
+
+    def test_query_spanning_two_aliases_still_matches(self) -> None:
+        self.assertTrue(_matches_query(self.food, "yogurt labneh"))
+
+    def test_no_match(self) -> None:
+        self.assertFalse(_matches_query(self.food, "salmon"))
+
+    def test_handles_missing_optional_fields(self) -> None:
+        food = LocalFood(name="Apple", brand=None, category=None, aliases=None)
+        self.assertTrue(_matches_query(food, "apple"))
+        self.assertFalse(_matches_query(food, "pear"))
+
+
+if __name__ == "__main__":
+    unittest.main()
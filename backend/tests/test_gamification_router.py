@@ -0,0 +1,290 @@
+import inspect
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import main  # noqa: F401  (registers every model)
+from app.achievements_engine import (
+    check_achievements, invalidate_achievement_definitions, invalidate_total_achievements, total_achievements,
+)
+from app.db import Base
+from app.models.gamification import Achievement, DailyQuest, NutritionStreak, UserAchievement, XPTransaction
+from app.models.nutrition import DailyNutritionSummary
+from app.models.user import User
+from app.routers import gamification
+from app.schemas.gamification import AchievementResponse, DailyQuestResponse, LeaderboardEntry
+from app.services.leaderboard import invalidate_leaderboard_cache
+
+
+class GamificationRouterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+        self.user = User(email="quests@example.com", name="Quest User", xp_points=0)
+        self.other = User(email="other@example.com", name="Other User", xp_points=0)
+        self.db.add_all([self.user, self.other])
+        self.db.commit()
+        invalidate_total_achievements()
+        invalidate_achievement_definitions()
+        self.addCleanup(invalidate_achievement_definitions)
+        gamification._quest_cache.clear()
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_achievements_merge_only_the_current_users_unlocks(self) -> None:
+        first = Achievement(name="First Bite", description="Log a meal", icon="fork", xp_reward=10)
+        second = Achievement(name="Streaker", description="Keep a streak", icon="fire", xp_reward=20)
+        self.db.add_all([first, second])
+        self.db.flush()
+        unlocked_at = datetime(2026, 10, 1, 8, 30)
+        self.db.add_all([
+            UserAchievement(user_id=self.user.id, achievement_id=first.id, unlocked_at=unlocked_at),
+            UserAchievement(user_id=self.other.id, achievement_id=second.id, unlocked_at=unlocked_at),
+        ])
+        self.db.commit()
+
+        result = gamification.get_achievements(current_user=self.user, db=self.db)
+
+        by_name = {a["name"]: a for a in result}
+        self.assertEqual(len(result), 2)
+        self.assertTrue(by_name["First Bite"]["unlocked"])
+        self.assertEqual(by_name["First Bite"]["unlocked_at"], unlocked_at.isoformat())
+        self.assertFalse(by_name["Streaker"]["unlocked"])
+        self.assertIsNone(by_name["Streaker"]["unlocked_at"])
+
+    def test_leaderboard_ranks_and_levels(self) -> None:
+        self.user.xp_points = 2500
+        self.other.xp_points = 900
+        self.db.commit()
+        invalidate_leaderboard_cache()
+
+        result = gamification.get_leaderboard(db=self.db, current_user=self.user)
+
+        self.assertEqual([(e["rank"], e["name"], e["level"]) for e in result], [(1, "Quest User", 3), (2, "Other User", 1)])
+        self.assertEqual(result[0]["level_title"], gamification.level_title(3))
+
+    def test_weekly_stats_aggregates_recent_transactions(self) -> None:
+        now = datetime.utcnow()
+        self.db.add_all([
+            XPTransaction(user_id=self.user.id, amount=50, reason="meal_log", created_at=now),
+            XPTransaction(user_id=self.user.id, amount=30, reason="Cooked dinner", created_at=now),
+            XPTransaction(user_id=self.user.id, amount=10, reason="explore_cuisine", created_at=now),
+            XPTransaction(user_id=self.user.id, amount=5, reason="daily_streak", created_at=now),
+            XPTransaction(user_id=self.user.id, amount=999, reason="meal_log", created_at=now - timedelta(days=9)),
+            XPTransaction(user_id=self.other.id, amount=999, reason="meal_log", created_at=now),
+        ])
+        self.db.commit()
+
+        result = gamification.get_weekly_stats(current_user=self.user, db=self.db, now=datetime.utcnow())
+
+        self.assertEqual(
+            result,
+            {"meals_cooked": 2, "recipes_saved": 0, "foods_explored": 1, "meals_logged": 0, "xp_earned": 95},
+        )
+
+    def test_weekly_stats_without_activity_is_all_zero(self) -> None:
+        result = gamification.get_weekly_stats(current_user=self.user, db=self.db, now=datetime.utcnow())
+        self.assertEqual(set(result.values()), {0})
+
+    def test_stats_counts_unlocks_and_nutrition_streak(self) -> None:
+        achievements = [Achievement(name=f"A{i}", description="d") for i in range(3)]
+        self.db.add_all(achievements)
+        self.db.flush()
+        self.db.add(UserAchievement(user_id=self.user.id, achievement_id=achievements[0].id))
+        self.db.add(UserAchievement(user_id=self.other.id, achievement_id=achievements[1].id))
+        self.db.add(NutritionStreak(user_id=self.user.id, current_streak=4, longest_streak=7))
+        self.user.xp_points = 1200
+        self.db.commit()
+
+        stats = gamification.get_stats(current_user=self.user, db=self.db)
+
+        self.assertEqual((stats.total_achievements, stats.achievements_unlocked), (3, 1))
+        self.assertEqual((stats.nutrition_streak, stats.nutrition_longest_streak), (4, 7))
+        self.assertEqual((stats.level, stats.xp_to_next_level), (2, 800))
+
+    def test_stats_without_nutrition_streak_defaults_to_zero(self) -> None:
+        stats = gamification.get_stats(current_user=self.other, db=self.db)
+        self.assertEqual((stats.nutrition_streak, stats.nutrition_longest_streak), (0, 0))
+
+    def test_total_achievements_is_cached_until_invalidated(self) -> None:
+        self.db.add(Achievement(name="Cached", description="d"))
+        self.db.commit()
+        self.assertEqual(total_achievements(self.db), 1)
+
+        self.db.add(Achievement(name="Later", description="d"))
+        self.db.commit()
+        self.assertEqual(total_achievements(self.db), 1)
+        invalidate_total_achievements()
+        self.assertEqual(total_achievements(self.db), 2)
+
+    def test_score_history_tiers_include_boundaries(self) -> None:
+        today = datetime.utcnow().date()
+        scores = [None, 59.9, 60, 74.96, 75, 90, 97.25]
+        for offset, score in enumerate(scores):
+            self.db.add(DailyNutritionSummary(
+                user_id=self.user.id, date=today - timedelta(days=len(scores) - offset), daily_score=score,
+            ))
+        self.db.commit()
+
+        history = gamification.get_score_history(days=30, current_user=self.user, db=self.db, now=datetime.utcnow())
+
+        self.assertEqual(
+            [(h["score"], h["tier"]) for h in history],
+            [(0.0, "none"), (59.9, "none"), (60.0, "bronze"), (75.0, "bronze"),
+             (75.0, "silver"), (90.0, "gold"), (97.2, "gold")],
+        )
+
+    def test_daily_quests_are_generated_once_per_day(self) -> None:
+        first = gamification.get_daily_quests(current_user=self.user, db=self.db, now=datetime.utcnow())
+        second = gamification.get_daily_quests(current_user=self.user, db=self.db, now=datetime.utcnow())
+
+        self.assertEqual(
+            sorted(q["quest_type"] for q in first), ["general", "logging", "metabolic", "quality"]
+        )
+        self.assertEqual(sorted(q["id"] for q in first), sorted(q["id"] for q in second))
+        self.assertEqual(self.db.query(DailyQuest).filter(DailyQuest.user_id == self.user.id).count(), 4)
+
+    def test_daily_quests_cache_is_dropped_on_progress(self) -> None:
+        quests = gamification.get_daily_quests(current_user=self.user, db=self.db, now=datetime.utcnow())
+        self.assertIs(gamification.get_daily_quests(current_user=self.user, db=self.db, now=datetime.utcnow()), quests)
+
+        gamification.update_quest_progress(quest_id=quests[0]["id"], amount=1.0, current_user=self.user, db=self.db, now=datetime.utcnow())
+
+        refreshed = {q["id"]: q for q in gamification.get_daily_quests(current_user=self.user, db=self.db, now=datetime.utcnow())}
+        self.assertEqual(refreshed[quests[0]["id"]]["current_value"], 1.0)
+
+    def test_quest_cache_is_dropped_after_the_progress_commit(self) -> None:
+        now = datetime.utcnow()
+        quests = gamification.get_daily_quests(current_user=self.user, db=self.db, now=now)
+        key = (str(self.user.id), now.date())
+        commit = self.db.commit
+
+        def commit_while_a_read_recaches() -> None:
+            # A concurrent GET that read the pre-update rows re-caches them
+            # before this request's commit lands.
+            gamification._store_quests(key, quests)
+            commit()
+
+        with mock.patch.object(self.db, "commit", side_effect=commit_while_a_read_recaches):
+            gamification.update_quest_progress(quest_id=quests[0]["id"], amount=1.0, current_user=self.user, db=self.db, now=now)
+
+        self.assertNotIn(key, gamification._quest_cache)
+
+    def test_quest_progress_completes_once_and_awards_xp_once(self) -> None:
+        now = datetime.utcnow()
+        quest = DailyQuest(
+            user_id=self.user.id, date=now.date(), quest_type="logging", title="Log All 3 Meals",
+            target_value=3.0, current_value=0, xp_reward=60, completed=False,
+        )
+        self.db.add(quest)
+        self.db.commit()
+
+        def tick(amount: float) -> dict:
+            return gamification.update_quest_progress(
+                quest_id=quest.id, amount=amount, current_user=self.user, db=self.db, now=now,
+            )
+
+        self.assertEqual(tick(1.0), {"quest_id": quest.id, "current_value": 1.0, "completed": False, "xp_gained": 0})
+        completed = tick(5.0)
+        self.assertEqual(completed, {"quest_id": quest.id, "current_value": 3.0, "completed": True, "xp_gained": 60})
+        self.assertIs(completed["completed"], True)
+        self.assertEqual(tick(1.0), {"message": "Already completed", "xp_gained": 0})
+        self.assertEqual(
+            gamification.update_quest_progress(quest_id="missing", current_user=self.user, db=self.db, now=now),
+            {"error": "Quest not found"},
+        )
+
+        self.db.refresh(quest)
+        self.db.refresh(self.user)
+        self.assertEqual(quest.completed_at, now)
+        self.assertEqual(self.user.xp_points, 60)
+        self.assertEqual(self.db.query(XPTransaction).filter(XPTransaction.reason.like("quest:%")).count(), 1)
+
+    def test_quest_seed_is_stable_per_user_and_day(self) -> None:
+        day = datetime(2026, 10, 15).date()
+        self.assertEqual(gamification._quest_seed("u1", day), gamification._quest_seed("u1", day))
+        self.assertNotEqual(gamification._quest_seed("u1", day), gamification._quest_seed("u2", day))
+        self.assertNotEqual(
+            gamification._quest_seed("u1", day), gamification._quest_seed("u1", day + timedelta(days=1))
+        )
+
+    def test_list_endpoints_match_their_documented_schemas(self) -> None:
+        self.db.add(Achievement(name="Documented", description="d", icon="star", xp_reward=5, category="general"))
+        self.db.commit()
+        invalidate_leaderboard_cache()
+        now = datetime.utcnow()
+        payloads = {
+            "achievements": (gamification.get_achievements(current_user=self.user, db=self.db), AchievementResponse),
+            "leaderboard": (gamification.get_leaderboard(db=self.db, current_user=self.user), LeaderboardEntry),
+            "daily-quests": (gamification.get_daily_quests(current_user=self.user, db=self.db, now=now), DailyQuestResponse),
+        }
+        for name, (payload, schema) in payloads.items():
+            with self.subTest(endpoint=name):
+                self.assertTrue(payload)
+                for entry in payload:
+                    self.assertEqual(schema.model_validate(entry).model_dump(), entry)
+
+    def test_handlers_run_in_the_threadpool(self) -> None:
+        # The handlers use a blocking Session; async def would run them on the event loop.
+        for route in gamification.router.routes:
+            self.assertFalse(inspect.iscoroutinefunction(route.endpoint), route.path)
+
+
+class CheckAchievementsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)()
+        self.user = User(email="achiever@example.com", name="Achiever", xp_points=0)
+        self.db.add(self.user)
+        for name, ctype, target in [
+            ("First Healthify", "healthify_count", 1),
+            ("Healthify Regular", "healthify_count", 10),
+            ("Recipe Collector", "saved_recipe_count", 5),
+            ("Already Earned", "healthify_count", 1),
+        ]:
+            self.db.add(
+                Achievement(name=name, description=name, icon="star", xp_reward=10, criteria={"type": ctype, "target": target})
+            )
+        self.db.flush()
+        earned = self.db.query(Achievement).filter(Achievement.name == "Already Earned").one()
+        self.db.add(UserAchievement(user_id=self.user.id, achievement_id=earned.id))
+        self.db.add(XPTransaction(user_id=self.user.id, amount=5, reason="healthify:soup"))
+        self.db.commit()
+        invalidate_achievement_definitions()
+        self.addCleanup(invalidate_achievement_definitions)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_unlocks_with_each_count_queried_once(self) -> None:
+        statements: list[str] = []
+        record = lambda *args: statements.append(args[2])
+        event.listen(self.engine, "before_cursor_execute", record)
+        try:
+            unlocked = check_achievements(self.db, self.user, {"saved_recipe_count": 5})
+        finally:
+            event.remove(self.engine, "before_cursor_execute", record)
+
+        self.assertEqual(sorted(a["name"] for a in unlocked), ["First Healthify", "Recipe Collector"])
+        self.assertEqual(sum("xp_transactions" in sql and "count" in sql.lower() for sql in statements), 1)
+        self.assertFalse(any("saved_recipes" in sql for sql in statements))
+
+    def test_definitions_are_reused_between_calls(self) -> None:
+        check_achievements(self.db, self.user, {"saved_recipe_count": 0})
+        self.db.add(Achievement(name="Late", description="Late", icon="star", xp_reward=1, criteria={"type": "level", "target": 1}))
+        self.db.commit()
+
+        self.assertEqual(check_achievements(self.db, self.user, {"saved_recipe_count": 0}), [])
+        invalidate_achievement_definitions()
+        self.assertEqual([a["name"] for a in check_achievements(self.db, self.user, {"saved_recipe_count": 0})], ["Late"])
+
+
+if __name__ == "__main__":
+    unittest.main()
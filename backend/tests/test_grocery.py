@@ -0,0 +1,111 @@
+import unittest
+
+from app import main  # noqa: F401  (registers every model)
+from app.models.meal_plan import MealPlan, MealPlanItem
+from app.routers.grocery import extract_grocery_items
+from app.services.grocery_items import infer_category, normalize_ingredients, parse_quantity
+
+
+class InferCategoryTests(unittest.TestCase):
+    def test_categories(self) -> None:
+        cases = {
+            "Chicken thighs": "protein",
+            "chicken broth": "protein",
+            "Greek yogurt": "dairy",
+            "goat cheese": "dairy",
+            "rolled oats": "grains",
+            "smoked paprika": "spices",
+            "garlic powder": "spices",
+            "olive oil": "pantry",
+            "canned tomatoes": "pantry",
+            "black beans, canned": "protein",
+            "pecans": "pantry",
+            "spinach": "produce",
+            "": "produce",
+            None: "produce",
+        }
+        for name, expected in cases.items():
+            with self.subTest(name=name):
+                self.assertEqual(infer_category(name), expected)
+
+
+class ExtractGroceryItemsTests(unittest.TestCase):
+    def test_prenormalized_and_legacy_items_merge_the_same_way(self) -> None:
+        recipe = {"ingredients": ["Spinach", {"name": "olive oil", "quantity": "2", "unit": "tbsp"}]}
+        plan = MealPlan(items=[
+            MealPlanItem(recipe_data=recipe, normalized_ingredients=normalize_ingredients(recipe)),
+            MealPlanItem(recipe_data=recipe, normalized_ingredients=None),
+        ])
+
+        items = {i["name"]: i for i in extract_grocery_items(plan)}
+
+        self.assertEqual(items["Spinach"]["quantity"], "2")
+        self.assertEqual(items["Spinach"]["category"], "produce")
+        self.assertEqual((items["Olive Oil"]["quantity"], items["Olive Oil"]["category"]), ("4", "pantry"))
+
+    def test_stored_normalization_is_used_as_is(self) -> None:
+        plan = MealPlan(items=[MealPlanItem(
+            recipe_data={"ingredients": ["ignored"]},
+            normalized_ingredients=[{"name": "kale", "quantity": "1", "unit": "bunch", "category": "produce", "checked": False}],
+        )])
+        self.assertEqual([i["name"] for i in extract_grocery_items(plan)], ["Kale"])
+
+    def test_quantities_sum_per_unit(self) -> None:
+        recipe_a = {"ingredients": [
+            {"name": "Rice", "quantity": "2 cups", "unit": "cup"},
+            {"name": "salt", "quantity": "a pinch"},
+            {"name": "Lemon", "quantity": "1/2"},
+        ]}
+        recipe_b = {"ingredients": [
+            {"name": "rice", "quantity": "1.5", "unit": "cup"},
+            {"name": "rice", "quantity": "200", "unit": "g"},
+            {"name": "Salt", "quantity": "1", "unit": ""},
+            {"name": "lemon", "quantity": "1/2"},
+        ]}
+        plan = MealPlan(items=[MealPlanItem(recipe_data=recipe_a), MealPlanItem(recipe_data=recipe_b)])
+
+        items = {(i["name"], i["unit"]): i["quantity"] for i in extract_grocery_items(plan)}
+
+        self.assertEqual(items, {
+            ("Rice", "cup"): "3.5",
+            ("Rice", "g"): "200",
+            ("Salt", ""): "1 + a pinch",
+            ("Lemon", ""): "1",
+        })
+
+    def test_mixed_numbers_unicode_fractions_and_ranges(self) -> None:
+        recipe_a = {"ingredients": [
+            {"name": "milk", "quantity": "1 1/2", "unit": "cup"},
+            {"name": "butter", "quantity": "½", "unit": "tbsp"},
+            {"name": "garlic", "quantity": "1-2", "unit": "cloves"},
+        ]}
+        recipe_b = {"ingredients": [
+            {"name": "milk", "quantity": "1/2", "unit": "cup"},
+            {"name": "butter", "quantity": "1½", "unit": "tbsp"},
+            {"name": "garlic", "quantity": "2", "unit": "cloves"},
+        ]}
+        plan = MealPlan(items=[MealPlanItem(recipe_data=recipe_a), MealPlanItem(recipe_data=recipe_b)])
+
+        items = {i["name"]: i["quantity"] for i in extract_grocery_items(plan)}
+
+        self.assertEqual(items, {"Milk": "2", "Butter": "2", "Garlic": "2 + 1-2"})
+
+    def test_single_occurrence_keeps_its_wording(self) -> None:
+        plan = MealPlan(items=[MealPlanItem(recipe_data={"ingredients": [{"name": "thyme", "quantity": "a few sprigs"}]})])
+        self.assertEqual(extract_grocery_items(plan)[0]["quantity"], "a few sprigs")
+
+
+class ParseQuantityTests(unittest.TestCase):
+    def test_parse(self) -> None:
+        cases = {
+            "2 cups": 2.0, "1.5": 1.5, "1/2": 0.5, " 3 / 4 tsp": 0.75, "1 1/2 cups": 1.5, "½": 0.5,
+            "1½": 1.5, "2 ¾ oz": 2.75, "2 tomatoes": 2.0, "1-2": None, "2 – 3": None, "2 to 3 cups": None,
+            "a pinch": None, "": None, "1/0": None, "1 1/0": None,
+        }
+        for raw, expected in cases.items():
+            with self.subTest(raw=raw):
+                self.assertEqual(parse_quantity(raw), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
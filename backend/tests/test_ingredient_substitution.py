@@ -0,0 +1,54 @@
+import unittest
+
+from app.services.ingredient_substitution import deterministic_substitute
+
+
+class DeterministicSubstituteTests(unittest.TestCase):
+    def substitute(self, ingredients: list[str], **prefs) -> dict:
+        recipe = {"title": "Dish", "ingredients": [{"name": name, "quantity": "1"} for name in ingredients]}
+        return deterministic_substitute(
+            recipe=recipe,
+            allergies=prefs.get("allergies", []),
+            disliked_ingredients=prefs.get("disliked_ingredients", []),
+            liked_proteins=prefs.get("liked_proteins", []),
+            disliked_proteins=prefs.get("disliked_proteins", []),
+            custom_excludes=prefs.get("custom_excludes"),
+        )
+
+    def test_allergy_terms_keep_keyword_order_precedence(self) -> None:
+        # "cashew" precedes "nut" in the nuts keyword list, so it picks the swap.
+        result = self.substitute(["Cashew nut butter", "Peanut sauce"], allergies=["nuts"])
+        self.assertEqual(
+            [ing["name"] for ing in result["modified_recipe"]["ingredients"]],
+            ["sunflower seed", "ingredient alternative"],
+        )
+        self.assertEqual({swap["reason"] for swap in result["swaps"]}, {"allergy-safe substitution"})
+
+    def test_categories_apply_in_order_and_untouched_ingredients_pass_through(self) -> None:
+        result = self.substitute(
+            ["Kale", "Chicken thigh", "Rice"],
+            disliked_ingredients=["kale"],
+            liked_proteins=["tofu"],
+            disliked_proteins=["Chicken"],
+        )
+        ingredients = result["modified_recipe"]["ingredients"]
+        self.assertEqual([ing["name"] for ing in ingredients], ["spinach", "tofu", "Rice"])
+        self.assertEqual(ingredients[0]["quantity"], "1")
+        self.assertEqual([swap["reason"] for swap in result["swaps"]], ["based on your dislikes", "based on your protein preferences"])
+
+    def test_input_recipe_is_not_mutated(self) -> None:
+        recipe = {"title": "Dish", "steps": ["cook"], "ingredients": [{"name": "Kale"}, {"name": "Rice"}]}
+        result = deterministic_substitute(recipe, [], ["kale"], [], [])
+
+        self.assertEqual(recipe["ingredients"], [{"name": "Kale"}, {"name": "Rice"}])
+        self.assertEqual(result["modified_recipe"]["ingredients"], [{"name": "spinach"}, {"name": "Rice"}])
+        self.assertEqual(result["modified_recipe"]["steps"], ["cook"])
+
+    def test_no_preferences_changes_nothing(self) -> None:
+        result = self.substitute(["Salmon", "Lemon"])
+        self.assertEqual(result["swaps"], [])
+        self.assertEqual([ing["name"] for ing in result["modified_recipe"]["ingredients"]], ["Salmon", "Lemon"])
+
+
+if __name__ == "__main__":
+    unittest.main()
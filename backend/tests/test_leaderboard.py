@@ -0,0 +1,96 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import main
+from app.db import Base
+from app.models.user import User
+from app.services import leaderboard
+
+
+class FetchLeaderboardTests(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        for i in range(25):
+            self.db.add(User(email=f"u{i}@example.com", name=f"User {i}", xp_points=i * 10, current_streak=i))
+        self.db.commit()
+        leaderboard.invalidate_leaderboard_cache()
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_sqlite_uses_live_users_query(self) -> None:
+        self.assertFalse(leaderboard.leaderboard_view_available(self.db))
+        rows = leaderboard.fetch_leaderboard(self.db)
+        self.assertEqual(len(rows), leaderboard.LEADERBOARD_SIZE)
+        self.assertEqual(rows[0].name, "User 24")
+        self.assertEqual([r.xp_points for r in rows], sorted((r.xp_points for r in rows), reverse=True))
+
+    def test_snapshot_is_reused_within_refresh_interval(self) -> None:
+        first = leaderboard.fetch_leaderboard(self.db)
+        self.db.add(User(email="late@example.com", name="Late User", xp_points=10_000))
+        self.db.commit()
+
+        self.assertIs(leaderboard.fetch_leaderboard(self.db), first)
+        leaderboard.invalidate_leaderboard_cache()
+        self.assertEqual(leaderboard.fetch_leaderboard(self.db)[0].name, "Late User")
+
+    def test_missing_view_is_reprobed_after_refresh_interval(self) -> None:
+        db = mock.Mock()
+        db.get_bind.return_value.dialect.name = "postgresql"
+        db.execute.return_value.first.side_effect = [None, (1,)]
+        interval = leaderboard.get_settings().leaderboard_refresh_seconds
+        clock = mock.patch.object(leaderboard.time, "monotonic")
+        with mock.patch.object(leaderboard, "_view_available", False), \
+                mock.patch.object(leaderboard, "_view_probed_at", None), \
+                clock as monotonic:
+            monotonic.return_value = 100.0
+            self.assertFalse(leaderboard.leaderboard_view_available(db))
+            monotonic.return_value = 100.0 + interval / 2
+            self.assertFalse(leaderboard.leaderboard_view_available(db))
+            self.assertEqual(db.execute.call_count, 1)
+
+            monotonic.return_value = 100.0 + interval
+            self.assertTrue(leaderboard.leaderboard_view_available(db))
+            self.assertTrue(leaderboard.leaderboard_view_available(db))
+            self.assertEqual(db.execute.call_count, 2)
+
+
+class LifespanLeaderboardTaskTests(unittest.TestCase):
+    def _run_lifespan(self, enabled: bool) -> list[str]:
+        events: list[str] = []
+
+        async def fake_loop(poll_seconds: int) -> None:
+            events.append(f"started:{poll_seconds}")
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                events.append("cancelled")
+                raise
+
+        async def run() -> None:
+            async with main.lifespan(main.app):
+                await asyncio.sleep(0)
+
+        with mock.patch.object(main, "leaderboard_refresh_loop", fake_loop), \
+                mock.patch.object(main.settings, "run_leaderboard_refresh", enabled), \
+                mock.patch.object(main.settings, "run_notification_scheduler", False):
+            asyncio.run(run())
+        return events
+
+    def test_task_started_and_cancelled_when_enabled(self) -> None:
+        events = self._run_lifespan(True)
+        self.assertEqual(events, [f"started:{main.settings.leaderboard_refresh_seconds}", "cancelled"])
+
+    def test_task_not_started_when_disabled(self) -> None:
+        self.assertEqual(self._run_lifespan(False), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import asyncio
+import unittest
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import main  # noqa: F401  (registers every model)
+from app.db import Base
+from app.models.meal_plan import MealPlan, MealPlanItem
+from app.models.user import User
+from app.routers import meal_plan
+from app.schemas.meal_plan import MealPlanGenerate, MealPlanPreferences
+
+
+class PlanHistoryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)()
+        self.user = User(email="plans@example.com", name="Plan User")
+        self.db.add(self.user)
+        self.db.flush()
+        for week in range(3):
+            plan = MealPlan(
+                user_id=self.user.id,
+                week_start=date(2026, 9, 7) + timedelta(weeks=week),
+                created_at=datetime(2026, 9, 7) + timedelta(weeks=week),
+            )
+            plan.items = [
+                MealPlanItem(day_of_week="Monday", meal_type=meal_type, recipe_data={"title": meal_type})
+                for meal_type in ("breakfast", "lunch", "dinner")
+            ]
+            self.db.add(plan)
+        self.db.commit()
+        user_id = self.user.id
+        self.db.expunge_all()
+        self.user = self.db.get(User, user_id)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_history_loads_items_without_per_plan_queries(self) -> None:
+        item_selects: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            if statement.lstrip().upper().startswith("SELECT") and "FROM meal_plan_items" in statement:
+                item_selects.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        plans = asyncio.run(meal_plan.get_plan_history(current_user=self.user, db=self.db))
+
+        self.assertEqual([p.week_start for p in plans], ["2026-09-21", "2026-09-14", "2026-09-07"])
+        self.assertTrue(all(len(p.items) == 3 for p in plans))
+        self.assertEqual(len(item_selects), 1)
+
+    def test_generate_persists_every_meal(self) -> None:
+        generated = {
+            "days": [
+                {"day": day, "meals": [
+                    {"meal_type": "lunch", "category": "quick", "recipe": {"title": f"{day} lunch"}},
+                    {"meal_type": "dinner", "is_bulk_cook": True, "servings": 4, "recipe": {"title": f"{day} dinner"}},
+                ]}
+                for day in ("Monday", "Tuesday")
+            ],
+            "warnings": [],
+        }
+        request = MealPlanGenerate(week_start=date(2026, 10, 12), preferences=MealPlanPreferences(household_size=2))
+
+        with mock.patch.object(meal_plan, "generate_fallback_meal_plan", return_value=generated):
+            plan = asyncio.run(meal_plan.generate_meal_plan(request=request, current_user=self.user, db=self.db))
+
+        self.assertEqual(len(plan.items), 4)
+        stored = self.db.query(MealPlanItem).join(MealPlan).filter(MealPlan.id == plan.id).all()
+        self.assertEqual(
+            sorted((i.day_of_week, i.meal_type, i.servings, i.is_bulk_cook) for i in stored),
+            [("Monday", "dinner", 4, True), ("Monday", "lunch", 2, False),
+             ("Tuesday", "dinner", 4, True), ("Tuesday", "lunch", 2, False)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
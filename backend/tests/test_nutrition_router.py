@@ -0,0 +1,460 @@
+import asyncio
+import unittest
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from fastapi import BackgroundTasks, HTTPException, Request, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import main  # noqa: F401  (registers every model)
+from app.db import Base
+from app.models.local_food import LocalFood
+from app.models.metabolic import MetabolicScore
+from app.models.nutrition import DailyNutritionSummary, FoodLog, NutritionTarget
+from app.models.recipe import Recipe
+from app.models.scanned_meal import ScannedMealLog
+from app.models.gamification import XPTransaction
+from app.models.user import User
+from app.routers import nutrition
+from app.schemas.nutrition import FoodLogCreate, FoodLogUpdate
+
+
+class NutritionRouterTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)()
+        self.user = User(email="nutrition@example.com", name="Nutrition User")
+        self.db.add(self.user)
+        self.db.flush()
+        self.db.add(
+            NutritionTarget(
+                user_id=self.user.id,
+                calories_target=2000,
+                protein_g_target=100,
+                carbs_g_target=200,
+                fat_g_target=50,
+                fiber_g_target=25,
+                micronutrient_targets={"iron_mg": 10, "vitamin_c_mg": 100},
+            )
+        )
+        self.day = date(2026, 10, 14)
+        self.db.commit()
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def targets_for(self, user: User) -> NutritionTarget:
+        return nutrition._get_or_create_targets(self.db, user.id)
+
+    def add_log(self, snapshot: dict, day: date | None = None) -> FoodLog:
+        log = FoodLog(user_id=self.user.id, date=day or self.day, title="Meal", nutrition_snapshot=snapshot)
+        self.db.add(log)
+        self.db.commit()
+        return log
+
+
+class ScaledNutritionTests(unittest.TestCase):
+    def test_scales_every_numeric_key(self) -> None:
+        scaled = nutrition._scaled_nutrition({"calories": 100, "sugar_g": 2.5, "custom_mg": 1}, 2)
+        self.assertEqual(scaled, {"calories": 200.0, "sugar_g": 5.0, "custom_mg": 2.0})
+
+    def test_parses_strings_and_skips_unusable_values(self) -> None:
+        scaled = nutrition._scaled_nutrition({"calories": "150", "protein": None, "note": "n/a", "fat": 4}, 0.5)
+        self.assertEqual(scaled, {"calories": 75.0, "fat": 2.0})
+
+    def test_empty_payload(self) -> None:
+        self.assertEqual(nutrition._scaled_nutrition(None, 3), {})
+
+
+class ParseDateTests(unittest.TestCase):
+    def test_plain_date(self) -> None:
+        self.assertEqual(nutrition._parse_date("2026-10-14"), date(2026, 10, 14))
+
+    def test_timestamp_is_truncated_to_its_date(self) -> None:
+        self.assertEqual(nutrition._parse_date("2026-10-14T23:30:00"), date(2026, 10, 14))
+
+    def test_missing_value_defaults_to_utc_today(self) -> None:
+        self.assertEqual(nutrition._parse_date(None), datetime.utcnow().date())
+
+    def test_garbage_is_a_400(self) -> None:
+        with self.assertRaises(HTTPException) as ctx:
+            nutrition._parse_date("yesterday")
+        self.assertEqual(ctx.exception.status_code, 400)
+
+
+class ComputeDailyTests(NutritionRouterTestCase):
+    def test_sums_macros_and_micros_in_one_query(self) -> None:
+        self.add_log({"calories": 500, "protein": 30, "carbs_g": 40, "fat": 0, "fat_g": 10, "iron_mg": 2.5})
+        self.add_log({"calories": "250", "protein_g": 20, "fiber": 5, "vitamin_c_mg": 60})
+        self.add_log({"calories": 900}, day=date(2026, 10, 13))
+        self.add_log({})
+
+        log_selects: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            if statement.lstrip().upper().startswith("SELECT") and "FROM food_logs" in statement:
+                log_selects.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        totals, comparison, score = nutrition._compute_daily(self.db, self.user.id, self.day)
+
+        self.assertEqual(totals, {"calories": 750.0, "protein": 50.0, "carbs": 40.0, "fat": 10.0, "fiber": 5.0})
+        self.assertEqual(comparison["iron_mg"]["consumed"], 2.5)
+        self.assertEqual(comparison["vitamin_c_mg"]["pct"], 60.0)
+        self.assertEqual(comparison["protein"]["pct"], 50.0)
+        # macros avg (50+20+20+20)/4 * 0.6 + micros avg (25+60)/2 * 0.4
+        self.assertEqual(score, 33.5)
+        self.assertEqual(len(log_selects), 1)
+
+        summary = self.db.query(DailyNutritionSummary).filter_by(user_id=self.user.id, date=self.day).one()
+        self.assertEqual(summary.totals_json["iron_mg"], 2.5)
+        self.assertEqual(summary.daily_score, score)
+
+    def test_micro_target_named_like_a_macro_keeps_the_macro_goal(self) -> None:
+        targets = self.targets_for(self.user)
+        targets.micronutrient_targets = {"protein": 10, "iron_mg": 10}
+        self.db.commit()
+        self.add_log({"protein": 50, "iron_mg": 5})
+
+        _, comparison, score = nutrition._compute_daily(self.db, self.user.id, self.day, targets)
+
+        self.assertEqual(comparison["protein"], {"consumed": 50.0, "target": 100.0, "pct": 50.0})
+        # macros avg (50+0+0+0)/4 * 0.6 + iron 50 * 0.4
+        self.assertEqual(score, 27.5)
+
+    def test_summary_is_upserted_without_reading_it_first(self) -> None:
+        self.add_log({"calories": 200})
+        nutrition._compute_daily(self.db, self.user.id, self.day)
+        self.add_log({"calories": 300})
+        summary_statements: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            if "daily_nutrition_summary" in statement:
+                summary_statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        nutrition._compute_daily(self.db, self.user.id, self.day)
+
+        self.assertEqual(len(summary_statements), 1)
+        self.assertIn("ON CONFLICT", summary_statements[0])
+        summary = self.db.query(DailyNutritionSummary).filter_by(user_id=self.user.id, date=self.day).one()
+        self.assertEqual(summary.totals_json["calories"], 500.0)
+
+    def test_empty_day_totals_are_zero(self) -> None:
+        totals, comparison, score = nutrition._compute_daily(self.db, self.user.id, self.day)
+
+        self.assertEqual(totals, {k: 0.0 for k in nutrition.MACRO_KEYS})
+        self.assertEqual(comparison["iron_mg"]["consumed"], 0.0)
+        self.assertEqual(score, 0.0)
+
+    def test_daily_endpoint_returns_logs_in_creation_order(self) -> None:
+        first = self.add_log({"calories": 100})
+        second = self.add_log({"calories": 200})
+
+        response = asyncio.run(
+            nutrition.get_daily(date_str=self.day.isoformat(), current_user=self.user, db=self.db, targets=self.targets_for(self.user))
+        )
+
+        self.assertEqual(response["totals"]["calories"], 300.0)
+        self.assertEqual([log["id"] for log in response["logs"]], [str(first.id), str(second.id)])
+
+
+class ReadDailyTests(NutritionRouterTestCase):
+    def read(self):
+        return asyncio.run(
+            nutrition.get_daily(
+                date_str=self.day.isoformat(), current_user=self.user, db=self.db, targets=self.targets_for(self.user)
+            )
+        )
+
+    def test_fresh_summary_is_served_without_writing(self) -> None:
+        self.add_log({"calories": 400, "iron_mg": 5})
+        first = self.read()
+        writes: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            if statement.lstrip().upper().startswith(("UPDATE", "INSERT")):
+                writes.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        again = self.read()
+
+        self.assertEqual(writes, [])
+        self.assertEqual(again["totals"], first["totals"])
+        self.assertEqual(again["comparison"], first["comparison"])
+        self.assertEqual(again["daily_score"], first["daily_score"])
+
+    def test_newer_log_change_triggers_recompute(self) -> None:
+        self.add_log({"calories": 400})
+        self.read()
+        log = self.add_log({"calories": 100})
+        log.updated_at = datetime.utcnow() + timedelta(seconds=5)
+        self.db.commit()
+
+        self.assertEqual(self.read()["totals"]["calories"], 500.0)
+
+    def test_target_change_triggers_recompute(self) -> None:
+        self.add_log({"protein": 50})
+        self.assertEqual(self.read()["comparison"]["protein"]["pct"], 50.0)
+        targets = self.targets_for(self.user)
+        targets.protein_g_target = 200
+        targets.updated_at = datetime.utcnow() + timedelta(seconds=5)
+        self.db.commit()
+
+        self.assertEqual(self.read()["comparison"]["protein"]["pct"], 25.0)
+
+
+class CreateLogTests(NutritionRouterTestCase):
+    def test_gamification_hooks_run_after_the_response(self) -> None:
+        tasks = BackgroundTasks()
+        payload = FoodLogCreate(date=self.day.isoformat(), title="Oats", nutrition={"calories": 300, "fiber": 8})
+
+        response = asyncio.run(
+            nutrition.create_log(
+                payload=payload,
+                background_tasks=tasks,
+                current_user=self.user,
+                db=self.db,
+                targets=self.targets_for(self.user),
+            )
+        )
+
+        self.assertEqual(response["title"], "Oats")
+        self.assertEqual(self.db.query(XPTransaction).filter_by(reason="meal_log").count(), 0)
+        self.assertEqual(len(tasks.tasks), 1)
+
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        with mock.patch.object(nutrition, "SessionLocal", session_factory):
+            asyncio.run(tasks())
+
+        self.assertEqual(self.db.query(XPTransaction).filter_by(user_id=self.user.id, reason="meal_log").count(), 1)
+
+    def test_post_log_hooks_roll_back_on_failure(self) -> None:
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        with mock.patch.object(nutrition, "SessionLocal", session_factory), \
+                mock.patch.object(nutrition, "check_achievements", side_effect=RuntimeError("boom")):
+            nutrition._run_post_log_hooks(self.user.id, 50.0, self.day)
+
+        self.assertEqual(self.db.query(XPTransaction).filter_by(user_id=self.user.id).count(), 0)
+
+
+class UpdateLogTests(NutritionRouterTestCase):
+    def test_update_rescales_snapshot_and_refreshes_summary(self) -> None:
+        log = self.add_log({"calories": 100})
+
+        response = asyncio.run(
+            nutrition.update_log(
+                log_id=str(log.id),
+                payload=FoodLogUpdate(servings=2, nutrition={"calories": 150}),
+                current_user=self.user,
+                db=self.db,
+                targets=self.targets_for(self.user),
+            )
+        )
+
+        self.assertEqual(response["nutrition_snapshot"]["calories"], 300.0)
+        summary = self.db.query(DailyNutritionSummary).filter_by(user_id=self.user.id, date=self.day).one()
+        self.assertEqual(summary.totals_json["calories"], 300.0)
+
+    def test_update_does_not_reload_the_log(self) -> None:
+        log = self.add_log({"calories": 100})
+        log_id = str(log.id)
+        targets = self.targets_for(self.user)
+        self.db.expire_all()
+        log_selects: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            if statement.lstrip().upper().startswith("SELECT") and "FROM food_logs" in statement:
+                log_selects.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        response = asyncio.run(
+            nutrition.update_log(
+                log_id=log_id, payload=FoodLogUpdate(title="Renamed"), current_user=self.user, db=self.db, targets=targets
+            )
+        )
+
+        self.assertEqual(response["title"], "Renamed")
+        # The ownership lookup and the daily aggregate; no refresh or reload.
+        self.assertEqual(len(log_selects), 2)
+
+    def test_cannot_update_another_users_log(self) -> None:
+        other = User(email="other@example.com", name="Other")
+        self.db.add(other)
+        self.db.commit()
+        log = self.add_log({"calories": 100})
+
+        with self.assertRaises(HTTPException) as ctx:
+            asyncio.run(
+                nutrition.update_log(
+                    log_id=str(log.id), payload=FoodLogUpdate(title="Mine"),
+                    current_user=other,
+                    db=self.db,
+                    targets=self.targets_for(other),
+                )
+            )
+        self.assertEqual(ctx.exception.status_code, 404)
+
+
+class RequestTargetsTests(NutritionRouterTestCase):
+    def test_targets_load_once_per_request(self) -> None:
+        request = Request({"type": "http", "headers": []})
+        target_selects: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            if statement.lstrip().upper().startswith("SELECT") and "FROM nutrition_targets" in statement:
+                target_selects.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        first = nutrition.get_request_targets(request, current_user=self.user, db=self.db)
+        again = nutrition.get_request_targets(request, current_user=self.user, db=self.db)
+        nutrition._compute_daily(self.db, self.user.id, self.day, first)
+
+        self.assertIs(first, again)
+        self.assertEqual(len(target_selects), 1)
+
+
+class DeleteGroupLogsTests(NutritionRouterTestCase):
+    def test_deletes_group_with_dependent_rows_in_bulk(self) -> None:
+        main_log = self.add_log({"calories": 500})
+        side_log = self.add_log({"calories": 100})
+        keep = self.add_log({"calories": 50})
+        for log in (main_log, side_log):
+            log.group_id = "grp-1"
+            self.db.add(MetabolicScore(user_id=self.user.id, date=self.day, scope="meal", food_log_id=log.id))
+        scan = ScannedMealLog(user_id=self.user.id, meal_label="Bowl", logged_food_log_id=main_log.id, logged_to_chronometer=True)
+        self.db.add(scan)
+        self.db.commit()
+
+        result = asyncio.run(
+            nutrition.delete_group_logs(
+                group_id="grp-1", current_user=self.user, db=self.db, targets=self.targets_for(self.user)
+            )
+        )
+
+        self.assertEqual(result, {"ok": True, "deleted_count": 2})
+        self.db.expire_all()
+        self.assertEqual([log.id for log in self.db.query(FoodLog).all()], [keep.id])
+        self.assertEqual(self.db.query(MetabolicScore).filter(MetabolicScore.food_log_id.isnot(None)).count(), 0)
+        self.assertIsNone(self.db.get(ScannedMealLog, scan.id).logged_food_log_id)
+        summary = self.db.query(DailyNutritionSummary).filter_by(user_id=self.user.id, date=self.day).one()
+        self.assertEqual(summary.totals_json["calories"], 50.0)
+
+
+class NutritionGapsTests(NutritionRouterTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        nutrition._gaps_cache.clear()
+
+    def gaps(self, if_none_match: str | None = None):
+        headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+        self.response = Response()
+        return asyncio.run(
+            nutrition.get_nutrition_gaps(
+                request=Request({"type": "http", "headers": headers}),
+                response=self.response,
+                date_str=self.day.isoformat(),
+                current_user=self.user,
+                db=self.db,
+                targets=self.targets_for(self.user),
+            )
+        )
+
+    def test_meal_suggestions_come_from_one_tag_filtered_query(self) -> None:
+        self.db.add_all([
+            Recipe(title="Plain Toast", health_benefits=[]),
+            Recipe(title="Citrus Salad", health_benefits=["immune_support"]),
+            Recipe(title="Lentil Stew", health_benefits=["gut_health", "energy_boost"]),
+            Recipe(title="Steak Bowl", health_benefits=["muscle_recovery"]),
+        ])
+        self.db.commit()
+        recipe_selects: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            if statement.lstrip().upper().startswith("SELECT") and "FROM recipes" in statement:
+                recipe_selects.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        result = self.gaps()
+
+        meals = {m["for"]: m["title"] for m in result["recommended_meals"]}
+        self.assertEqual(meals["protein"], "Steak Bowl")
+        self.assertEqual(meals["fiber"], "Lentil Stew")
+        self.assertEqual(len(recipe_selects), 1)
+
+    def test_staple_foods_are_seeded_in_one_batch_and_reused(self) -> None:
+        self.db.add(LocalFood(name="Greek Yogurt", category="Dairy", nutrition_per_serving={"protein": 17}))
+        self.db.commit()
+        food_writes: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            if statement.lstrip().upper().startswith("INSERT INTO LOCAL_FOODS"):
+                food_writes.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        result = self.gaps()
+        again = self.gaps()
+
+        foods = {(f["for"], f["name"]): f for f in result["recommended_foods"]}
+        self.assertEqual(foods[("protein", "Greek Yogurt")]["category"], "Dairy")
+        self.assertEqual(foods[("protein", "Chicken Breast")]["category"], "Coach Staples")
+        self.assertEqual(foods[("fiber", "Chia Seeds")]["nutrition_info"]["fiber"], 10)
+        self.assertEqual(len(food_writes), 1)
+        self.assertEqual(again["recommended_foods"], result["recommended_foods"])
+        seeded = self.db.query(LocalFood).filter(LocalFood.name == "Chicken Breast").one()
+        self.assertEqual(seeded.tags, ["coach", "protein"])
+
+    def test_gaps_reuse_the_stored_comparison(self) -> None:
+        self.add_log({"protein": 90, "fiber": 2})
+        nutrition._compute_daily(self.db, self.user.id, self.day)
+        summary_writes: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            if "daily_nutrition_summary" in statement and not statement.lstrip().upper().startswith("SELECT"):
+                summary_writes.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        result = self.gaps()
+
+        self.assertEqual(summary_writes, [])
+        self.assertNotIn("protein", [item["key"] for item in result["low_nutrients"]])
+        self.assertEqual(result["low_nutrients"][0]["key"], "carbs")
+
+    def test_unchanged_day_is_served_from_cache_and_revalidates(self) -> None:
+        self.add_log({"protein": 20})
+        first = self.gaps()
+        etag = self.response.headers["etag"]
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        cached = self.gaps()
+        not_modified = self.gaps(if_none_match=etag)
+
+        self.assertIs(cached, first)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.headers["etag"], etag)
+        self.assertFalse(any("FROM recipes" in sql or "FROM local_foods" in sql for sql in statements))
+
+    def test_new_log_changes_the_etag(self) -> None:
+        self.add_log({"protein": 20})
+        self.gaps()
+        etag = self.response.headers["etag"]
+        log = self.add_log({"protein": 80})
+        log.updated_at = datetime.utcnow() + timedelta(seconds=5)
+        self.db.commit()
+
+        result = self.gaps(if_none_match=etag)
+
+        self.assertIsInstance(result, dict)
+        self.assertNotEqual(self.response.headers["etag"], etag)
+        self.assertNotIn("protein", [item["key"] for item in result["low_nutrients"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import unittest
+
+from app.nutrition_tags import compute_health_benefits
+
+
+class ComputeHealthBenefitsTests(unittest.TestCase):
+    def test_exact_and_partial_matches_are_merged_and_sorted(self) -> None:
+        benefits = compute_health_benefits(
+            [{"name": "Turmeric"}, {"name": "grilled wild-caught salmon fillet"}, {"name": "parchment"}]
+        )
+
+        self.assertEqual(benefits, ["anti_inflammatory", "brain_health", "heart_health", "immune_support"])
+
+    def test_repeat_names_give_the_same_tags(self) -> None:
+        meal = [{"name": "Greek Yogurt"}, {"name": "chia seeds"}]
+
+        self.assertEqual(compute_health_benefits(meal), compute_health_benefits(list(reversed(meal))))
+        self.assertIn("muscle_recovery", compute_health_benefits(meal))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import main  # noqa: F401  (registers every model)
+from app.db import Base
+from app.models.recipe import Recipe
+from app.services import recipe_facets
+
+
+class FetchFacetCountsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        self.db.add_all(
+            [
+                Recipe(title="Salmon Bowl", tags=["Dinner", "quick"], dietary_tags=["gluten-free"], difficulty="Easy"),
+                Recipe(title="Oats", tags=["breakfast"], dietary_tags=["gluten-free", ""], difficulty=None),
+                Recipe(title="Broken", tags="dinner", dietary_tags=None, difficulty="hard"),
+            ]
+        )
+        self.db.commit()
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_sqlite_uses_live_aggregate(self) -> None:
+        self.assertFalse(recipe_facets.facet_counts_view_available(self.db))
+        rows = {(facet, value): count for facet, value, count in recipe_facets.fetch_facet_counts(self.db)}
+
+        self.assertEqual(rows[("meal_types", "Dinner")], 1)
+        self.assertEqual(rows[("meal_types", "breakfast")], 1)
+        self.assertNotIn(("meal_types", "quick"), rows)
+        self.assertEqual(rows[("dietary", "gluten-free")], 2)
+        self.assertNotIn(("dietary", ""), rows)
+        self.assertEqual(rows[("difficulties", "easy")], 2)
+        self.assertEqual(rows[("difficulties", "hard")], 1)
+        self.assertEqual(rows[(recipe_facets.TOTAL_FACET, "")], 3)
+
+    def test_missing_view_is_reprobed_after_interval(self) -> None:
+        db = mock.Mock()
+        db.get_bind.return_value.dialect.name = "postgresql"
+        db.execute.return_value.first.side_effect = [None, (1,)]
+        clock = mock.patch.object(recipe_facets.time, "monotonic")
+        with mock.patch.object(recipe_facets, "_view_available", False), \
+                mock.patch.object(recipe_facets, "_view_probed_at", None), \
+                clock as monotonic:
+            monotonic.return_value = 100.0
+            self.assertFalse(recipe_facets.facet_counts_view_available(db))
+            monotonic.return_value = 100.0 + recipe_facets.VIEW_REPROBE_SECONDS - 1
+            self.assertFalse(recipe_facets.facet_counts_view_available(db))
+            self.assertEqual(db.execute.call_count, 1)
+
+            monotonic.return_value = 100.0 + recipe_facets.VIEW_REPROBE_SECONDS
+            self.assertTrue(recipe_facets.facet_counts_view_available(db))
+            self.assertTrue(recipe_facets.facet_counts_view_available(db))
+            self.assertEqual(db.execute.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,262 @@
+import asyncio
+import json
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import main  # noqa: F401  (registers every model)
+from app.db import Base
+from app.models.recipe import Recipe
+from app.models.saved_recipe import SavedRecipe
+from app.models.user import User
+from app.routers import recipes
+
+
+class RecipesRouterTestCase(unittest.TestCase):
+    stub_pairing_score = True
+
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)()
+        self.user = User(email="recipes@example.com", name="Recipes User")
+        self.db.add(self.user)
+        self.db.commit()
+        self._created = datetime(2026, 1, 1)
+        if self.stub_pairing_score:
+            patcher = mock.patch.object(recipes, "_compute_card_pairing_score", return_value={})
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        recipes.invalidate_recipe_caches()
+        self.addCleanup(recipes.invalidate_recipe_caches)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def add_recipe(self, title: str, **fields) -> Recipe:
+        self._created += timedelta(minutes=1)
+        recipe = Recipe(title=title, created_at=self._created, **fields)
+        self.db.add(recipe)
+        self.db.commit()
+        return recipe
+
+
+class BrowseRecipesTests(RecipesRouterTestCase):
+    def browse(self, page: int = 1, page_size: int = 20, **filters) -> dict:
+        response = recipes.browse_recipes(
+            page=page, page_size=page_size, current_user=self.user, db=self.db, **filters
+        )
+        return json.loads(response.body)
+
+    def titles(self, result: dict) -> list[str]:
+        return [item["title"] for item in result["items"]]
+
+    def test_json_list_filters_are_case_insensitive(self) -> None:
+        self.add_recipe("Salmon Bowl", tags=["Dinner"], flavor_profile=["savory"], protein_type=["Fish"])
+        self.add_recipe("Oats", tags=["breakfast"], flavor_profile=["sweet"], protein_type=["dairy"])
+        self.add_recipe("Untagged", tags=None)
+
+        self.assertEqual(self.titles(self.browse(meal_type="dinner")), ["Salmon Bowl"])
+        self.assertEqual(self.titles(self.browse(flavor="SWEET")), ["Oats"])
+        self.assertEqual(self.titles(self.browse(protein_type="fish, dairy")), ["Salmon Bowl", "Oats"])
+
+    def test_category_matches_any_alias(self) -> None:
+        self.add_recipe("Batch Chili", tags=["bulk_cook"])
+        self.add_recipe("Weeknight Tacos", tags=["quick"])
+
+        self.assertEqual(self.titles(self.browse(category="meal-prep")), ["Batch Chili"])
+
+    def test_cuisine_is_case_insensitive_equality(self) -> None:
+        self.add_recipe("Pad Thai", cuisine="Thai")
+        self.add_recipe("Tom Yum", cuisine="thai")
+        self.add_recipe("Thai-Style Burger", cuisine="thai fusion")
+
+        self.assertEqual(self.titles(self.browse(cuisine="THAI")), ["Pad Thai", "Tom Yum"])
+
+    def test_difficulty_is_case_insensitive_equality(self) -> None:
+        self.add_recipe("Toast", difficulty="Easy")
+        self.add_recipe("Souffle", difficulty="hard")
+
+        self.assertEqual(self.titles(self.browse(difficulty="easy")), ["Toast"])
+        self.assertEqual(self.titles(self.browse(difficulty="e_sy")), [])
+
+    def test_cook_time_buckets(self) -> None:
+        self.add_recipe("Fast", total_time_min=20)
+        self.add_recipe("Middle", total_time_min=45)
+        self.add_recipe("Slow", total_time_min=90)
+        self.add_recipe("Unknown", total_time_min=None)
+
+        self.assertEqual(self.titles(self.browse(cook_time="quick")), ["Fast", "Unknown"])
+        self.assertEqual(self.titles(self.browse(cook_time="medium")), ["Middle"])
+        self.assertEqual(self.titles(self.browse(cook_time="long")), ["Slow"])
+
+    def test_paginates_in_sql_and_reports_total(self) -> None:
+        for i in range(5):
+            self.add_recipe(f"Recipe {i}", dietary_tags=["gluten-free"])
+        self.add_recipe("Other", dietary_tags=["vegan"])
+
+        result = self.browse(page=2, page_size=2, dietary="gluten-free")
+
+        self.assertEqual(self.titles(result), ["Recipe 2", "Recipe 3"])
+        self.assertEqual(result["total"], 5)
+        self.assertEqual(result["total_pages"], 3)
+
+    def test_page_past_the_end_is_empty(self) -> None:
+        self.add_recipe("Only")
+
+        result = self.browse(page=3, page_size=2)
+
+        self.assertEqual(result["items"], [])
+        self.assertEqual(result["total"], 1)
+
+    def test_cached_page_is_reloaded_by_id(self) -> None:
+        first = self.add_recipe("First", tags=["lunch"])
+        self.assertEqual(self.titles(self.browse(meal_type="Lunch")), ["First"])
+
+        first.title = "Renamed"
+        self.add_recipe("Second", tags=["lunch"])
+        # Same normalized filters: the cached ids are reused, the rows are fresh.
+        result = self.browse(meal_type="lunch")
+        self.assertEqual(self.titles(result), ["Renamed"])
+        self.assertEqual(result["total"], 1)
+
+        recipes.invalidate_recipe_caches()
+        self.assertEqual(self.titles(self.browse(meal_type="lunch")), ["Renamed", "Second"])
+
+
+class BrowseCardPairingTests(RecipesRouterTestCase):
+    stub_pairing_score = False
+
+    def test_cards_from_plain_rows_carry_the_stored_pairing_score(self) -> None:
+        side = self.add_recipe("Greens", recipe_role="veg_side")
+        self.add_recipe(
+            "Steak",
+            needs_default_pairing=True,
+            default_pairing_ids=[str(side.id)],
+            nutrition_info={"mes_default_pairing_adjusted_score": 82.5, "mes_default_pairing_delta": 4},
+        )
+
+        response = recipes.browse_recipes(q="Steak", page=1, page_size=20, current_user=self.user, db=self.db)
+        card = json.loads(response.body)["items"][0]
+
+        self.assertEqual(card["card_pairing_title"], "Greens")
+        self.assertEqual(card["card_pairing_recipe_role"], "veg_side")
+        self.assertEqual(card["composite_display_score"], 82.5)
+        self.assertEqual(card["card_pairing_mes_delta"], 4.0)
+
+
+class RecipeFiltersTests(RecipesRouterTestCase):
+    def filters(self) -> dict:
+        response = recipes.get_recipe_filters(current_user=self.user, db=self.db)
+        self.assertEqual(response.media_type, "application/json")
+        return json.loads(response.body)
+
+    def test_counts_each_facet_in_sql(self) -> None:
+        self.add_recipe(
+            "Salmon Bowl",
+            tags=["Dinner", "quick"],
+            flavor_profile=["savory"],
+            difficulty="Easy",
+            health_benefits=["heart_health"],
+            protein_type=["fish"],
+        )
+        self.add_recipe("Steak", tags=["Dinner"], flavor_profile=["savory", ""], difficulty=None)
+        self.add_recipe("Oats", tags=["breakfast"], flavor_profile=["sweet"], difficulty="medium", carb_type=None)
+
+        result = self.filters()
+
+        self.assertEqual(
+            [(f["value"], f["count"]) for f in result["meal_types"]], [("Dinner", 2), ("breakfast", 1)]
+        )
+        self.assertEqual([(f["value"], f["count"]) for f in result["flavors"]], [("savory", 2), ("sweet", 1)])
+        self.assertEqual([(f["value"], f["count"]) for f in result["difficulties"]], [("easy", 2), ("medium", 1)])
+        self.assertEqual(result["protein_types"], [{"value": "fish", "label": "Fish", "count": 1}])
+        self.assertEqual(result["carb_types"], [])
+        self.assertEqual(result["health_benefits"][0]["value"], "heart_health")
+        self.assertEqual(result["total_recipes"], 3)
+
+    def test_reuses_snapshot_until_invalidated(self) -> None:
+        self.add_recipe("First", tags=["lunch"])
+        self.assertEqual(self.filters()["total_recipes"], 1)
+
+        self.add_recipe("Second", tags=["lunch"])
+        self.assertEqual(self.filters()["total_recipes"], 1)
+
+        recipes.invalidate_recipe_caches()
+        self.assertEqual(self.filters()["total_recipes"], 2)
+
+
+class SavedRecipesTests(RecipesRouterTestCase):
+    def save(self, recipe: Recipe, saved_at: datetime) -> None:
+        self.db.add(SavedRecipe(user_id=self.user.id, recipe_id=recipe.id, saved_at=saved_at))
+        self.db.commit()
+
+    def test_lists_newest_first_in_one_query(self) -> None:
+        older = self.add_recipe("Older")
+        newer = self.add_recipe("Newer")
+        self.add_recipe("Not Saved")
+        self.save(older, datetime(2026, 2, 1))
+        self.save(newer, datetime(2026, 3, 1))
+        self.db.expire_all()
+        self.db.refresh(self.user)
+
+        statements: list[str] = []
+        record = lambda *args: statements.append(args[2])
+        event.listen(self.engine, "before_cursor_execute", record)
+        try:
+            result = recipes.get_saved_recipes(current_user=self.user, db=self.db)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", record)
+
+        self.assertEqual([item["title"] for item in result["items"]], ["Newer", "Older"])
+        self.assertEqual(result["saved_ids"], [str(newer.id), str(older.id)])
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn("ingredients", statements[0])
+
+    def test_save_recipe_inserts_once(self) -> None:
+        recipe = self.add_recipe("Keeper")
+
+        first = recipes.save_recipe(str(recipe.id), current_user=self.user, db=self.db)
+        second = recipes.save_recipe(str(recipe.id), current_user=self.user, db=self.db)
+
+        self.assertEqual(first["status"], "saved")
+        self.assertEqual(second, {"status": "already_saved"})
+        self.assertEqual(self.db.query(SavedRecipe).filter(SavedRecipe.user_id == self.user.id).count(), 1)
+
+    def test_save_unknown_recipe_is_404(self) -> None:
+        with self.assertRaises(HTTPException) as raised:
+            recipes.save_recipe("missing", current_user=self.user, db=self.db)
+        self.assertEqual(raised.exception.status_code, 404)
+
+
+class SubstituteIngredientsTests(RecipesRouterTestCase):
+    def test_releases_the_session_before_waiting_on_substitutions(self) -> None:
+        recipe = self.add_recipe("Trout Tacos", ingredients=[{"name": "trout"}])
+        self.user.allergies = ["fish"]
+        self.db.commit()
+        seen: dict = {}
+
+        async def fake_substitutions(**kwargs):
+            seen["in_transaction"] = self.db.in_transaction()
+            seen["allergies"] = kwargs["allergies"]
+            return {"modified_recipe": kwargs["recipe"], "swaps": [], "warnings": [], "used_ai": True}
+
+        with mock.patch.object(recipes, "apply_user_substitutions", side_effect=fake_substitutions):
+            result = asyncio.run(
+                recipes.substitute_recipe_ingredients(
+                    str(recipe.id), recipes.SubstitutionBody(), current_user=self.user, db=self.db
+                )
+            )
+
+        self.assertEqual(seen, {"in_transaction": False, "allergies": ["fish"]})
+        self.assertEqual(result["original_recipe"]["title"], "Trout Tacos")
+        self.assertTrue(result["used_ai"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import json
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.responses import FastJSONResponse
+
+
+class FastJSONResponseTests(unittest.TestCase):
+    def test_render_matches_stdlib_compact_utf8(self) -> None:
+        content = {"name": "Crème brûlée", "scores": [1, 2.5, None], "ok": True}
+        expected = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.assertEqual(FastJSONResponse(content).body, expected)
+
+    def test_non_finite_floats_render_as_null(self) -> None:
+        self.assertEqual(FastJSONResponse({"score": float("nan")}).body, b'{"score":null}')
+
+    def test_app_uses_fast_response_by_default(self) -> None:
+        response = TestClient(app).get("/health")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/json")
+
+
+if __name__ == "__main__":
+    unittest.main()
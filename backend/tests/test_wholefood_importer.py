@@ -0,0 +1,362 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import main  # noqa: F401  (registers every model)
+from app.db import Base
+from app.models.recipe import Recipe
+
+import import_wholefood_site_recipes as importer
+from import_wholefood_site_recipes import (
+    apply_policy,
+    crawl_recipe_urls,
+    extract_links,
+    extract_recipe_fallback,
+    extract_recipe_jsonld,
+    guess_category,
+    import_recipe_node,
+    iter_recipe_nodes,
+    parse_page,
+)
+
+RECIPE_JSONLD = json.dumps({"@type": "Recipe", "name": "Soup", "recipeIngredient": ["1 onion"]})
+
+
+class ApplyPolicyTests(unittest.TestCase):
+    def test_substitutes_banned_ingredients_in_one_pass(self) -> None:
+        new_ing, substitutions, reject_reasons, changed = apply_policy(
+            ["1 tbsp Canola Oil", "1 cup panko", "2 wheat flour tortillas", "Salt"]
+        )
+
+        self.assertEqual(
+            new_ing,
+            ["1 tbsp extra virgin olive oil", "1 cup gluten-free breadcrumbs", "2 cassava flour tortillas", "Salt"],
+        )
+        self.assertEqual(len(substitutions), 3)
+        self.assertEqual(reject_reasons, [])
+        self.assertTrue(changed)
+
+    def test_longer_phrase_wins_over_its_suffix(self) -> None:
+        new_ing, _, reject_reasons, _ = apply_policy(["2 tbsp high fructose corn syrup", "1 tbsp corn syrup"])
+
+        self.assertEqual(new_ing, ["2 tbsp date syrup", "1 tbsp raw honey"])
+        self.assertEqual(reject_reasons, [])
+
+    def test_hard_reject_reports_each_line_once(self) -> None:
+        _, _, reject_reasons, _ = apply_policy(["margarine with aspartame", "butter"])
+
+        self.assertEqual(reject_reasons, ["hard-reject ingredient: margarine with aspartame"])
+
+    def test_unresolved_categories_are_reported_in_order(self) -> None:
+        _, _, reject_reasons, changed = apply_policy(["barley, canola oils and corn syrups", "sourdough bread with rye"])
+
+        self.assertEqual(
+            reject_reasons,
+            [
+                "unresolved gluten ingredient: barley, canola oils and corn syrups",
+                "unresolved seed oil ingredient: barley, canola oils and corn syrups",
+                "unresolved refined sugar ingredient: barley, canola oils and corn syrups",
+            ],
+        )
+        self.assertFalse(changed)
+
+
+class ImportRecipeNodeTests(unittest.TestCase):
+    NODE = {
+        "@type": "Recipe",
+        "name": "Garlic Chicken &amp; Rice",
+        "recipeIngredient": ["1 lb chicken thighs", "1 cup rice", "2 tbsp canola oil", "3 cloves garlic"],
+        "recipeInstructions": [{"text": "Cook the rice"}, {"text": "Sear the chicken"}],
+        "totalTime": "PT35M",
+        "recipeYield": "4 servings",
+        "nutrition": {"proteinContent": "48 g", "fiberContent": "11 g", "sugarContent": "3 g"},
+    }
+
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.db = self.Session()
+        self.addCleanup(self.db.close)
+
+    def import_node(self, node: dict) -> tuple:
+        return import_recipe_node(self.db, "https://site.test/garlic-chicken/", node, "https://www.site.test/recipes/")
+
+    def test_accepted_recipe_returns_its_columns_without_writing(self) -> None:
+        result, payload = self.import_node(self.NODE)
+
+        self.assertTrue(result.accepted)
+        self.assertEqual(payload["title"], "Garlic Chicken & Rice")
+        self.assertIn("site_test_import", payload["tags"])
+        self.assertEqual(payload["ingredients"][2]["name"], "extra virgin olive oil")
+        self.assertEqual(self.db.query(Recipe).count(), 0)
+
+    def test_rejections_return_no_columns(self) -> None:
+        result, payload = self.import_node({**self.NODE, "recipeIngredient": ["1 cup margarine"]})
+
+        self.assertFalse(result.accepted)
+        self.assertEqual(result.reject_reasons, ["hard-reject ingredient: 1 cup margarine"])
+        self.assertIsNone(payload)
+        self.assertEqual(self.import_node({})[0].reject_reasons, ["no recipe data found"])
+
+    def test_import_batches_inserts_and_updates_by_title(self) -> None:
+        self.db.add(Recipe(title="Garlic Chicken & Rice", description="stale"))
+        self.db.commit()
+        stew = {**self.NODE, "name": "Beef Stew"}
+        crawled = {
+            "https://site.test/a/": self.NODE,
+            "https://site.test/b/": stew,
+            "https://site.test/c/": {**stew, "totalTime": "PT50M"},
+        }
+
+        results, inserted, updated = self.run_import(crawled)
+
+        self.assertEqual([r.accepted for r in results], [True, True, True])
+        # The repeated "Beef Stew" replaces its pending insert; not an update.
+        self.assertEqual((inserted, updated), (1, 1))
+        self.db.expire_all()
+        rows = {r.title: r for r in self.db.query(Recipe).all()}
+        self.assertEqual(sorted(rows), ["Beef Stew", "Garlic Chicken & Rice"])
+        self.assertNotEqual(rows["Garlic Chicken & Rice"].description, "stale")
+        self.assertEqual(rows["Beef Stew"].total_time_min, 50)
+
+    def test_written_batches_survive_an_interrupted_import(self) -> None:
+        crawled = {f"https://site.test/{i}/": {**self.NODE, "name": f"Recipe {i}"} for i in range(3)}
+        calls = []
+
+        def interrupt_on_third(*args):
+            calls.append(args[1])
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return import_recipe_node(*args)
+
+        with mock.patch.object(importer, "IMPORT_BATCH_SIZE", 1), mock.patch.object(
+            importer, "import_recipe_node", interrupt_on_third
+        ), self.assertRaises(KeyboardInterrupt):
+            self.run_import(crawled)
+
+        self.db.expire_all()
+        self.assertEqual(sorted(t for (t,) in self.db.query(Recipe.title)), ["Recipe 0", "Recipe 1"])
+
+    def run_import(self, crawled: dict) -> tuple:
+        async def fake_crawl(client, **kwargs):
+            return crawled
+
+        with mock.patch.object(importer, "init_db"), mock.patch.object(
+            importer, "SessionLocal", self.Session
+        ), mock.patch.object(importer, "crawl_recipe_urls", fake_crawl):
+            return asyncio.run(importer.import_recipes("https://site.test/recipes/", "site.test"))
+
+
+class GuessCategoryTests(unittest.TestCase):
+    def test_first_matching_category_wins_on_substrings(self) -> None:
+        self.assertEqual(guess_category("Egg Noodles"), "protein")
+        self.assertEqual(guess_category("sweet potatoes"), "grains")
+        self.assertEqual(guess_category("extra virgin olive oil"), "fats")
+        self.assertEqual(guess_category("smoked paprika"), "spices")
+        self.assertEqual(guess_category("Greek yogurt"), "dairy")
+        self.assertEqual(guess_category("date syrup"), "sweetener")
+        self.assertEqual(guess_category("baby spinach"), "produce")
+
+
+class ParsePageTests(unittest.TestCase):
+    PAGE = (
+        "<html><head><title>Lentil Soup | Site</title>"
+        '<script type="application/ld+json">{"@graph": [{"@type": "WebPage"}, '
+        '{"@type": ["Recipe"], "name": "Lentil Soup", "recipeIngredient": ["1 cup lentils"]}]}</script>'
+        '</head><body><h1 class="title">Lentil <em>Soup</em> &amp; Greens</h1><ul>'
+        "<li>1 cup lentils</li><li>2  carrots<br/>diced</li><li>3 cloves&nbsp;garlic</li><li>salt &amp; pepper</li>"
+        '<li>ok</li></ul><a href="/next-recipe/#comments">next</a><a href="https://other.test/">away</a></body></html>'
+    )
+
+    def test_one_parse_feeds_every_extractor(self) -> None:
+        page = parse_page(self.PAGE)
+
+        self.assertEqual(extract_recipe_jsonld(page)["name"], "Lentil Soup")
+        self.assertEqual(extract_links("https://site.test/soup/", page, "site.test"), ["https://site.test/next-recipe/"])
+
+        fallback = extract_recipe_fallback(page)
+        self.assertEqual(fallback["name"], "Lentil Soup & Greens")
+        self.assertEqual(
+            fallback["recipeIngredient"],
+            ["1 cup lentils", "2 carrots diced", "3 cloves garlic", "salt & pepper"],
+        )
+
+    def test_jsonld_search_skips_non_recipe_subtrees(self) -> None:
+        graph = {
+            "@graph": [
+                {"@type": "Organization", "subjectOf": {"@type": "Recipe", "name": "Logo", "recipeIngredient": ["x"]}},
+                {"@type": "WebPage", "mainEntity": {"@type": "Recipe", "name": "Stew", "recipeIngredient": ["1 onion"]}},
+            ]
+        }
+        page = parse_page(f'<script type="application/ld+json">{json.dumps(graph)}</script>')
+
+        self.assertEqual(extract_recipe_jsonld(page)["name"], "Stew")
+
+    def test_fallback_needs_four_list_items(self) -> None:
+        page = parse_page("<title>Short | Site</title><ul><li>one item</li><li>two item</li></ul>")
+
+        self.assertIsNone(extract_recipe_jsonld(page))
+        self.assertIsNone(extract_recipe_fallback(page))
+
+
+class CrawlRecipeUrlsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pages: dict[str, str] = {}
+        self.requested: list[str] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        self.requested.append(url)
+        if url not in self.pages:
+            return httpx.Response(404)
+        return httpx.Response(200, text=self.pages[url])
+
+    def run_with_client(self, work):
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(self.handler)) as client:
+                return await work(client)
+
+        return asyncio.run(run())
+
+    def crawl(self, pages: dict[str, str], max_pages: int = 400, concurrency: int = 2) -> tuple[dict, list[str]]:
+        self.pages = pages
+        crawled = self.run_with_client(
+            lambda client: crawl_recipe_urls(
+                client, "https://site.test/recipes/", "site.test", max_pages=max_pages, concurrency=concurrency
+            )
+        )
+        return crawled, self.requested
+
+    def recipe_page(self, *links: str) -> str:
+        anchors = "".join(f'<a href="{link}">x</a>' for link in links)
+        return f'<script type="application/ld+json">{RECIPE_JSONLD}</script>{anchors}'
+
+    def test_follows_links_breadth_first_and_skips_failed_pages(self) -> None:
+        pages = {
+            "https://site.test/recipes/": '<a href="/lentil-soup/">a</a><a href="/missing-page/">b</a>'
+            '<a href="https://other.test/offsite/">c</a>',
+            "https://site.test/lentil-soup/": self.recipe_page("/tomato-stew/", "/recipes/"),
+            "https://site.test/tomato-stew/": self.recipe_page(),
+        }
+
+        crawled, requested = self.crawl(pages)
+
+        self.assertEqual(list(crawled), ["https://site.test/lentil-soup/", "https://site.test/tomato-stew/"])
+        self.assertEqual({node["name"] for node in crawled.values()}, {"Soup"})
+        self.assertEqual(
+            requested,
+            [
+                "https://site.test/recipes/",
+                "https://site.test/lentil-soup/",
+                "https://site.test/missing-page/",
+                "https://site.test/tomato-stew/",
+            ],
+        )
+
+    def test_stops_at_max_pages(self) -> None:
+        pages = {"https://site.test/recipes/": "".join(f'<a href="/recipe-{i}/">x</a>' for i in range(10))}
+
+        _, requested = self.crawl(pages, max_pages=4)
+
+        self.assertEqual(len(requested), 4)
+
+    def test_index_pages_are_only_read_for_links(self) -> None:
+        pages = {
+            "https://site.test/recipes/": '<a href="/category/soups/">x</a>',
+            "https://site.test/category/soups/": self.recipe_page("/lentil-soup/"),
+            "https://site.test/lentil-soup/": self.recipe_page(),
+        }
+
+        with mock.patch.object(importer, "extract_recipe_jsonld", wraps=extract_recipe_jsonld) as jsonld:
+            crawled, _ = self.crawl(pages)
+
+        self.assertEqual(list(crawled), ["https://site.test/lentil-soup/"])
+        self.assertEqual(jsonld.call_count, 2)  # start page and the post, not the category page
+
+    def test_start_url_fallback_keeps_what_the_crawl_read(self) -> None:
+        crawled, requested = self.crawl({"https://site.test/recipes/": "<p>Nothing here</p>"})
+
+        self.assertEqual(crawled, {"https://site.test/recipes/": {}})
+        self.assertEqual(requested, ["https://site.test/recipes/"])
+
+    def test_import_reuses_crawled_nodes_and_refetches_the_rest(self) -> None:
+        self.pages = {"https://site.test/stew/": self.recipe_page()}
+        crawled = {"https://site.test/soup/": {"name": "Cached"}, "https://site.test/stew/": None}
+
+        async def collect(client):
+            return [item async for item in iter_recipe_nodes(client, crawled)]
+
+        nodes = self.run_with_client(collect)
+
+        self.assertEqual([url for url, _ in nodes], list(crawled))
+        self.assertEqual(nodes[0][1], {"name": "Cached"})
+        self.assertEqual(nodes[1][1]["name"], "Soup")
+        self.assertEqual(self.requested, ["https://site.test/stew/"])
+
+    def test_html_cache_serves_repeat_fetches_from_disk(self) -> None:
+        self.pages = {"https://site.test/stew/": self.recipe_page()}
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        importer.enable_html_cache(cache_dir.name)
+        self.addCleanup(importer.enable_html_cache, None)
+
+        first = self.run_with_client(lambda client: importer.fetch_html(client, "https://site.test/stew/"))
+        second = self.run_with_client(lambda client: importer.fetch_html(client, "https://site.test/stew/"))
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.requested, ["https://site.test/stew/"])
+
+
+class FetchHtmlTests(unittest.TestCase):
+    def fetch(self, responses: list) -> tuple[str | BaseException, int]:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            outcome = responses[min(calls, len(responses) - 1)]
+            calls += 1
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        async def run() -> str:
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await importer.fetch_html(client, "https://site.test/soup/")
+
+        with mock.patch.object(importer, "FETCH_BACKOFF_SECONDS", 0):
+            try:
+                return asyncio.run(run()), calls
+            except Exception as exc:
+                return exc, calls
+
+    def test_retries_server_errors_and_connection_failures(self) -> None:
+        result, calls = self.fetch(
+            [httpx.Response(503), httpx.ConnectError("connection reset"), httpx.Response(200, text="<h1>Soup</h1>")]
+        )
+
+        self.assertEqual(result, "<h1>Soup</h1>")
+        self.assertEqual(calls, 3)
+
+    def test_gives_up_after_the_retry_budget(self) -> None:
+        result, calls = self.fetch([httpx.Response(502)])
+
+        self.assertIsInstance(result, httpx.HTTPStatusError)
+        self.assertEqual(calls, importer.FETCH_RETRIES + 1)
+
+    def test_client_errors_are_not_retried(self) -> None:
+        result, calls = self.fetch([httpx.Response(404)])
+
+        self.assertIsInstance(result, httpx.HTTPStatusError)
+        self.assertEqual(calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
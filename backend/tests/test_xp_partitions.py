@@ -0,0 +1,33 @@
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.services import xp_partitions
+
+
+class XPPartitionTests(unittest.TestCase):
+    def test_months_to_prepare_rolls_over_year_end(self) -> None:
+        self.assertEqual(
+            xp_partitions.months_to_prepare(date(2026, 11, 17)),
+            [
+                (date(2026, 11, 1), date(2026, 12, 1)),
+                (date(2026, 12, 1), date(2027, 1, 1)),
+                (date(2027, 1, 1), date(2027, 2, 1)),
+            ],
+        )
+
+    def test_partition_name_is_zero_padded(self) -> None:
+        self.assertEqual(xp_partitions.partition_name(date(2027, 3, 1)), "xp_transactions_2027_03")
+
+    def test_non_postgres_backends_are_skipped(self) -> None:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        with patch.object(xp_partitions, "SessionLocal", sessionmaker(bind=engine)):
+            self.assertFalse(xp_partitions.ensure_xp_partitions(date(2026, 10, 15)))
+
+
+if __name__ == "__main__":
+    unittest.main()